@@ -22,2375 +22,554 @@
 
 
 
+# Started before the other imports so the cold start report covers them.
+from coldstart import StartupTimeline
+
+STARTUP = StartupTimeline()
+
+import itertools
 import json
-import datetime
 import time
 import os
-import dateutil.parser
 import logging
 
+from cache import VersionedLRUCache
+from cards import AttachmentPool, build_card, check_message
+from instrumentation import EmbeddedMetricFormatExporter, LatencyRecorder, RequestTimer
+from intents import IntentRegistry
+
+from lex import Close, ConfirmIntent, Delegate, ElicitSlot, LexEvent, LexResponse
+from session import ReservationCodec
+from slots import QuizAnswers, SlotResolver, build_slot_tables
+
+with STARTUP.stage('catalog_import'):
+    from catalog import build_candidate_index, build_fallback_index, build_question_plan
+    from catalog_providers import CatalogRefresher, catalog_provider
+
 logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+
+# Every REQUEST_LOG_EVERY-th request is logged as one JSON line with its stage
+# latencies, whatever LOG_LEVEL is. 0 turns the sampled log off.
+REQUEST_LOG_EVERY = int(os.environ.get('REQUEST_LOG_EVERY', '0'))
+request_logger = logging.getLogger('bot.requests')
+request_logger.setLevel(logging.INFO)
+request_counter = itertools.count(1)
+
+# Stage latency percentiles per intent and per slot combination are written as
+# CloudWatch Embedded Metric Format lines every LATENCY_METRICS_EVERY requests
+# (or every minute, whichever comes first). 0 turns them off.
+LATENCY_METRICS_EVERY = int(os.environ.get('LATENCY_METRICS_EVERY', '0'))
+latency_recorder = None
+if LATENCY_METRICS_EVERY:
+    latency_recorder = LatencyRecorder(EmbeddedMetricFormatExporter(), flush_every=LATENCY_METRICS_EVERY)
+
+# With INCREMENTAL_QUIZ=1, every partially answered turn narrows the recommendations
+# still possible, stores them in session attributes and closes as soon as only one
+# is left, instead of waiting for all four answers.
+# ADAPTIVE_QUIZ=1 also takes the question order away from the bot configuration:
+# each turn elicits the slot the compiled question plan asks next (see
+# catalog.build_question_plan), skipping questions that cannot change the outcome.
+ADAPTIVE_QUIZ = os.environ.get('ADAPTIVE_QUIZ', '0') == '1'
+INCREMENTAL_QUIZ = ADAPTIVE_QUIZ or os.environ.get('INCREMENTAL_QUIZ', '0') == '1'
+
+# Validated answers are cached per warm container: the last RESPONSE_CACHE_SIZE
+# distinct (intent, raw slot values) seen skip validation and go straight to their
+# prebuilt response. 0 turns the cache off. Its hits, misses and size are logged
+# every RESPONSE_CACHE_LOG_EVERY lookups (0 turns that off) and whenever a new
+# catalog version clears it, whether or not requests are sampled.
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', '1024'))
+RESPONSE_CACHE_LOG_EVERY = int(os.environ.get('RESPONSE_CACHE_LOG_EVERY', '1000'))
+response_cache = VersionedLRUCache(RESPONSE_CACHE_SIZE) if RESPONSE_CACHE_SIZE else None
+
+# By default, treat the user request as coming from the America/New_York time zone.
+BOT_TIMEZONE = os.environ.get('BOT_TIMEZONE', 'America/New_York')
+
+
+def init_timezone(tz_name):
+    """
+    Make tz_name the process's local time zone. This re-reads zoneinfo, so it runs
+    once per container rather than once per request.
+    """
+    os.environ['TZ'] = tz_name
+    if hasattr(time, 'tzset'):
+        time.tzset()
+
+
+init_timezone(BOT_TIMEZONE)
+
+
+def local_now():
+    """
+    Return the current time as a timezone-aware datetime in the bot's time zone.
+    """
+    # Deferred: no intent needs these on the request path, and dateutil is slow to import.
+    import datetime
+    import dateutil.tz
+
+    return datetime.datetime.now(dateutil.tz.gettz(BOT_TIMEZONE))
 
 
 # --- Helpers that build all of the responses ---
 
 
 def elicit_slot(session_attributes, intent_name, slots, slot_to_elicit, message):
-    return {
-        'sessionAttributes': session_attributes,
-        'dialogAction': {
-            'type': 'ElicitSlot',
-            'intentName': intent_name,
-            'slots': slots,
-            'slotToElicit': slot_to_elicit,
-            'message': message
-        }
-    }
+    return LexResponse(session_attributes, ElicitSlot(intent_name, slots, slot_to_elicit, message))
 
 
 def confirm_intent(session_attributes, intent_name, slots, message):
-    return {
-        'sessionAttributes': session_attributes,
-        'dialogAction': {
-            'type': 'ConfirmIntent',
-            'intentName': intent_name,
-            'slots': slots,
-            'message': message
-        }
-    }
+    return LexResponse(session_attributes, ConfirmIntent(intent_name, slots, message))
 
 
 def close(session_attributes, fulfillment_state, message):
-    response = {
-        'sessionAttributes': session_attributes,
-        'dialogAction': {
-            'type': 'Close',
-            'fulfillmentState': fulfillment_state,
-            'message': message
-        }
-    }
-
-    return response
+    return LexResponse(session_attributes, Close(fulfillment_state, message))
 
 
 def delegate(session_attributes, slots):
-    return {
-        'sessionAttributes': session_attributes,
-        'dialogAction': {
-            'type': 'Delegate',
-            'slots': slots
-        }
-    }
+    return LexResponse(session_attributes, Delegate(slots))
 
 
 def build_response_card(title, subtitle, options):
     """
     Build a responseCard with a title, subtitle, and an optional set of options which should be displayed as buttons.
+    The card is fitted to Lex's limits; see cards.py.
     """
-    buttons = None
-    if options is not None:
-        buttons = []
-        for i in range(min(5, len(options))):
-            buttons.append(options[i])
+    return build_card([{'title': title, 'subTitle': subtitle, 'buttons': options}])
+
+# --- Helper Functions ---
 
+
+
+def build_validation_result(isvalid, violated_slot, message_content):
     return {
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'version': 1,
-        'genericAttachments': [{
-            'title': title,
-            'subTitle': subtitle,
-            'buttons': buttons
-        }]
+        'isValid': isvalid,
+        'violatedSlot': violated_slot,
+        'message': {'contentType': 'PlainText', 'content': message_content}
     }
 
-# --- Helper Functions ---
 
+# Re-prompts for invalid values, in (color, connection, paper size, print type) order.
+VALIDATION_MESSAGES = (
+    'Enter a valid color choice',
+    'CONNECTION TYPES USB is the standard for connecting to a single computer. An Ethernet port can connect the printer to your network, so it is easy for multiple users to print. It is a very reliable connection. A WiFi enabled printer can connect wirelessly to your wireless network. Some printers have a wireless direct capability where computers can connect directly to the printer without going through a router or existing wireless network. If in doubt, choose WiFi. There are apps available, that let you print from a mobile device. There are other ways of connecting, including cloud printing, that are outside the scope of this bot.',
+    'Choose a paper size: Letter Legal, Letter Legal 11x17 or 24"-44" Wide Format',
+    'Choose what the printer needs to do: Print Only, Print Copy Scan or Print Copy Scan Fax',
+)
 
 
-def try_ex(func):
+def validate_machines(slots, slot_names=('slotFour', 'slotThree', 'slotOne', 'slotTwo')):
+    """
+    Validate the quiz slots in one pass. slot_names are the intent's color, connection,
+    paper size and print type slots.
     """
-    Call passed in function in try block. If KeyError is encountered return None.
-    This function is intended to be used to safely access dictionary.
+    return validate_answers(QuizAnswers(slot_names, slots))
 
-    Note that this function would have negative impact on performance.
+
+def validate_answers(answers, slot_resolver=None):
+    """
+    Validate a request's QuizAnswers. Values are resolved through slot_resolver
+    (SLOT_RESOLVER by default), so synonyms and small typos are accepted. The result
+    carries 'values': the canonical value of each slot in (color, connection, paper
+    size, print type) order, or None for slots that are not filled yet. An invalid
+    result only keeps the values before the violated slot.
     """
+    if slot_resolver is None:
+        slot_resolver = SLOT_RESOLVER
+    values = []
+    for position, (slot_name, value, message) in enumerate(zip(answers.slot_names, answers.values(), VALIDATION_MESSAGES)):
+        if value:
+            value = slot_resolver.resolve(position, value)
+            if value is None:
+                result = build_validation_result(False, slot_name, message)
+                result['values'] = tuple(values) + (None,) * (len(answers.slot_names) - len(values))
+                return result
+        else:
+            value = None
+        values.append(value)
+
+    return {'isValid': True, 'values': tuple(values)}
 
-    try:
-        return func()
-    except KeyError:
-        return None
 
 
+# --- Recommendation catalog ---
 
 
+# CATALOG_SOURCE picks the catalog provider (see catalog_providers.py): 'file'
+# (the default), 'file:PATH' or 'dynamodb:TABLE'. Once the catalog is
+# CATALOG_TTL_SECONDS old (by default 5 minutes from DynamoDB, never from a file)
+# it is reloaded on a background thread; a new version and everything derived
+# from it replace the current ones between requests.
+CATALOG_SOURCE = os.environ.get('CATALOG_SOURCE', 'file')
+CATALOG_TTL_SECONDS = float(os.environ.get(
+    'CATALOG_TTL_SECONDS',
+    '300' if CATALOG_SOURCE.startswith('dynamodb:') else '0'
+))
 
-def isvalid_color_type(color_type):
-    color_types = ['black and white', 'color']
-    return color_type.lower() in color_types
-    
-def isvalid_color_typea(color_typea):
-    color_typesa = ['black and white', 'color']
-    return color_typea.lower() in color_typesa    
+with STARTUP.stage('catalog_load'):
+    CATALOG_PROVIDER = catalog_provider(CATALOG_SOURCE)
+    initial_catalog = CATALOG_PROVIDER.load()
 
 
-def isvalid_conc_type(conc_type):
-    conc_types = ['Ethernet Wired', 'WiFi Wireless']
-    return conc_type in conc_types
+def build_recommendation(content, attachments, card_pool=None):
+    """
+    Build the Close dialogAction that recommends attachments. These are built once per
+    combination and shared by every response for it, so callers must never mutate them.
+    The card comes from card_pool when given, shared with every other recommendation of
+    the same attachments. A message or card Lex would reject raises ValueError here
+    rather than when a user gets it.
+    """
+    return {
+        'type': 'Close',
+        'fulfillmentState': 'Fulfilled',
+        'message': {
+            'contentType': 'PlainText',
+            'content': check_message(content)
+        },
+        'responseCard': card_pool.card(attachments) if card_pool is not None else build_card(attachments)
+    }
 
-def isvalid_conc_typea(conc_typea):
-    conc_typesa = ['Ethernet Wired', 'WiFi Wireless']
-    return conc_typea in conc_typesa    
 
+def build_recommendation_templates(recommendations, card_pool=None):
+    return dict(
+        (key, build_recommendation(content, attachments, card_pool))
+        for key, (content, attachments) in recommendations.items()
+    )
 
-def isvalid_paper_size(paper_size):
-    paper_sizes = ['Letter Legal', 'Letter Legal 11x17']
-    return paper_size.lower() in paper_sizes
-    
-def isvalid_paper_sizea(paper_sizea):
-    paper_sizesa = ['Letter Legal', 'Letter Legal 11x17']
-    return paper_sizea.lower() in paper_sizesa    
 
-def isvalid_print_type(print_types):
-    print_type = ['Print Only', 'Print Copy Scan','Print Copy Scan Fax']
-    return print_type.lower() in print_types
-    
-def isvalid_print_typea(print_typesa):
-    print_typea = ['Print Only', 'Print Copy Scan','Print Copy Scan Fax']
-    return print_typea.lower() in print_typesa    
+def build_recommendation_ids(catalog, recommendations):
+    return dict((key, catalog['combination_codes'][key]) for key in recommendations)
 
 
+def build_candidates(catalog, candidate_index):
+    """
+    Map every partially answered slot tuple to (candidate slot tuples, their
+    comma-separated combination codes for the session attributes).
+    """
+    return dict(
+        (key, (candidates, ','.join(catalog['combination_codes'][candidate] for candidate in candidates)))
+        for key, candidates in candidate_index.items()
+    )
 
 
-def build_validation_result(isvalid, violated_slot, message_content):
+def build_profile(catalog, intent_name, slots, reservation_keys, catalog_intent=None, validator=None, card_pool=None):
+    """
+    Build the profile of a quiz intent that recommends from the catalog's
+    catalog_intent entry (its own by default) and validates its answers with
+    validator(answers, slot_resolver) (validate_answers by default). Response cards
+    come from card_pool (see cards.AttachmentPool) when given.
+    """
+    catalog_intent = catalog_intent or intent_name
+    if catalog_intent not in catalog['recommendations']:
+        raise ValueError('Intent {} recommends from {!r}, which the catalog does not have'.format(intent_name, catalog_intent))
+    recommendations = catalog['recommendations'][catalog_intent]
+    candidate_index = build_candidate_index(recommendations, catalog['slot_values'])
+    responses = build_recommendation_templates(recommendations, card_pool)
+    recommendation_ids = build_recommendation_ids(catalog, recommendations)
+    # Combinations the catalog misses answer with the nearest one it has, through
+    # the same lookup as every other combination.
+    for key, nearest in build_fallback_index(recommendations, catalog['slot_values']).items():
+        responses[key] = responses[nearest]
+        recommendation_ids[key] = recommendation_ids[nearest]
     return {
-        'isValid': isvalid,
-        'violatedSlot': violated_slot,
-        'message': {'contentType': 'PlainText', 'content': message_content}
+        'slots': slots,
+        'reservation_keys': reservation_keys,
+        'validator': validator or validate_answers,
+        'recommendations': recommendations,
+        'responses': responses,
+        'recommendation_ids': recommendation_ids,
+        'candidates': build_candidates(catalog, candidate_index),
+        'question_plan': build_question_plan(candidate_index, catalog['slot_values'])[0],
     }
 
 
-def validate_machines(slots):
-    color_type = try_ex(lambda: slots['slotFour'])
-    conc_type = try_ex(lambda: slots['slotThree'])
-    paper_size = try_ex(lambda: slots['slotOne'])
-    print_type = try_ex(lambda: slots['slotTwo'])
-
-    if color_type and not isvalid_color_type(color_type):
-        return build_validation_result(
-            False,
-            'slotFour',
-            'Enter a valid color choice'
-        )
-        
-    if conc_type and not isvalid_conc_type(conc_type):
-        return build_validation_result(
-            False,
-            'slotThree',
-            'CONNECTION TYPES USB is the standard for connecting to a single computer. An Ethernet port can connect the printer to your network, so it is easy for multiple users to print. It is a very reliable connection. A WiFi enabled printer can connect wirelessly to your wireless network. Some printers have a wireless direct capability where computers can connect directly to the printer without going through a router or existing wireless network. If in doubt, choose WiFi. There are apps available, that let you print from a mobile device. There are other ways of connecting, including cloud printing, that are outside the scope of this bot.'
-        )    
-
-    return {'isValid': True}
-
-
-def validate_machinesa(slots):
-    color_typea = try_ex(lambda: slots['slotSup'])
-    conc_typea = try_ex(lambda: slots['slotBap'])
-    paper_sizea = try_ex(lambda: slots['slotBan'])
-    print_typea = try_ex(lambda: slots['slotRan'])
-
-    if color_typea and not isvalid_color_typea(color_typea):
-        return build_validation_result(
-            False,
-            'slotSup',
-            'Enter a valid color choice'
-        )
-        
-    if conc_typea and not isvalid_conc_typea(conc_typea):
-        return build_validation_result(
-            False,
-            'slotBap',
-            'CONNECTION TYPES USB is the standard for connecting to a single computer. An Ethernet port can connect the printer to your network, so it is easy for multiple users to print. It is a very reliable connection. A WiFi enabled printer can connect wirelessly to your wireless network. Some printers have a wireless direct capability where computers can connect directly to the printer without going through a router or existing wireless network. If in doubt, choose WiFi. There are apps available, that let you print from a mobile device. There are other ways of connecting, including cloud printing, that are outside the scope of this bot.'
-        )    
+""" --- Functions that control the bot's behavior --- """
 
-    return {'isValid': True}
 
+# Intent handlers are registered on this table under Intents below; dispatch()
+# looks them up by name. Each quiz intent is registered with the options of its
+# profile: it asks the same four questions through its own 'slots' and recommends
+# from its own catalog entry ('catalog', its own name by default), validating
+# answers with its 'validator'. 'slots' and 'reservation_keys' are in (color,
+# connection, paper size, print type) order; 'responses' holds the prebuilt Close
+# dialogAction of every combination (the nearest one in 'recommendations' for
+# combinations the catalog misses), 'recommendation_ids' its combination code and
+# 'candidates' the recommendations still possible after each partial set of
+# answers, and 'question_plan' the slot to ask next after them.
+intents = IntentRegistry()
 
 
-""" --- Functions that control the bot's behavior --- """
+def prepare_catalog(catalog):
+    """
+    Build everything requests are answered from out of catalog: (catalog, slot
+    resolver, reservation codec, intent profiles). Every profile also carries the
+    resolver, the codec and the catalog version, so a request that picked its
+    profile keeps a consistent view while a newer catalog is installed.
+    """
+    slot_resolver = SlotResolver(build_slot_tables(catalog['slot_values'], catalog['slot_synonyms']))
+    reservation_codec = ReservationCodec(catalog['slot_values'])
+    card_pool = AttachmentPool()
+    intent_profiles = {}
+    for intent_name, options in intents.options.items():
+        if 'slots' not in options:
+            continue
+        profile = build_profile(
+            catalog, intent_name, options['slots'], options['reservation_keys'],
+            options.get('catalog'), options.get('validator'), card_pool)
+        profile['catalog_version'] = catalog['version']
+        profile['slot_resolver'] = slot_resolver
+        profile['reservation_codec'] = reservation_codec
+        intent_profiles[intent_name] = profile
+    return catalog, slot_resolver, reservation_codec, intent_profiles
+
+
+def install_catalog(prepared):
+    """
+    Make a prepare_catalog() result the one requests are answered from.
+    """
+    global PREPARED_CATALOG, CATALOG, SLOT_RESOLVER, RESERVATION_CODEC, INTENT_PROFILES
+    CATALOG, SLOT_RESOLVER, RESERVATION_CODEC, INTENT_PROFILES = prepared
+    PREPARED_CATALOG = prepared
 
 
-def get_recommendation(intent_request):
+def refresh_catalog():
+    """
+    Install the refresher's latest catalog if it is not the installed one. Never
+    waits for the provider; see catalog_providers.CatalogRefresher.
+    """
+    prepared = catalog_refresher.get()
+    if prepared is not PREPARED_CATALOG:
+        install_catalog(prepared)
+
+
+@intents.intent(
+    'QuizContinue',
+    slots=('slotFour', 'slotThree', 'slotOne', 'slotTwo'),
+    reservation_keys=('color_type', 'conc_type', 'PaperSize', 'Print-type'),
+)
+@intents.intent(
+    'QuizContinueA',
+    slots=('slotSup', 'slotBap', 'slotBan', 'slotRan'),
+    reservation_keys=('color_typea', 'conc_typea', 'PaperSizea', 'Print-typea'),
+)
+def get_recommendation(request, profile, request_timer=None):
     """
-    
+    Recommend a printer for the LexEvent request of a quiz intent described by profile
+    (see INTENT_PROFILES). Stage latencies are recorded on request_timer.
 
     Beyond fulfillment, the implementation for this intent demonstrates the following:
     1) Use of elicitSlot in slot validation and re-prompting
     2) Use of sessionAttributes to pass information that can be used to guide conversation
     """
+    if request_timer is None:
+        request_timer = RequestTimer()
 
-    color_type = try_ex(lambda: intent_request['currentIntent']['slots']['slotFour'])
-    conc_type = try_ex(lambda: intent_request['currentIntent']['slots']['slotThree'])
-    
+    answers = QuizAnswers.from_event(request, profile['slots'])
 
-    paper_size = try_ex(lambda: intent_request['currentIntent']['slots']['slotOne'])
-    print_type = try_ex(lambda: intent_request['currentIntent']['slots']['slotTwo'])
-    
-    session_attributes = intent_request['sessionAttributes'] if intent_request['sessionAttributes'] is not None else {}
-
-    # Load confirmation history and track the current reservation.
-    reservation = json.dumps({
-        'color_type': color_type,
-        'conc_type': color_type,
-        'PaperSize': paper_size,
-        'Print-type': print_type,
-    
-    })
+    session_attributes = request.session_attributes if request.session_attributes is not None else {}
+    request_timer.mark('slots')
 
+    validation_result, reservation = validate_cached(request.intent_name, profile, answers)
+    # Track the current reservation as a compact code; see current_reservation().
     session_attributes['currentReservation'] = reservation
-
-    
-    validation_result = validate_machines(intent_request['currentIntent']['slots'])
+    request_timer.mark('validate')
     if not validation_result['isValid']:
-        slots = intent_request['currentIntent']['slots']
+        slots = answers.slots
         slots[validation_result['violatedSlot']] = None
 
         return elicit_slot(
             session_attributes,
-            intent_request['currentIntent']['name'],
+            request.intent_name,
             slots,
             validation_result['violatedSlot'],
             validation_result['message']
         )
 
-    #1111    
-    if color_type=="black and white" and conc_type=="Ethernet Wired" and paper_size=="Letter Legal" and print_type=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother HL-L2350DW   $99 . '
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother HL-L2350DW',
-            'subTitle': 'Brother HL-L2350DW',
-            'attachmentLinkUrl': 'https://amzn.to/2QfRak4',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/71ryWtmAATL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
+    key = validation_result['values']
+    dialog_action = profile['responses'].get(key)
+    if dialog_action is None:
+        if INCREMENTAL_QUIZ:
+            return narrow_recommendation(request, profile, answers, session_attributes, key, request_timer)
+        request_timer.mark('lookup')
+        return continue_quiz(request, profile, answers, session_attributes, key)
+    request_timer.mark('lookup')
+    request_timer.combination = profile['recommendation_ids'][key]
+    return LexResponse(session_attributes, dialog_action)
 
-    #1112
-    if color_type=="black and white" and conc_type=="Ethernet Wired" and paper_size=="Letter Legal" and print_type=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother Brother MFC-L2750dw  . I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
 
-    #1113
-    if color_type=="black and white" and conc_type=="Ethernet Wired" and paper_size=="Letter Legal" and print_type=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.Brother MFC-L2750dw'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    
-    #1211
-    if color_type=="black and white" and conc_type=="WiFi Wireless" and paper_size=="Letter Legal" and print_type=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.  Brother HL-L2350DW   $99'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother HL-L2350DW',
-            'subTitle': 'Brother HL-L2350DW',
-            'attachmentLinkUrl': 'https://amzn.to/2QfRak4',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/71ryWtmAATL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}    
-    #1121
-    if color_type=="black and white" and conc_type=="Ethernet Wired" and paper_size=="Letter Legal 11x17" and print_type=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh SP 6430DN',
-            'subTitle': 'Ricoh SP 6430DN. The sturdy, low cost per page option.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01132XDD4/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01132XDD4&linkId=1a6d750fc8b8a2ae6daebb4b61532e62',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/51n7ZgLIQlL._AC_SL1056_.jpg'
-            },
-            {
-            'title': 'HP OfficeJet Pro 7740',
-            'subTitle': 'The cheap-to-buy, cost-more-per-page option. For low volume',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01JUCLLGK/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01JUCLLGK&linkId=a1332f3ba74345adb5eee8561a38162b',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/81%2BnFIUJLdL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}    
-    #112
-    if color_type=="black and white" and conc_type=="Ethernet Wired" and paper_size=="Letter Legal 11x17" and print_type=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh MP2501SP',
-            'subTitle': 'The sturdy option. Low cost of operation.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B00KDU9Q34/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B00KDU9Q34&linkId=298e6bd25a4db461de0bd9fdfd706b3f',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/51mneBb5RML._AC_SL1000_.jpg'
-            },
-            {
-            'title': 'HP OfficeJet Pro 7740',
-            'subTitle': 'The cheap-to-buy, cost-more-per-page option.Use only for very low volume',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01JUCLLGK/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01JUCLLGK&linkId=a1332f3ba74345adb5eee8561a38162b',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/81%2BnFIUJLdL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-        
-    }
-}   
-    #1123
-    if color_type=="black and white" and conc_type=="Ethernet Wired" and paper_size=="Letter Legal 11x17" and print_type=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh MP2501SP',
-            'subTitle': 'The sturdy option. Low cost of operation.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B00KDU9Q34/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B00KDU9Q34&linkId=298e6bd25a4db461de0bd9fdfd706b3f',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/51mneBb5RML._AC_SL1000_.jpg'
-            },
-            {
-            'title': 'HP OfficeJet Pro 7740',
-            'subTitle': 'The cheap-to-buy, cost-more-per-page option. Use only for very low volume',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01JUCLLGK/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01JUCLLGK&linkId=a1332f3ba74345adb5eee8561a38162b',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/81%2BnFIUJLdL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-        
-    }
-}   
-    #1212
-    if color_type=="black and white" and conc_type=="WiFi Wireless" and paper_size=="Letter Legal" and print_type=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother Brother MFC-L2750dw  .'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #1213
-    if color_type=="black and white" and conc_type=="WiFi Wireless" and paper_size=="Letter Legal" and print_type=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother MFC-L2750dw.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
+def validate_cached(intent_name, profile, answers):
+    """
+    Return the validation result of answers and their reservation code, from
+    response_cache when the same answers were seen with the profile's catalog.
+    Callers must not mutate the result.
+    """
+    if response_cache is None:
+        validation_result = profile['validator'](answers, profile['slot_resolver'])
+        return validation_result, profile['reservation_codec'].encode(validation_result['values'])
+    if response_cache.check_version(profile['catalog_version']):
+        log_response_cache('cleared for catalog version {}'.format(profile['catalog_version']))
+    key = (intent_name, answers.values())
+    outcome = response_cache.get(key)
+    if RESPONSE_CACHE_LOG_EVERY and (response_cache.hits + response_cache.misses) % RESPONSE_CACHE_LOG_EVERY == 0:
+        log_response_cache('counters')
+    if outcome is None:
+        validation_result = profile['validator'](answers, profile['slot_resolver'])
+        outcome = (validation_result, profile['reservation_codec'].encode(validation_result['values']))
+        response_cache.put(key, outcome)
+    return outcome
+
+
+def log_response_cache(event):
+    logger.info('response cache %s: hits=%d misses=%d size=%d',
+                event, response_cache.hits, response_cache.misses, len(response_cache))
+
+
+def continue_quiz(request, profile, answers, session_attributes, key):
+    """
+    Answer a turn that still has unanswered slots: let Lex ask its next question
+    during the dialog, or elicit the first missing slot if the intent is already
+    being fulfilled.
+    """
+    if request.invocation_source == 'DialogCodeHook':
+        return delegate(session_attributes, answers.slots)
+    return elicit_slot(session_attributes, request.intent_name, answers.slots, profile['slots'][key.index(None)], None)
 
-    #1131
-    if color_type=="black and white" and conc_type=="Ethernet Wired" and paper_size=="24\"-44\" Wide Format" and print_type=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh SP 6430DN',
-            'subTitle': 'Ricoh SP 6430DN. The sturdy, low cost per page option.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01132XDD4/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01132XDD4&linkId=1a6d750fc8b8a2ae6daebb4b61532e62',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/51n7ZgLIQlL._AC_SL1056_.jpg'
-            },
-            {
-            'title': 'HP OfficeJet Pro 7740',
-            'subTitle': 'The cheap-to-buy, cost-more-per-page option. For low volume',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01JUCLLGK/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01JUCLLGK&linkId=a1332f3ba74345adb5eee8561a38162b',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/81%2BnFIUJLdL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-} 
 
-    #1132
-    if color_type=="black and white" and conc_type=="Ethernet Wired" and paper_size=="24\"-44\" Wide Format" and print_type=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother Brother MFC-L2750dw  . I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
+def narrow_recommendation(request, profile, answers, session_attributes, key, request_timer):
+    """
+    Handle a partially answered quiz turn in incremental mode. The combination codes of
+    the recommendations still possible go into the 'candidates' session attribute; if
+    only one is left the quiz closes with it. Otherwise the next question is the one
+    from the question plan in adaptive mode, or whatever continue_quiz() asks.
+    """
+    candidates, codes = profile['candidates'].get(key, ((), ''))
+    session_attributes['candidates'] = codes
+    request_timer.mark('lookup')
+    if len(candidates) == 1:
+        request_timer.combination = profile['recommendation_ids'][candidates[0]]
+        return LexResponse(session_attributes, profile['responses'][candidates[0]])
+    position = profile['question_plan'].get(key) if ADAPTIVE_QUIZ else None
+    if position is not None:
+        # No message: Lex asks with the slot's own configured prompt.
+        return elicit_slot(session_attributes, request.intent_name, answers.slots, profile['slots'][position], None)
+    return continue_quiz(request, profile, answers, session_attributes, key)
 
-    #1133
-    if color_type=="black and white" and conc_type=="Ethernet Wired" and paper_size=="24\"-44\" Wide Format" and print_type=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.Brother MFC-L2750dw'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #1233
-    if color_type=="black and white" and conc_type=="WiFi Wireless" and paper_size=="24\"-44\" Wide Format" and print_type=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.Brother MFC-L2750dw'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
 
-    #1232
-    if color_type=="black and white" and conc_type=="WiFi Wireless" and paper_size=="24\"-44\" Wide Format" and print_type=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother Brother MFC-L2750dw  . I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #1231
-    if color_type=="black and white" and conc_type=="WiFi Wireless" and paper_size=="24\"-44\" Wide Format" and print_type=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh SP 6430DN',
-            'subTitle': 'Ricoh SP 6430DN. The sturdy, low cost per page option.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01132XDD4/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01132XDD4&linkId=1a6d750fc8b8a2ae6daebb4b61532e62',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/51n7ZgLIQlL._AC_SL1056_.jpg'
-            },
-            {
-            'title': 'HP OfficeJet Pro 7740',
-            'subTitle': 'The cheap-to-buy, cost-more-per-page option. For low volume',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01JUCLLGK/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01JUCLLGK&linkId=a1332f3ba74345adb5eee8561a38162b',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/81%2BnFIUJLdL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-} 
 
-    #1221
-    if color_type=="black and white" and conc_type=="WiFi Wireless" and paper_size=="Letter Legal 11x17" and print_type=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh MP2501SP',
-            'subTitle': 'The sturdy option. Low cost of operation.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B00KDU9Q34/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B00KDU9Q34&linkId=298e6bd25a4db461de0bd9fdfd706b3f',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/51mneBb5RML._AC_SL1000_.jpg'
-            },
-            {
-            'title': 'HP OfficeJet Pro 7740',
-            'subTitle': 'The cheap-to-buy, cost-more-per-page option. Use only for very low volume',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01JUCLLGK/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01JUCLLGK&linkId=a1332f3ba74345adb5eee8561a38162b',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/81%2BnFIUJLdL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-        
-    }
-}   
+def current_reservation(session_attributes, profile):
+    """
+    Decode the reservation stored in session_attributes into its full record, keyed
+    by the profile's reservation_keys, or return None when there is none.
+    """
+    code = (session_attributes or {}).get('currentReservation')
+    if code is None:
+        return None
+    return profile['reservation_codec'].record(code, profile['reservation_keys'])
 
-    #1222
-    if color_type=="black and white" and conc_type=="WiFi Wireless" and paper_size=="Letter Legal 11x17" and print_type=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh MP2501SP',
-            'subTitle': 'The sturdy option. Low cost of operation.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B00KDU9Q34/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B00KDU9Q34&linkId=298e6bd25a4db461de0bd9fdfd706b3f',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/51mneBb5RML._AC_SL1000_.jpg'
-            },
-            {
-            'title': 'HP OfficeJet Pro 7740',
-            'subTitle': 'The cheap-to-buy, cost-more-per-page option. Use only for very low volume',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01JUCLLGK/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01JUCLLGK&linkId=a1332f3ba74345adb5eee8561a38162b',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/81%2BnFIUJLdL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-        
-    }
-}   
-    #1223
-    if color_type=="black and white" and conc_type=="WiFi Wireless" and paper_size=="Letter Legal 11x17" and print_type=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh MP2501SP',
-            'subTitle': 'The sturdy option. Low cost of operation.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B00KDU9Q34/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B00KDU9Q34&linkId=298e6bd25a4db461de0bd9fdfd706b3f',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/51mneBb5RML._AC_SL1000_.jpg'
-            },
-            {
-            'title': 'HP OfficeJet Pro 7740',
-            'subTitle': 'The cheap-to-buy, cost-more-per-page option. Use only for very low volume',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01JUCLLGK/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01JUCLLGK&linkId=a1332f3ba74345adb5eee8561a38162b',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/81%2BnFIUJLdL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-        
-    }
-}   
 
-    #2111
-    if color_type=="color" and conc_type=="Ethernet Wired" and paper_size=="Letter Legal" and print_type=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.  HP Color Laserjet Pro M254dw '
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Color Laserjet Pro M254dw',
-            'subTitle': 'HP Color Laserjet Pro M254dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B073R2WVKB/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B073R2WVKB&linkId=ec37523e25f2470d1647c3ac210307ca',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/61Djm6Rig9L._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2112
-    if color_type=="color" and conc_type=="Ethernet Wired" and paper_size=="Letter Legal" and print_type=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Color Laserjet Pro MFP M281fdw.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Color Laserjet Pro MFP M281fdw',
-            'subTitle': 'HP Color Laserjet Pro MFP M281fdw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B073RG8Z72/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B073RG8Z72&linkId=197318e01fad128465491ec5ab36a9ca',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/61aYZRJ-zoL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2113
-    if color_type=="color" and conc_type=="Ethernet Wired" and paper_size=="Letter Legal" and print_type=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Color Laserjet Pro MFP M281fdw.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Color Laserjet Pro MFP M281fdw',
-            'subTitle': 'HP Color Laserjet Pro MFP M281fdw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B073RG8Z72/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B073RG8Z72&linkId=197318e01fad128465491ec5ab36a9ca',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/61aYZRJ-zoL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
+def recommend_batch(intent_name, slot_tuples=None, columns=None):
+    """
+    Return the recommendation id (combination code, e.g. '1121') that intent_name gives
+    for each (color, connection, paper size, print type) tuple, or None where it would
+    not recommend anything. Pass either an iterable of tuples, or columns: four equal
+    length sequences holding each slot's values.
+    """
+    profile = INTENT_PROFILES.get(intent_name)
+    if profile is None:
+        raise ValueError('Intent with name {} has no recommendations'.format(intent_name))
+    recommendation_ids = profile['recommendation_ids']
+    resolve = profile['slot_resolver'].resolve
 
-    #2121
-    if color_type=="color" and conc_type=="Ethernet Wired" and paper_size=="Letter Legal 11x17" and print_type=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Color Laserjet Pro MFP M281fdw.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Lexmark CS923de',
-            'subTitle': 'This printer is pricey, but rock solid.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B074VLXCW7/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B074VLXCW7&linkId=acfa0e5e13d49fde0ecec4a47792ad25',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/817z9pbUXqL._SL1500_.jpg'
-            }
-            
-        ]
-        }
+    def recommendation_id(key):
+        # Canonical tuples hit directly; anything else is normalized like a request's slots.
+        found = recommendation_ids.get(key)
+        if found is None and None not in key:
+            found = recommendation_ids.get(tuple(map(resolve, range(len(key)), key)))
+        return found
+
+    if columns is not None:
+        slot_tuples = zip(*columns)
+    return list(map(recommendation_id, slot_tuples))
+
+
+# --- Intents ---
+
+
+# Returned for intents this function does not handle, instead of an empty response
+# that Lex reports as an error and retries.
+UNSUPPORTED_INTENT = {
+    'type': 'Close',
+    'fulfillmentState': 'Failed',
+    'message': {
+        'contentType': 'PlainText',
+        'content': 'Sorry, I can only help you choose a printer.'
     }
 }
 
-    #2122
-    if color_type=="color" and conc_type=="Ethernet Wired" and paper_size=="Letter Legal 11x17" and print_type=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh C2004ex',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7548/Ricoh-MP-C2004ex-Color-Laser-Multifunction-Copier',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/4d644bd6_ricoh_c2004ex.png'
-            },
-            {
-            'title': 'Konica Minolta C227',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7145/Konica-Minolta-Bizhub-C227-Copier-Printer-Scanner?utm_source=productlistingads&utm_medium=adwords&utm_campaign=adwords&gclid=EAIaIQobChMI_rG2-Kff3gIVDr7ACh14SgOsEAQYASABEgKc0PD_BwE',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/3bf7274d_c227.jpeg'
-            }
-            
-        ]
-        }
-        
-    }
-}   
-    #2123
-    if color_type=="color" and conc_type=="Ethernet Wired" and paper_size=="Letter Legal 11x17" and print_type=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh C2004ex',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7548/Ricoh-MP-C2004ex-Color-Laser-Multifunction-Copier',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/4d644bd6_ricoh_c2004ex.png'
-            },
-            {
-            'title': 'Konica Minolta C227',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7145/Konica-Minolta-Bizhub-C227-Copier-Printer-Scanner?utm_source=productlistingads&utm_medium=adwords&utm_campaign=adwords&gclid=EAIaIQobChMI_rG2-Kff3gIVDr7ACh14SgOsEAQYASABEgKc0PD_BwE',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/3bf7274d_c227.jpeg'
-            }
-            
-        ]
-        }
-        
-    }
-}  
-    #2211
-    if color_type=="color" and conc_type=="WiFi Wireless" and paper_size=="Letter Legal" and print_type=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.  HP Color Laserjet Pro M254dw '
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Color Laserjet Pro M254dw',
-            'subTitle': 'HP Color Laserjet Pro M254dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B073R2WVKB/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B073R2WVKB&linkId=ec37523e25f2470d1647c3ac210307ca',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/61Djm6Rig9L._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2212
-    if color_type=="color" and conc_type=="WiFi Wireless" and paper_size=="Letter Legal" and print_type=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Color Laserjet Pro MFP M281fdw.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Color Laserjet Pro MFP M281fdw',
-            'subTitle': 'HP Color Laserjet Pro MFP M281fdw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B073RG8Z72/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B073RG8Z72&linkId=197318e01fad128465491ec5ab36a9ca',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/61aYZRJ-zoL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-
-    #2213
-    if color_type=="color" and conc_type=="WiFi Wireless" and paper_size=="Letter Legal" and print_type=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Color Laserjet Pro MFP M281fdw.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Color Laserjet Pro MFP M281fdw',
-            'subTitle': 'HP Color Laserjet Pro MFP M281fdw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B073RG8Z72/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B073RG8Z72&linkId=197318e01fad128465491ec5ab36a9ca',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/61aYZRJ-zoL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2221
-    if color_type=="color" and conc_type=="WiFi Wireless" and paper_size=="Letter Legal 11x17" and print_type=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Lexmark CS923de'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Lexmark CS923de',
-            'subTitle': 'This printer is pricey, but rock solid.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B074VLXCW7/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B074VLXCW7&linkId=acfa0e5e13d49fde0ecec4a47792ad25',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/817z9pbUXqL._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2222
-    if color_type=="color" and conc_type=="WiFi Wireless" and paper_size=="Letter Legal 11x17" and print_type=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh C2004ex',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7548/Ricoh-MP-C2004ex-Color-Laser-Multifunction-Copier',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/4d644bd6_ricoh_c2004ex.png'
-            },
-            {
-            'title': 'Konica Minolta C227',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7145/Konica-Minolta-Bizhub-C227-Copier-Printer-Scanner?utm_source=productlistingads&utm_medium=adwords&utm_campaign=adwords&gclid=EAIaIQobChMI_rG2-Kff3gIVDr7ACh14SgOsEAQYASABEgKc0PD_BwE',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/3bf7274d_c227.jpeg'
-            }
-            
-        ]
-        }
-        
-    }
-}  
-    #2223
-    if color_type=="color" and conc_type=="WiFi Wireless" and paper_size=="Letter Legal 11x17" and print_type=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh C2004ex',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7548/Ricoh-MP-C2004ex-Color-Laser-Multifunction-Copier',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/4d644bd6_ricoh_c2004ex.png'
-            },
-            {
-            'title': 'Konica Minolta C227',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7145/Konica-Minolta-Bizhub-C227-Copier-Printer-Scanner?utm_source=productlistingads&utm_medium=adwords&utm_campaign=adwords&gclid=EAIaIQobChMI_rG2-Kff3gIVDr7ACh14SgOsEAQYASABEgKc0PD_BwE',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/3bf7274d_c227.jpeg'
-            }
-            
-        ]
-        }
-        
-    }
-}  
-    #2231
-    if color_type=="color" and conc_type=="WiFi Wireless" and paper_size=="24\"-44\" Wide Format" and print_type=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Designjet T520 36'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Designjet T520 36',
-            'subTitle': 'I\'m a fan of HP\'s Designjets. They are reliable and serviceable.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B009ERB6JE/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B009ERB6JE&linkId=0ca1d67addbb131d548f8851940f76c6',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41vn2nZHndL.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2131
-    if color_type=="color" and conc_type=="Ethernet Wired" and paper_size=="24\"-44\" Wide Format" and print_type=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Designjet T520 36'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Designjet T520 36',
-            'subTitle': 'I\'m a fan of HP\'s Designjets. They are reliable and serviceable.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B009ERB6JE/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B009ERB6JE&linkId=0ca1d67addbb131d548f8851940f76c6',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41vn2nZHndL.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2132
-    if color_type=="color" and conc_type=="Ethernet Wired" and paper_size=="24\"-44\" Wide Format" and print_type=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Designjet T520 36'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Designjet T830 MFP 36"',
-            'subTitle': ' I\'m a fan of HP\'s Designjets. They are reliable and serviceable.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B017V5LFLO/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B017V5LFLO&linkId=d25fa8081bbc02b2bc5d8aac596db248',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/91NLa8MjqpL._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2232
-    if color_type=="color" and conc_type=="WiFi Wireless" and paper_size=="24\"-44\" Wide Format" and print_type=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Designjet T520 36'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Designjet T520 36',
-            'subTitle': ' I\'m a fan of HP\'s Designjets. They are reliable and serviceable.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B017V5LFLO/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B017V5LFLO&linkId=d25fa8081bbc02b2bc5d8aac596db248',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/91NLa8MjqpL._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2233
-    if color_type=="color" and conc_type=="WiFi Wireless" and paper_size=="24\"-44\" Wide Format" and print_type=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Designjet T520 36'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Designjet T830 MFP 36"',
-            'subTitle': 'I\'m a fan of HP\'s Designjets. They are reliable and serviceable.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B017V5LFLO/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B017V5LFLO&linkId=d25fa8081bbc02b2bc5d8aac596db248',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/91NLa8MjqpL._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2133
-    if color_type=="color" and conc_type=="Ethernet Wired" and paper_size=="24\"-44\" Wide Format" and print_type=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Designjet T520 36'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Designjet T830 MFP 36"',
-            'subTitle': 'I\'m a fan of HP\'s Designjets. They are reliable and serviceable.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B017V5LFLO/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B017V5LFLO&linkId=d25fa8081bbc02b2bc5d8aac596db248',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/91NLa8MjqpL._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-
-
-
-
 
+@intents.fallback
+def unsupported_intent(request, profile, request_timer=None):
+    logger.warning('Intent with name %s not supported', request.intent_name)
+    return LexResponse(request.session_attributes, UNSUPPORTED_INTENT)
 
 
+with STARTUP.stage('profiles'):
+    catalog_refresher = CatalogRefresher(CATALOG_PROVIDER, CATALOG_TTL_SECONDS, prepare_catalog)
+    catalog_refresher.compare_and_swap(None, initial_catalog['version'], prepare_catalog(initial_catalog))
+    install_catalog(catalog_refresher.get())
 
 
-def get_recommendationa(intent_request):
+def dispatch(request, request_timer=None):
     """
-    
-
-    Beyond fulfillment, the implementation for this intent demonstrates the following:
-    1) Use of elicitSlot in slot validation and re-prompting
-    2) Use of sessionAttributes to pass information that can be used to guide conversation
+    Called when the user specifies an intent for this bot. Returns a LexResponse
+    from the intent's registered handler, or from the fallback.
     """
 
-    color_typea = try_ex(lambda: intent_request['currentIntent']['slots']['slotSup'])
-    conc_typea = try_ex(lambda: intent_request['currentIntent']['slots']['slotBap'])
-    
-
-    paper_sizea = try_ex(lambda: intent_request['currentIntent']['slots']['slotBan'])
-    print_typea = try_ex(lambda: intent_request['currentIntent']['slots']['slotRan'])
-    
-    session_attributes = intent_request['sessionAttributes'] if intent_request['sessionAttributes'] is not None else {}
-
-    # Load confirmation history and track the current reservation.
-    reservation = json.dumps({
-        'color_typea': color_typea,
-        'conc_typea': color_typea,
-        'PaperSizea': paper_sizea,
-        'Print-typea': print_typea,
-    
-    })
-
-    session_attributes['currentReservation'] = reservation
-
-    
-    validation_result = validate_machinesa(intent_request['currentIntent']['slots'])
-    if not validation_result['isValid']:
-        slots = intent_request['currentIntent']['slots']
-        slots[validation_result['violatedSlot']] = None
-
-        return elicit_slot(
-            session_attributes,
-            intent_request['currentIntent']['name'],
-            slots,
-            validation_result['violatedSlot'],
-            validation_result['message']
-        )
-
-    #1111    
-    if color_typea=="black and white" and conc_typea=="Ethernet Wired" and paper_sizea=="Letter Legal" and print_typea=="Print Only":
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother HL-L2350DW   $99 . '
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP LaserJet Enterprise M607dn',
-            'subTitle': 'HP LaserJet Enterprise M607dn',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B0716YY61S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B0716YY61S&linkId=87c68a999365ed7f23b476351b8918c0',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/71bop1%2Be5SL._SL1500_.jpg'
-            },
-            {
-            'title': 'JetDirect 3100',
-            'subTitle': 'For Wifi, NFC, or other wireless options you will need to add a JetDirect 3100.',
-            'attachmentLinkUrl': 'https://www.provantage.com/hp-3jn69a~7HEWE1Y5.htm',
-            'imageUrl': 'https://www.provantage.com/1049378042.JPG'
-            }
-            
-        ]
-        }
-    }
-}
-
-    #1112
-    if color_typea=="black and white" and conc_typea=="Ethernet Wired" and paper_sizea=="Letter Legal" and print_typea=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother Brother MFC-L2750dw  . I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP LaserJet MFP M521dn',
-            'subTitle': 'HP LaserJet MFP M521dn',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B06XC57LNB/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B06XC57LNB&linkId=e19582c23bcf02a4bd52558b54d5f9b4',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/6177R7EJl0L._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-
-    #1113
-    if color_typea=="black and white" and conc_typea=="Ethernet Wired" and paper_sizea=="Letter Legal" and print_typea=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother Brother MFC-L2750dw  . I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP LaserJet MFP M521dn',
-            'subTitle': 'HP LaserJet MFP M521dn',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B06XC57LNB/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B06XC57LNB&linkId=e19582c23bcf02a4bd52558b54d5f9b4',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/6177R7EJl0L._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    
-    #1211
-    if color_typea=="black and white" and conc_typea=="WiFi Wireless" and paper_sizea=="Letter Legal" and print_typea=="Print Only":
-        
-       return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother HL-L2350DW   $99 . '
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP LaserJet Enterprise M607dn',
-            'subTitle': 'HP LaserJet Enterprise M607dn',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B0716YY61S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B0716YY61S&linkId=87c68a999365ed7f23b476351b8918c0',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/71bop1%2Be5SL._SL1500_.jpg'
-            },
-            {
-            'title': 'JetDirect 3100',
-            'subTitle': 'For Wifi, NFC, or other wireless options you will need to add a JetDirect 3100.',
-            'attachmentLinkUrl': 'https://www.provantage.com/hp-3jn69a~7HEWE1Y5.htm',
-            'imageUrl': 'https://www.provantage.com/1049378042.JPG'
-            }
-            
-        ]
-        }
-    }
-}   
-    #1121
-    if color_typea=="black and white" and conc_typea=="Ethernet Wired" and paper_sizea=="Letter Legal 11x17" and print_typea=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh SP 6430DN',
-            'subTitle': 'Ricoh SP 6430DN. The sturdy, low cost per page option.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01132XDD4/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01132XDD4&linkId=1a6d750fc8b8a2ae6daebb4b61532e62',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/51n7ZgLIQlL._AC_SL1056_.jpg'
-            }
-          
-        ]
-        }
-    }
-}    
-    #1122
-    if color_typea=="black and white" and conc_typea=="Ethernet Wired" and paper_sizea=="Letter Legal 11x17" and print_typea=="Print Copy Scan":
-        
-       return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.Brother MFC-L2750dw'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}  
-    #1123
-    if color_typea=="black and white" and conc_typea=="Ethernet Wired" and paper_sizea=="Letter Legal 11x17" and print_typea=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.Brother MFC-L2750dw'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}  
-    #1212
-    if color_typea=="black and white" and conc_typea=="WiFi Wireless" and paper_sizea=="Letter Legal" and print_typea=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother Brother MFC-L2750dw  . I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP LaserJet MFP M521dn',
-            'subTitle': 'HP LaserJet MFP M521dn',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B06XC57LNB/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B06XC57LNB&linkId=e19582c23bcf02a4bd52558b54d5f9b4',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/6177R7EJl0L._SL1500_.jpg'
-            },
-            {
-            'title': 'My recommendation is to connect via ethernet.',
-            'subTitle': 'If you want the printer to connect wirelessly, get this print server:',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B002TIOXMC/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B002TIOXMC&linkId=f88ad86dbdaa37de195d4d96021f1cb6',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/81ar9M4b7iL._SL1500_.jpg'
-                
-            }
-            
-        ]
-        }
-    }
-}
-    #1213
-    if color_typea=="black and white" and conc_typea=="WiFi Wireless" and paper_sizea=="Letter Legal" and print_typea=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother Brother MFC-L2750dw  . I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP LaserJet MFP M521dn',
-            'subTitle': 'HP LaserJet MFP M521dn',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B06XC57LNB/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B06XC57LNB&linkId=e19582c23bcf02a4bd52558b54d5f9b4',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/6177R7EJl0L._SL1500_.jpg'
-            },
-            {
-            'title': 'My recommendation is to connect via ethernet.',
-            'subTitle': 'If you want the printer to connect wirelessly, get this print server:',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B002TIOXMC/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B002TIOXMC&linkId=f88ad86dbdaa37de195d4d96021f1cb6',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/81ar9M4b7iL._SL1500_.jpg'
-                
-            }
-            
-        ]
-        }
-    }
-}
-
-    #1131
-    if color_typea=="black and white" and conc_typea=="Ethernet Wired" and paper_sizea=="24\"-44\" Wide Format" and print_typea=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh SP 6430DN',
-            'subTitle': 'Ricoh SP 6430DN. The sturdy, low cost per page option.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01132XDD4/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01132XDD4&linkId=1a6d750fc8b8a2ae6daebb4b61532e62',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/51n7ZgLIQlL._AC_SL1056_.jpg'
-            }
-            
-        ]
-        }
-    }
-} 
-
-    #1132
-    if color_typea=="black and white" and conc_typea=="Ethernet Wired" and paper_sizea=="24\"-44\" Wide Format" and print_typea=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother Brother MFC-L2750dw  . I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-
-    #1133
-    if color_typea=="black and white" and conc_typea=="Ethernet Wired" and paper_sizea=="24\"-44\" Wide Format" and print_typea=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.Brother MFC-L2750dw'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #1233
-    if color_typea=="black and white" and conc_typea=="WiFi Wireless" and paper_sizea=="24\"-44\" Wide Format" and print_typea=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.Brother MFC-L2750dw'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-
-    #1232
-    if color_typea=="black and white" and conc_typea=="WiFi Wireless" and paper_sizea=="24\"-44\" Wide Format" and print_typea=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother Brother MFC-L2750dw  . I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #1231
-    if color_typea=="black and white" and conc_typea=="WiFi Wireless" and paper_sizea=="24\"-44\" Wide Format" and print_typea=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh SP 6430DN',
-            'subTitle': 'Ricoh SP 6430DN. The sturdy, low cost per page option.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01132XDD4/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01132XDD4&linkId=1a6d750fc8b8a2ae6daebb4b61532e62',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/51n7ZgLIQlL._AC_SL1056_.jpg'
-            }
-        ]
-        }
-    }
-} 
-
-    #1221
-    if color_typea=="black and white" and conc_typea=="WiFi Wireless" and paper_sizea=="Letter Legal 11x17" and print_typea=="Print Only":
-        
-         return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh SP 6430DN',
-            'subTitle': 'Ricoh SP 6430DN will require an external print server to connect wirelessly',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B01132XDD4/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B01132XDD4&linkId=1a6d750fc8b8a2ae6daebb4b61532e62',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/51n7ZgLIQlL._AC_SL1056_.jpg'
-            },
-            {
-            'title': 'Ricoh external print server type O',
-            'subTitle': 'Ricoh external print server type O',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B00E7MNSQK/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B00E7MNSQK&linkId=87af630754bce197af1cf31afa52bfbe',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/816dHTg9E4L._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-} 
-
-    #1222
-    if color_typea=="black and white" and conc_typea=="WiFi Wireless" and paper_sizea=="Letter Legal 11x17" and print_typea=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother Brother MFC-L2750dw  . I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-} 
-    #1223
-    if color_typea=="black and white" and conc_typea=="WiFi Wireless" and paper_sizea=="Letter Legal 11x17" and print_typea=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Brother Brother MFC-L2750dw  . I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Brother MFC-L2750dw',
-            'subTitle': 'Brother MFC-L2750dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B077Y5922S/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B077Y5922S&linkId=15908bce66e4353187727c321c4c5f32',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41QmG1bfeHL._AC_.jpg'
-            }
-            
-        ]
-        }
-    }
-} 
-
-    #2111
-    if color_typea=="color" and conc_typea=="Ethernet Wired" and paper_sizea=="Letter Legal" and print_typea=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.  HP Color Laserjet Pro M254dw '
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Color Laserjet Pro M254dw',
-            'subTitle': 'HP Color Laserjet Pro M254dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B073R2WVKB/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B073R2WVKB&linkId=ec37523e25f2470d1647c3ac210307ca',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/61Djm6Rig9L._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2112
-    if color_typea=="color" and conc_typea=="Ethernet Wired" and paper_sizea=="Letter Legal" and print_typea=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Color Laserjet Pro MFP M281fdw.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Color Laserjet Pro MFP M281fdw',
-            'subTitle': 'HP Color Laserjet Pro MFP M281fdw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B073RG8Z72/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B073RG8Z72&linkId=197318e01fad128465491ec5ab36a9ca',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/61aYZRJ-zoL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2113
-    if color_typea=="color" and conc_typea=="Ethernet Wired" and paper_sizea=="Letter Legal" and print_typea=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Color Laserjet Pro MFP M281fdw.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Color Laserjet Pro MFP M281fdw',
-            'subTitle': 'HP Color Laserjet Pro MFP M281fdw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B073RG8Z72/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B073RG8Z72&linkId=197318e01fad128465491ec5ab36a9ca',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/61aYZRJ-zoL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-
-    #2121
-    if color_typea=="color" and conc_typea=="Ethernet Wired" and paper_sizea=="Letter Legal 11x17" and print_typea=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Color Laserjet Pro MFP M281fdw.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Lexmark CS923de',
-            'subTitle': 'This printer is pricey, but rock solid.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B074VLXCW7/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B074VLXCW7&linkId=acfa0e5e13d49fde0ecec4a47792ad25',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/817z9pbUXqL._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-
-    #2122
-    if color_typea=="color" and conc_typea=="Ethernet Wired" and paper_sizea=="Letter Legal 11x17" and print_typea=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh C2004ex',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7548/Ricoh-MP-C2004ex-Color-Laser-Multifunction-Copier',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/4d644bd6_ricoh_c2004ex.png'
-            },
-            {
-            'title': 'Konica Minolta C227',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7145/Konica-Minolta-Bizhub-C227-Copier-Printer-Scanner?utm_source=productlistingads&utm_medium=adwords&utm_campaign=adwords&gclid=EAIaIQobChMI_rG2-Kff3gIVDr7ACh14SgOsEAQYASABEgKc0PD_BwE',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/3bf7274d_c227.jpeg'
-            }
-            
-        ]
-        }
-        
-    }
-}   
-    #2123
-    if color_typea=="color" and conc_typea=="Ethernet Wired" and paper_sizea=="Letter Legal 11x17" and print_typea=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh C2004ex',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7548/Ricoh-MP-C2004ex-Color-Laser-Multifunction-Copier',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/4d644bd6_ricoh_c2004ex.png'
-            },
-            {
-            'title': 'Konica Minolta C227',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7145/Konica-Minolta-Bizhub-C227-Copier-Printer-Scanner?utm_source=productlistingads&utm_medium=adwords&utm_campaign=adwords&gclid=EAIaIQobChMI_rG2-Kff3gIVDr7ACh14SgOsEAQYASABEgKc0PD_BwE',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/3bf7274d_c227.jpeg'
-            }
-            
-        ]
-        }
-        
-    }
-}  
-    #2211
-    if color_typea=="color" and conc_typea=="WiFi Wireless" and paper_sizea=="Letter Legal" and print_typea=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.  HP Color Laserjet Pro M254dw '
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Color Laserjet Pro M254dw',
-            'subTitle': 'HP Color Laserjet Pro M254dw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B073R2WVKB/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B073R2WVKB&linkId=ec37523e25f2470d1647c3ac210307ca',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/61Djm6Rig9L._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2212
-    if color_typea=="color" and conc_typea=="WiFi Wireless" and paper_sizea=="Letter Legal" and print_typea=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Color Laserjet Pro MFP M281fdw.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Color Laserjet Pro MFP M281fdw',
-            'subTitle': 'HP Color Laserjet Pro MFP M281fdw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B073RG8Z72/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B073RG8Z72&linkId=197318e01fad128465491ec5ab36a9ca',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/61aYZRJ-zoL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-
-    #2213
-    if color_typea=="color" and conc_typea=="WiFi Wireless" and paper_sizea=="Letter Legal" and print_typea=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Color Laserjet Pro MFP M281fdw.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Color Laserjet Pro MFP M281fdw',
-            'subTitle': 'HP Color Laserjet Pro MFP M281fdw',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B073RG8Z72/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B073RG8Z72&linkId=197318e01fad128465491ec5ab36a9ca',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/61aYZRJ-zoL._AC_SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2221
-    if color_typea=="color" and conc_typea=="WiFi Wireless" and paper_sizea=="Letter Legal 11x17" and print_typea=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   Lexmark CS923de'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Lexmark CS923de',
-            'subTitle': 'This printer is pricey, but rock solid.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B074VLXCW7/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B074VLXCW7&linkId=acfa0e5e13d49fde0ecec4a47792ad25',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/817z9pbUXqL._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2222
-    if color_typea=="color" and conc_typea=="WiFi Wireless" and paper_sizea=="Letter Legal 11x17" and print_typea=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh C2004ex',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7548/Ricoh-MP-C2004ex-Color-Laser-Multifunction-Copier',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/4d644bd6_ricoh_c2004ex.png'
-            },
-            {
-            'title': 'Konica Minolta C227',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7145/Konica-Minolta-Bizhub-C227-Copier-Printer-Scanner?utm_source=productlistingads&utm_medium=adwords&utm_campaign=adwords&gclid=EAIaIQobChMI_rG2-Kff3gIVDr7ACh14SgOsEAQYASABEgKc0PD_BwE',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/3bf7274d_c227.jpeg'
-            }
-            
-        ]
-        }
-        
-    }
-}  
-    #2223
-    if color_typea=="color" and conc_typea=="WiFi Wireless" and paper_sizea=="Letter Legal 11x17" and print_typea=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'Ricoh C2004ex',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7548/Ricoh-MP-C2004ex-Color-Laser-Multifunction-Copier',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/4d644bd6_ricoh_c2004ex.png'
-            },
-            {
-            'title': 'Konica Minolta C227',
-            'subTitle': 'Will grow with you. Wireless is an option you buy.',
-            'attachmentLinkUrl': 'https://copyfaxes.com/product/7145/Konica-Minolta-Bizhub-C227-Copier-Printer-Scanner?utm_source=productlistingads&utm_medium=adwords&utm_campaign=adwords&gclid=EAIaIQobChMI_rG2-Kff3gIVDr7ACh14SgOsEAQYASABEgKc0PD_BwE',
-            'imageUrl': 'https://copyfaxes.com/media/p/o/3bf7274d_c227.jpeg'
-            }
-            
-        ]
-        }
-        
-    }
-}  
-    #2231
-    if color_typea=="color" and conc_typea=="WiFi Wireless" and paper_sizea=="24\"-44\" Wide Format" and print_typea=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Designjet T520 36'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Designjet T520 36',
-            'subTitle': 'I\'m a fan of HP\'s Designjets. They are reliable and serviceable.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B009ERB6JE/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B009ERB6JE&linkId=0ca1d67addbb131d548f8851940f76c6',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41vn2nZHndL.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2131
-    if color_typea=="color" and conc_typea=="Ethernet Wired" and paper_sizea=="24\"-44\" Wide Format" and print_typea=="Print Only":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Designjet T520 36'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Designjet T520 36',
-            'subTitle': 'I\'m a fan of HP\'s Designjets. They are reliable and serviceable.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B009ERB6JE/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B009ERB6JE&linkId=0ca1d67addbb131d548f8851940f76c6',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/41vn2nZHndL.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2132
-    if color_typea=="color" and conc_typea=="Ethernet Wired" and paper_sizea=="24\"-44\" Wide Format" and print_typea=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Designjet T520 36'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Designjet T830 MFP 36"',
-            'subTitle': ' I\'m a fan of HP\'s Designjets. They are reliable and serviceable.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B017V5LFLO/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B017V5LFLO&linkId=d25fa8081bbc02b2bc5d8aac596db248',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/91NLa8MjqpL._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2232
-    if color_typea=="color" and conc_typea=="WiFi Wireless" and paper_sizea=="24\"-44\" Wide Format" and print_typea=="Print Copy Scan":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Designjet T520 36'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Designjet T830 MFP 36"',
-            'subTitle': ' I\'m a fan of HP\'s Designjets. They are reliable and serviceable.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B017V5LFLO/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B017V5LFLO&linkId=d25fa8081bbc02b2bc5d8aac596db248',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/91NLa8MjqpL._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2233
-    if color_typea=="color" and conc_typea=="WiFi Wireless" and paper_sizea=="24\"-44\" Wide Format" and print_typea=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Designjet T520 36'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Designjet T830 MFP 36"',
-            'subTitle': 'I\'m a fan of HP\'s Designjets. They are reliable and serviceable.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B017V5LFLO/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B017V5LFLO&linkId=d25fa8081bbc02b2bc5d8aac596db248',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/91NLa8MjqpL._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-    #2133
-    if color_typea=="color" and conc_typea=="Ethernet Wired" and paper_sizea=="24\"-44\" Wide Format" and print_typea=="Print Copy Scan Fax":
-        
-        return {
-    'dialogAction': {
-        'type': 'Close',
-        'fulfillmentState': 'Fulfilled',
-        'message': {
-            'contentType': 'PlainText',
-            'content': 'Great! I have a recommendation for you. I\'ll send it now with a link to Amazon.   HP Designjet T520 36'
-        },
-        'responseCard': {
-        'version': '0',
-        'contentType': 'application/vnd.amazonaws.card.generic',
-        'genericAttachments': [
-            {
-            'title': 'HP Designjet T520 36',
-            'subTitle': 'I\'m a fan of HP\'s Designjets. They are reliable and serviceable.',
-            'attachmentLinkUrl': 'https://www.amazon.com/gp/product/B017V5LFLO/ref=as_li_qf_asin_il_tl?ie=UTF8&tag=mondayswith0f-20&creative=9325&linkCode=as2&creativeASIN=B017V5LFLO&linkId=d25fa8081bbc02b2bc5d8aac596db248',
-            'imageUrl': 'https://images-na.ssl-images-amazon.com/images/I/91NLa8MjqpL._SL1500_.jpg'
-            }
-            
-        ]
-        }
-    }
-}
-
+    logger.debug('dispatch userId=%s, intentName=%s', request.user_id, request.intent_name)
 
+    intent_name = request.intent_name
+    return intents.handler(intent_name)(request, INTENT_PROFILES.get(intent_name), request_timer)
 
 
+# --- Main handler ---
 
 
-
-# --- Intents ---
-
-
-def dispatch(intent_request):
+def lambda_handler(event, context):
     """
-    Called when the user specifies an intent for this bot.
+    Route the incoming request based on intent.
+    The JSON body of the request is provided in the event slot.
     """
+    request_timer = RequestTimer()
+    refresh_catalog()
+    request = LexEvent.from_dict(event)
+    logger.debug('event.bot.name=%s', request.bot_name)
 
-    logger.debug('dispatch userId={}, intentName={}'.format(intent_request['userId'], intent_request['currentIntent']['name']))
-
-    intent_name = intent_request['currentIntent']['name']
-
-    # Dispatch to your bot's intent handlers
-    if intent_name == 'QuizContinue':
-        return get_recommendation(intent_request)
-    if intent_name == 'QuizContinueA':
-        return get_recommendationa(intent_request)    
-
-    #raise Exception('Intent with name ' + intent_name + ' not supported')
-
-
-# --- Main handler ---
+    response = dispatch(request, request_timer)
+    if latency_recorder is not None:
+        latency_recorder.record(request.intent_name, request_timer)
+    if REQUEST_LOG_EVERY and next(request_counter) % REQUEST_LOG_EVERY == 0:
+        log_request(request, request_timer)
+    return response.encode(request)
 
 
-def lambda_handler(event, context):
+def log_request(request, request_timer):
     """
-    Route the incoming request based on intent.
-    The JSON body of the request is provided in the event slot.
+    Log one JSON line with the request's user, intent, slot combination, total latency,
+    stage latencies and the response cache's counters.
     """
-    # By default, treat the user request as coming from the America/New_York time zone.
-    os.environ['TZ'] = 'America/New_York'
-    time.tzset()
-    logger.debug('event.bot.name={}'.format(event['bot']['name']))
+    line = {
+        'userId': request.user_id,
+        'intent': request.intent_name,
+        'combination': request_timer.combination,
+        'latencyMs': round(request_timer.elapsed() * 1000, 3),
+        'stagesMs': dict((stage, round(seconds * 1000, 3)) for stage, seconds in request_timer.stages),
+    }
+    if response_cache is not None:
+        line['responseCache'] = {
+            'hits': response_cache.hits,
+            'misses': response_cache.misses,
+            'size': len(response_cache),
+        }
+    request_logger.info(json.dumps(line, sort_keys=True))
+
 
-    return dispatch(event)
+STARTUP.report()
@@ -0,0 +1,251 @@
+"""
+Benchmark lambda_handler in-process against generated or recorded Lex V1 events,
+or the same events converted to Lex V2 with --lex-version 2.
+
+Generated events cover every slot combination of each quiz intent, invalid slot
+values and partially filled dialog turns. Results are compared against a saved
+baseline, and the run fails when a category's median latency or throughput
+regresses by more than the threshold.
+
+    python bench_handler.py                     # compare against bench_baseline.json
+    python bench_handler.py --save-baseline     # record a new baseline
+    python bench_handler.py --events events.json --iterations 50
+    python bench_handler.py --lex-version 2     # V2 events against bench_baseline_v2.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+
+import basic
+from instrumentation import percentile, timer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# V2 events are larger to parse and encode, so each Lex version has its own baseline.
+DEFAULT_BASELINES = {
+    1: os.path.join(HERE, 'bench_baseline.json'),
+    2: os.path.join(HERE, 'bench_baseline_v2.json'),
+}
+
+COLOR_TYPES = ['black and white', 'color']
+CONC_TYPES = ['Ethernet Wired', 'WiFi Wireless']
+PAPER_SIZES = ['Letter Legal', 'Letter Legal 11x17', '24"-44" Wide Format']
+PRINT_TYPES = ['Print Only', 'Print Copy Scan', 'Print Copy Scan Fax']
+SLOT_VALUES = tuple(tuple(values) for values in (COLOR_TYPES, CONC_TYPES, PAPER_SIZES, PRINT_TYPES))
+
+# Slot names in (color, connection, paper size, print type) order.
+INTENT_SLOTS = {
+    'QuizContinue': ('slotFour', 'slotThree', 'slotOne', 'slotTwo'),
+    'QuizContinueA': ('slotSup', 'slotBap', 'slotBan', 'slotRan'),
+}
+
+# Answers that fail validation, one invalid value per slot in turn. None of them is
+# within the slot resolver's reach of a valid value or synonym.
+INVALID_ANSWERS = (
+    ('purple', 'WiFi Wireless', None, None),
+    ('rainbow', None, None, None),
+    ('color', 'USB Cable', None, None),
+    ('color', 'WiFi Wireless', 'A4', None),
+    ('color', 'WiFi Wireless', 'Letter Legal', '3D Print'),
+)
+
+
+def build_event(intent_name, slots, invocation_source='FulfillmentCodeHook'):
+    return {
+        'currentIntent': {
+            'slots': slots,
+            'name': intent_name,
+            'confirmationStatus': 'None'
+        },
+        'bot': {
+            'alias': '$LATEST',
+            'version': '$LATEST',
+            'name': 'PrinterBot'
+        },
+        'userId': 'bench',
+        'invocationSource': invocation_source,
+        'outputDialogMode': 'Text',
+        'messageVersion': '1.0',
+        'inputTranscript': 'user message',
+        'sessionAttributes': {}
+    }
+
+
+def to_v2_event(event):
+    """
+    Convert a Lex V1 event into the Lex V2 event for the same turn.
+    """
+    intent = event['currentIntent']
+    slots = dict(
+        (name, {'shape': 'Scalar', 'value': {'originalValue': value, 'interpretedValue': value, 'resolvedValues': [value]}} if value else None)
+        for name, value in (intent.get('slots') or {}).items()
+    )
+    bot = event.get('bot') or {}
+    return {
+        'messageVersion': '1.0',
+        'invocationSource': event.get('invocationSource'),
+        'inputMode': 'Text',
+        'responseContentType': 'text/plain; charset=utf-8',
+        'sessionId': event.get('userId'),
+        'inputTranscript': event.get('inputTranscript'),
+        'bot': {'id': 'BENCHBOT01', 'name': bot.get('name'), 'aliasId': 'TSTALIASID', 'localeId': 'en_US', 'version': 'DRAFT'},
+        'interpretations': [{'intent': {'name': intent['name'], 'slots': slots, 'state': 'InProgress', 'confirmationState': 'None'}}],
+        'requestAttributes': {},
+        'sessionState': {
+            'sessionAttributes': event.get('sessionAttributes') or {},
+            'activeContexts': [],
+            'intent': {
+                'name': intent['name'],
+                'slots': slots,
+                'state': 'InProgress',
+                'confirmationState': intent.get('confirmationStatus') or 'None'
+            }
+        }
+    }
+
+
+def generate_events():
+    """
+    Return (category, event) pairs for every scenario the benchmark covers.
+    """
+    events = []
+    for intent_name, slot_names in sorted(INTENT_SLOTS.items()):
+        partial_keys = set()
+        for key in itertools.product(COLOR_TYPES, CONC_TYPES, PAPER_SIZES, PRINT_TYPES):
+            events.append(('fulfilled', build_event(intent_name, dict(zip(slot_names, key)))))
+
+            # The dialog turns that led up to this combination: one more slot filled each turn.
+            for filled in range(len(slot_names)):
+                partial_key = key[:filled] + (None,) * (len(slot_names) - filled)
+                if partial_key not in partial_keys:
+                    partial_keys.add(partial_key)
+                    events.append(('partial', build_event(intent_name, dict(zip(slot_names, partial_key)), 'DialogCodeHook')))
+
+        for answers in INVALID_ANSWERS:
+            events.append(('invalid', build_event(intent_name, dict(zip(slot_names, answers)), 'DialogCodeHook')))
+    return events
+
+
+def load_events(path):
+    """
+    Load recorded Lex events: a JSON list of events, or of {"category", "event"} objects.
+    """
+    with open(path) as f:
+        records = json.load(f)
+    events = []
+    for record in records:
+        if 'event' in record:
+            events.append((record.get('category', 'recorded'), record['event']))
+        else:
+            events.append(('recorded', record))
+    return events
+
+
+def quiet_logging():
+    """
+    Keep the handler's INFO lines, such as response cache clears and catalog swaps,
+    out of measurements; warnings still show.
+    """
+    basic.logger.setLevel('WARNING')
+
+
+def summarize(latencies):
+    latencies = sorted(latencies)
+    return {
+        'count': len(latencies),
+        'throughput': len(latencies) / sum(latencies),
+        'p50_us': percentile(latencies, 0.50) * 1e6,
+        'p95_us': percentile(latencies, 0.95) * 1e6,
+        'p99_us': percentile(latencies, 0.99) * 1e6,
+    }
+
+
+def run(events, iterations=20):
+    """
+    Replay events through lambda_handler and summarize latency per category.
+    Only the handler call is timed; each call gets a freshly decoded event,
+    as it would in Lambda, since the handler mutates its input.
+    """
+    encoded = [(category, json.dumps(event)) for category, event in events]
+    latencies = {}
+    for _ in range(iterations):
+        for category, raw in encoded:
+            event = json.loads(raw)
+            started = timer()
+            basic.lambda_handler(event, None)
+            latencies.setdefault(category, []).append(timer() - started)
+
+    results = dict((category, summarize(samples)) for category, samples in latencies.items())
+    results['all'] = summarize([sample for samples in latencies.values() for sample in samples])
+    return {
+        'python': platform.python_version(),
+        'iterations': iterations,
+        'categories': results,
+    }
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    Return a description of every category whose median latency rose, or whose
+    throughput fell, by more than threshold (a fraction) relative to baseline.
+    """
+    regressions = []
+    for category, expected in sorted(baseline['categories'].items()):
+        actual = results['categories'].get(category)
+        if actual is None:
+            continue
+        if actual['p50_us'] > expected['p50_us'] * (1 + threshold):
+            regressions.append('{}: p50 {:.2f} us vs baseline {:.2f} us'.format(category, actual['p50_us'], expected['p50_us']))
+        if actual['throughput'] < expected['throughput'] * (1 - threshold):
+            regressions.append('{}: {:.0f} req/s vs baseline {:.0f} req/s'.format(category, actual['throughput'], expected['throughput']))
+    return regressions
+
+
+def print_results(results):
+    print('{:<10} {:>7} {:>11} {:>9} {:>9} {:>9}'.format('category', 'count', 'req/s', 'p50 us', 'p95 us', 'p99 us'))
+    for category, summary in sorted(results['categories'].items()):
+        print('{:<10} {:>7} {:>11.0f} {:>9.2f} {:>9.2f} {:>9.2f}'.format(
+            category, summary['count'], summary['throughput'], summary['p50_us'], summary['p95_us'], summary['p99_us']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', help='JSON file of recorded Lex events to replay instead of generated ones')
+    parser.add_argument('--iterations', type=int, default=20, help='times to replay every event')
+    parser.add_argument('--baseline', help='baseline results file (default: the one for --lex-version)')
+    parser.add_argument('--save-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed regression as a fraction')
+    parser.add_argument('--lex-version', type=int, choices=(1, 2), default=1, help='replay the events as Lex V1 or V2 events')
+    args = parser.parse_args(argv)
+    if args.baseline is None:
+        args.baseline = DEFAULT_BASELINES[args.lex_version]
+
+    quiet_logging()
+    events = load_events(args.events) if args.events else generate_events()
+    if args.lex_version == 2:
+        events = [(category, event if 'sessionState' in event else to_v2_event(event)) for category, event in events]
+    results = run(events, args.iterations)
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print('Saved baseline to {}'.format(args.baseline))
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline at {}; run with --save-baseline to create one'.format(args.baseline))
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = find_regressions(results, baseline, args.threshold)
+    for regression in regressions:
+        print('REGRESSION ' + regression)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Compare the lex.py response model against the dict literals basic.py used to build.
+
+For an ElicitSlot re-prompt and a fulfilled recommendation, reports the bytes
+allocated per request to read the event and build the response, the time to
+build the response dict and the time to build it and encode it to JSON.
+
+    python bench_model.py [--number 100000]
+"""
+import argparse
+import json
+import sys
+import timeit
+
+import basic
+from lex import ElicitSlot, LexEvent, LexResponse
+
+EVENT = {
+    'currentIntent': {
+        'name': 'QuizContinue',
+        'slots': {'slotFour': 'purple', 'slotThree': None, 'slotOne': None, 'slotTwo': None},
+        'confirmationStatus': 'None'
+    },
+    'bot': {'alias': '$LATEST', 'version': '$LATEST', 'name': 'PrinterBot'},
+    'userId': 'bench',
+    'invocationSource': 'DialogCodeHook',
+    'outputDialogMode': 'Text',
+    'messageVersion': '1.0',
+    'inputTranscript': 'purple',
+    'sessionAttributes': {}
+}
+MESSAGE = {'contentType': 'PlainText', 'content': basic.VALIDATION_MESSAGES[0]}
+TEMPLATE = next(iter(basic.INTENT_PROFILES['QuizContinue']['responses'].values()))
+
+
+def elicit_literal(event):
+    return {
+        'sessionAttributes': event['sessionAttributes'],
+        'dialogAction': {
+            'type': 'ElicitSlot',
+            'intentName': event['currentIntent']['name'],
+            'slots': event['currentIntent']['slots'],
+            'slotToElicit': 'slotFour',
+            'message': MESSAGE
+        }
+    }
+
+
+def elicit_model(event):
+    request = LexEvent.from_dict(event)
+    return LexResponse(request.session_attributes, ElicitSlot(request.intent_name, request.slots, 'slotFour', MESSAGE)).to_dict()
+
+
+def fulfilled_literal(event):
+    return {
+        'sessionAttributes': event['sessionAttributes'],
+        'dialogAction': TEMPLATE
+    }
+
+
+def fulfilled_model(event):
+    request = LexEvent.from_dict(event)
+    return LexResponse(request.session_attributes, TEMPLATE).to_dict()
+
+
+SCENARIOS = (
+    ('elicit', elicit_literal, elicit_model),
+    ('fulfilled', fulfilled_literal, fulfilled_model),
+)
+
+
+def allocated_bytes(name, label, build):
+    """
+    Bytes allocated per request to read the event and build the response, not
+    counting the event's own values and the prebuilt templates, which are shared.
+    """
+    response = build(EVENT)
+    size = sys.getsizeof(response)
+    if response['dialogAction'] is not TEMPLATE:
+        size += sys.getsizeof(response['dialogAction'])
+    if label == 'model':
+        size += sys.getsizeof(LexEvent.from_dict(EVENT)) + sys.getsizeof(LexResponse(None, None))
+        if name == 'elicit':
+            size += sys.getsizeof(ElicitSlot(None, None, None))
+    return size
+
+
+def measure(number=100000):
+    """
+    Return {scenario: {'literal' | 'model': {'bytes', 'build_us', 'json_us'}}}.
+    """
+    results = {}
+    for name, literal, model in SCENARIOS:
+        results[name] = {}
+        for label, build in (('literal', literal), ('model', model)):
+            build_seconds = min(timeit.repeat(lambda: build(EVENT), number=number, repeat=3))
+            json_seconds = min(timeit.repeat(lambda: json.dumps(build(EVENT)), number=number // 10, repeat=3))
+            results[name][label] = {
+                'bytes': allocated_bytes(name, label, build),
+                'build_us': build_seconds / number * 1e6,
+                'json_us': json_seconds / (number // 10) * 1e6,
+            }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=100000, help='calls timed per measurement')
+    args = parser.parse_args(argv)
+
+    print('{:<10} {:<8} {:>7} {:>10} {:>9}'.format('scenario', 'builder', 'bytes', 'build us', 'json us'))
+    for name, builders in sorted(measure(args.number).items()):
+        for label, result in sorted(builders.items()):
+            print('{:<10} {:<8} {:>7} {:>10.3f} {:>9.3f}'.format(name, label, result['bytes'], result['build_us'], result['json_us']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import collections
+import unittest
+
+import basic
+import bench_handler
+import bench_model
+import lex
+
+
+class BenchHandlerTestCase(unittest.TestCase):
+
+    def test_generated_events_cover_every_scenario(self):
+        """Every combination of both intents, plus partial and invalid turns"""
+        counts = collections.Counter(category for category, event in bench_handler.generate_events())
+        self.assertEqual(counts['fulfilled'], 72)
+        # 1 + 2 + 4 + 12 distinct partially filled turns per intent.
+        self.assertEqual(counts['partial'], 38)
+        self.assertEqual(counts['invalid'], 10)
+
+    def test_invalid_events_are_rejected(self):
+        """Every invalid event re-prompts, covering each of the four slots"""
+        elicited = set()
+        for category, event in bench_handler.generate_events():
+            if category == 'invalid':
+                res = basic.lambda_handler(event, None)
+                self.assertEqual(res['dialogAction']['type'], 'ElicitSlot', event['currentIntent']['slots'])
+                elicited.add(res['dialogAction']['slotToElicit'])
+        self.assertEqual(elicited, set(name for names in bench_handler.INTENT_SLOTS.values() for name in names))
+
+    def test_run_summarizes_each_category(self):
+        """A short run reports throughput and latency percentiles per category"""
+        results = bench_handler.run(bench_handler.generate_events(), iterations=2)
+        self.assertEqual(set(results['categories']), set(['all', 'fulfilled', 'partial', 'invalid']))
+        for summary in results['categories'].values():
+            self.assertGreater(summary['throughput'], 0)
+            self.assertTrue(0 < summary['p50_us'] <= summary['p95_us'] <= summary['p99_us'])
+
+    def test_v2_events(self):
+        """Generated events convert to Lex V2 events for the same turn"""
+        for category, event in bench_handler.generate_events()[:10]:
+            v2_event = bench_handler.to_v2_event(event)
+            request = lex.LexEvent.from_dict(v2_event)
+            self.assertEqual(request.lex_version, 2)
+            self.assertEqual(request.slots, event['currentIntent']['slots'])
+            self.assertEqual(request.intent_name, event['currentIntent']['name'])
+
+    def test_find_regressions(self):
+        """Slower medians or lower throughput beyond the threshold are regressions"""
+        baseline = {'categories': {'all': {'p50_us': 10.0, 'throughput': 1000.0}}}
+        same = {'categories': {'all': {'p50_us': 12.0, 'throughput': 800.0}}}
+        slower = {'categories': {'all': {'p50_us': 13.0, 'throughput': 1000.0}}}
+        fewer = {'categories': {'all': {'p50_us': 10.0, 'throughput': 700.0}}}
+        self.assertEqual(bench_handler.find_regressions(same, baseline, 0.25), [])
+        self.assertEqual(len(bench_handler.find_regressions(slower, baseline, 0.25)), 1)
+        self.assertEqual(len(bench_handler.find_regressions(fewer, baseline, 0.25)), 1)
+
+
+
+class BenchModelTestCase(unittest.TestCase):
+
+    def test_builders_agree(self):
+        """The model encodes to the same responses as the dict literals"""
+        for name, literal, model in bench_model.SCENARIOS:
+            self.assertEqual(model(bench_model.EVENT), literal(bench_model.EVENT))
+
+    def test_measure(self):
+        """Every scenario reports memory and timings for both builders"""
+        results = bench_model.measure(number=20)
+        for builders in results.values():
+            self.assertEqual(set(builders), set(['literal', 'model']))
+            for result in builders.values():
+                self.assertGreater(result['bytes'], 0)
+                self.assertGreater(result['build_us'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Microbenchmark for the time zone setup lambda_handler used to run on every request.
+
+Compares a request that also sets TZ and calls time.tzset() (the old per-invocation
+behavior) with a request against the module-level initialization in basic.py.
+
+    python bench_timezone.py [iterations]
+"""
+import os
+import sys
+import time
+import timeit
+
+import basic
+import bench_handler
+
+EVENT_SLOTS = {
+    'slotFour': 'color',
+    'slotThree': 'Ethernet Wired',
+    'slotOne': '24"-44" Wide Format',
+    'slotTwo': 'Print Copy Scan Fax',
+}
+
+
+def build_event():
+    return {
+        'currentIntent': {'name': 'QuizContinue', 'slots': dict(EVENT_SLOTS)},
+        'bot': {'name': 'TestBot'},
+        'userId': 'uid',
+        'sessionAttributes': {}
+    }
+
+
+def per_request_tzset():
+    os.environ['TZ'] = basic.BOT_TIMEZONE
+    time.tzset()
+
+
+def handle_with_tzset():
+    per_request_tzset()
+    return basic.lambda_handler(build_event(), None)
+
+
+def handle():
+    return basic.lambda_handler(build_event(), None)
+
+
+def best_per_call(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main(number=20000):
+    bench_handler.quiet_logging()
+    tzset = best_per_call(per_request_tzset, number)
+    before = best_per_call(handle_with_tzset, number)
+    after = best_per_call(handle, number)
+    print('tzset alone:            {:8.2f} us'.format(tzset * 1e6))
+    print('handler, tzset/request: {:8.2f} us'.format(before * 1e6))
+    print('handler, tzset at load: {:8.2f} us'.format(after * 1e6))
+    print('saved per invocation:   {:8.2f} us ({:.0%})'.format((before - after) * 1e6, (before - after) / before))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,60 @@
+"""
+Bounded least-recently-used cache shared by the warm-container caches.
+"""
+import collections
+
+
+class LRUCache(object):
+    """
+    Mapping with at most maxsize entries that evicts the least recently used one.
+    Counts hits and misses so callers can log how well it works.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        try:
+            value = self.entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.entries[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries.pop(key, None)
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+class VersionedLRUCache(LRUCache):
+    """
+    LRUCache whose entries were all computed from one version of their source data.
+    """
+
+    def __init__(self, maxsize=1024, version=None):
+        LRUCache.__init__(self, maxsize)
+        self.version = version
+
+    def check_version(self, version):
+        """
+        Drop every entry when version differs from the one they were computed from.
+        Returns True if the cache was invalidated.
+        """
+        if version == self.version:
+            return False
+        self.clear()
+        self.version = version
+        return True
@@ -0,0 +1,42 @@
+import unittest
+
+import cache
+
+
+class LRUCacheTestCase(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        """The entry used longest ago goes first"""
+        lru = cache.LRUCache(2)
+        lru.put('a', 1)
+        lru.put('b', 2)
+        lru.get('a')
+        lru.put('c', 3)
+        self.assertEqual(len(lru), 2)
+        self.assertEqual(lru.get('a'), 1)
+        self.assertIsNone(lru.get('b'))
+
+    def test_counts_hits_and_misses(self):
+        """Lookups are counted"""
+        lru = cache.LRUCache()
+        lru.put('a', 1)
+        lru.get('a')
+        lru.get('b', 0)
+        self.assertEqual((lru.hits, lru.misses), (1, 1))
+
+
+class VersionedLRUCacheTestCase(unittest.TestCase):
+
+    def test_new_version_invalidates(self):
+        """Entries are dropped when the version changes, and only then"""
+        lru = cache.VersionedLRUCache(version=1)
+        lru.put('a', 1)
+        self.assertFalse(lru.check_version(1))
+        self.assertEqual(lru.get('a'), 1)
+        self.assertTrue(lru.check_version(2))
+        self.assertEqual(len(lru), 0)
+        self.assertEqual(lru.version, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Response cards that fit within Lex's limits, checked when they are built.
+
+Lex rejects a response whose card is too large, and the user sees an error
+instead of a recommendation. Every card is therefore fitted when it is built,
+which for the catalog's recommendations means once per catalog load: titles,
+subtitles and button texts that are too long are shortened, and cards keep at
+most MAX_ATTACHMENTS attachments of at most MAX_BUTTONS buttons each. URLs and
+button values cannot be shortened without breaking them, so those, like
+messages that are too long, raise ValueError and a bad catalog never replaces
+the current one. The limits are the tighter of Lex V1's and V2's, since
+responses are encoded in either.
+
+AttachmentPool keeps one shared instance of each distinct attachment and card,
+so recommendations showing the same products share them.
+"""
+import logging
+
+logger = logging.getLogger()
+
+CARD_CONTENT_TYPE = 'application/vnd.amazonaws.card.generic'
+
+MAX_ATTACHMENTS = 10
+MAX_BUTTONS = 5
+MAX_MESSAGE_LENGTH = 1000
+
+# Fields longer than their limit are shortened.
+TEXT_LIMITS = {'title': 80, 'subTitle': 80}
+BUTTON_TEXT_LIMIT = 15
+# Fields longer than their limit are rejected. V2 responses carry each link as a
+# plain text message of its own (see lex.encode_v2_messages), so links are held to
+# the message limit rather than V1's 2048 characters.
+URL_LIMITS = {'attachmentLinkUrl': min(2048, MAX_MESSAGE_LENGTH), 'imageUrl': 250}
+BUTTON_VALUE_LIMIT = 50
+
+ELLIPSIS = '...'
+
+
+def truncate(text, limit):
+    """
+    Shorten text to at most limit characters, marking the cut with ELLIPSIS.
+    """
+    if len(text) <= limit:
+        return text
+    return text[:limit - len(ELLIPSIS)].rstrip() + ELLIPSIS
+
+
+def check_message(content):
+    """
+    Raise ValueError unless content fits in a Lex message.
+    """
+    if not content or len(content) > MAX_MESSAGE_LENGTH:
+        raise ValueError('Message must be 1 to {} characters, not {}: {!r}'.format(MAX_MESSAGE_LENGTH, len(content or ''), (content or '')[:40]))
+    return content
+
+
+def fit_button(button):
+    value = button['value']
+    if not value or len(value) > BUTTON_VALUE_LIMIT:
+        raise ValueError('Button value must be 1 to {} characters: {!r}'.format(BUTTON_VALUE_LIMIT, value))
+    return {'text': truncate(button['text'], BUTTON_TEXT_LIMIT), 'value': value}
+
+
+def fit_attachment(attachment):
+    """
+    Return a copy of a generic attachment that fits Lex's limits.
+    """
+    if not attachment.get('title'):
+        raise ValueError('Attachment has no title: {!r}'.format(attachment))
+    fitted = {}
+    for field, value in attachment.items():
+        if value is None:
+            continue
+        if field in TEXT_LIMITS:
+            value = truncate(value, TEXT_LIMITS[field])
+        elif field in URL_LIMITS:
+            if len(value) > URL_LIMITS[field]:
+                raise ValueError('{} of {!r} is longer than {} characters'.format(field, attachment['title'], URL_LIMITS[field]))
+        elif field == 'buttons':
+            if len(value) > MAX_BUTTONS:
+                logger.warning('Attachment %r keeps %d of its %d buttons', attachment['title'], MAX_BUTTONS, len(value))
+            value = [fit_button(button) for button in value[:MAX_BUTTONS]]
+        else:
+            raise ValueError('Unknown attachment field {!r}'.format(field))
+        fitted[field] = value
+    return fitted
+
+
+def build_card(attachments, fit=fit_attachment):
+    """
+    Build a generic responseCard of attachments, each fitted by fit().
+    """
+    if len(attachments) > MAX_ATTACHMENTS:
+        logger.warning('Response card keeps %d of its %d attachments', MAX_ATTACHMENTS, len(attachments))
+    return {
+        'version': '0',
+        'contentType': CARD_CONTENT_TYPE,
+        'genericAttachments': [fit(attachment) for attachment in attachments[:MAX_ATTACHMENTS]]
+    }
+
+
+def attachment_key(attachment):
+    return tuple(sorted(
+        (field, tuple(tuple(sorted(button.items())) for button in value) if field == 'buttons' else value)
+        for field, value in attachment.items() if value is not None
+    ))
+
+
+class AttachmentPool(object):
+    """
+    Fits attachments and cards once and shares each distinct one. Shared values
+    must never be mutated.
+    """
+
+    def __init__(self):
+        self.attachments = {}
+        self.cards = {}
+
+    def __len__(self):
+        return len(self.attachments)
+
+    def add(self, attachment):
+        """
+        Return the shared, fitted instance of attachment.
+        """
+        key = attachment_key(attachment)
+        shared = self.attachments.get(key)
+        if shared is None:
+            shared = self.attachments[key] = fit_attachment(attachment)
+        return shared
+
+    def card(self, attachments):
+        """
+        Return the shared responseCard showing attachments, in order.
+        """
+        key = tuple(id(self.add(attachment)) for attachment in attachments)
+        card = self.cards.get(key)
+        if card is None:
+            card = self.cards[key] = build_card(attachments, self.add)
+        return card
@@ -0,0 +1,106 @@
+import unittest
+
+import basic
+import bench_handler
+import cards
+import lex
+
+ATTACHMENT = {
+    'title': 'Brother HL-L2350DW',
+    'subTitle': 'Compact monochrome laser printer',
+    'attachmentLinkUrl': 'https://example.com/brother',
+    'imageUrl': 'https://example.com/brother.jpg'
+}
+
+
+def buttons(count):
+    return [{'text': 'Option {}'.format(number), 'value': str(number)} for number in range(count)]
+
+
+class FitAttachmentTestCase(unittest.TestCase):
+
+    def test_fitting_attachment_is_unchanged(self):
+        """An attachment within the limits keeps every field"""
+        self.assertEqual(cards.fit_attachment(ATTACHMENT), ATTACHMENT)
+
+    def test_long_text_is_shortened(self):
+        """Titles, subtitles and button texts are cut to their limits"""
+        attachment = dict(ATTACHMENT, title='x' * 100, subTitle='y ' * 50, buttons=[{'text': 'Print Copy Scan Fax', 'value': '3'}])
+        fitted = cards.fit_attachment(attachment)
+        self.assertEqual(len(fitted['title']), cards.TEXT_LIMITS['title'])
+        self.assertTrue(fitted['title'].endswith(cards.ELLIPSIS))
+        self.assertLessEqual(len(fitted['subTitle']), cards.TEXT_LIMITS['subTitle'])
+        self.assertEqual(fitted['buttons'], [{'text': 'Print Copy S...', 'value': '3'}])
+
+    def test_buttons_are_capped(self):
+        """Attachments keep at most MAX_BUTTONS buttons"""
+        fitted = cards.fit_attachment(dict(ATTACHMENT, buttons=buttons(7)))
+        self.assertEqual(fitted['buttons'], buttons(cards.MAX_BUTTONS))
+
+    def test_rejects_what_cannot_be_shortened(self):
+        """Long URLs and button values, missing titles and unknown fields are errors"""
+        for attachment in (
+            dict(ATTACHMENT, imageUrl='https://example.com/' + 'x' * 250),
+            dict(ATTACHMENT, buttons=[{'text': 'Go', 'value': 'v' * 51}]),
+            dict(ATTACHMENT, title=''),
+            dict(ATTACHMENT, price='$99'),
+        ):
+            self.assertRaises(ValueError, cards.fit_attachment, attachment)
+
+    def test_links_fit_a_v2_message(self):
+        """Links that would make an oversized V2 message are rejected; the longest allowed fits"""
+        self.assertRaises(ValueError, cards.fit_attachment, dict(ATTACHMENT, attachmentLinkUrl='https://example.com/' + 'x' * 1500))
+
+        link = 'https://example.com/' + 'x' * (cards.MAX_MESSAGE_LENGTH - len('https://example.com/'))
+        template = basic.build_recommendation('Here you go', [dict(ATTACHMENT, attachmentLinkUrl=link)])
+        request = lex.LexEvent.from_dict(bench_handler.to_v2_event(bench_handler.build_event('QuizContinue', {})))
+        messages = lex.LexResponse({}, template).to_v2_dict(request)['messages']
+        self.assertIn({'contentType': 'PlainText', 'content': link}, messages)
+        for message in messages:
+            if message['contentType'] == 'PlainText':
+                cards.check_message(message['content'])
+
+    def test_check_message(self):
+        """Messages must be 1 to MAX_MESSAGE_LENGTH characters"""
+        self.assertEqual(cards.check_message('Hello'), 'Hello')
+        self.assertRaises(ValueError, cards.check_message, '')
+        self.assertRaises(ValueError, cards.check_message, 'x' * (cards.MAX_MESSAGE_LENGTH + 1))
+
+
+class CardTestCase(unittest.TestCase):
+
+    def test_attachments_are_capped(self):
+        """Cards keep at most MAX_ATTACHMENTS attachments"""
+        attachments = [dict(ATTACHMENT, title='Printer {}'.format(number)) for number in range(12)]
+        card = cards.build_card(attachments)
+        self.assertEqual(card['contentType'], cards.CARD_CONTENT_TYPE)
+        self.assertEqual([attachment['title'] for attachment in card['genericAttachments']], ['Printer {}'.format(number) for number in range(10)])
+
+    def test_pool_shares_attachments_and_cards(self):
+        """Equal attachments and cards are fitted once and shared"""
+        pool = cards.AttachmentPool()
+        first = pool.add(dict(ATTACHMENT))
+        self.assertIs(pool.add(dict(ATTACHMENT)), first)
+        self.assertIsNot(pool.add(dict(ATTACHMENT, title='Other')), first)
+        self.assertEqual(len(pool), 2)
+        card = pool.card([dict(ATTACHMENT)])
+        self.assertIs(pool.card([dict(ATTACHMENT)]), card)
+        self.assertIs(card['genericAttachments'][0], first)
+
+    def test_build_response_card(self):
+        """basic.build_response_card builds a fitted card with buttons"""
+        card = basic.build_response_card('Pick a paper size', None, buttons(6))
+        self.assertEqual(card['genericAttachments'], [{'title': 'Pick a paper size', 'buttons': buttons(5)}])
+
+    def test_recommendations_share_cards(self):
+        """Recommendations of the same products share one card across intents"""
+        first = basic.INTENT_PROFILES['QuizContinue']['responses']
+        second = basic.INTENT_PROFILES['QuizContinueA']['responses']
+        shared = [key for key in first if first[key]['responseCard'] == second[key]['responseCard']]
+        self.assertTrue(shared)
+        for key in shared:
+            self.assertIs(first[key]['responseCard'], second[key]['responseCard'])
+
+
+if __name__ == '__main__':
+    unittest.main()
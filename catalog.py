@@ -0,0 +1,318 @@
+"""
+Printer catalog loader.
+
+catalog.json defines every product once and maps each quiz intent's slot
+combinations to the products it recommends. load_catalog() parses and
+validates the file once per container and builds the recommendation index
+used by basic.py. Run this module to precompile the catalog into a pickle
+that load_catalog() prefers over the JSON source:
+
+    python catalog.py [catalog.json]
+"""
+import hashlib
+import itertools
+import json
+import logging
+import os
+import sys
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from cards import AttachmentPool
+
+logger = logging.getLogger()
+
+CATALOG_FORMAT = 1
+# Layout of the compiled pickle, separate from the JSON source's format. Bump it
+# whenever build_catalog() output changes; pickles are also tied to the source of
+# the modules that build them (see builder_fingerprint()).
+COMPILED_FORMAT = 2
+BUILDER_MODULES = ('catalog.py', 'cards.py')
+ATTACHMENT_FIELDS = ('title', 'subTitle', 'attachmentLinkUrl', 'imageUrl')
+DEFAULT_CATALOG_PATH = os.environ.get(
+    'CATALOG_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'catalog.json')
+)
+
+# Protocol 2 is the newest one the Python 2.7 runtime can read.
+PICKLE_PROTOCOL = 2
+
+
+def compiled_catalog_path(path):
+    return os.path.splitext(path)[0] + '.pickle'
+
+
+def decode_combination(code, slot_values):
+    """
+    Decode a combination code such as '1121' into its slot tuple. Each digit is the
+    1-based position of the value in the matching slot_values list.
+    """
+    if len(code) != len(slot_values) or not code.isdigit():
+        raise ValueError('Invalid combination code {!r}'.format(code))
+    key = []
+    for digit, values in zip(code, slot_values):
+        position = int(digit) - 1
+        if not 0 <= position < len(values):
+            raise ValueError('Invalid combination code {!r}'.format(code))
+        key.append(values[position])
+    return tuple(key)
+
+
+def encode_combination(key, slot_values):
+    """
+    Encode a slot tuple into its combination code; the inverse of decode_combination.
+    """
+    return ''.join(str(values.index(value) + 1) for value, values in zip(key, slot_values))
+
+
+def build_attachment(products, ref):
+    """
+    Build a response card attachment from a product id, or from a dict with an 'id'
+    and the attachment fields that override the product's own.
+    """
+    overrides = ref if isinstance(ref, dict) else {'id': ref}
+    product = products.get(overrides['id'])
+    if product is None:
+        raise ValueError('Unknown product {!r}'.format(overrides['id']))
+    unknown = set(overrides) - set(ATTACHMENT_FIELDS) - {'id'}
+    if unknown:
+        raise ValueError('Unknown attachment fields {} for product {!r}'.format(sorted(unknown), overrides['id']))
+    return dict((field, overrides.get(field, product[field])) for field in ATTACHMENT_FIELDS)
+
+
+def build_catalog(data):
+    """
+    Validate parsed catalog data and index every intent's recommendations by slot tuple.
+    """
+    if data.get('format') != CATALOG_FORMAT:
+        raise ValueError('Unsupported catalog format {!r}'.format(data.get('format')))
+
+    products = data['products']
+    for product_id, product in products.items():
+        missing = [field for field in ATTACHMENT_FIELDS if not product.get(field)]
+        if missing:
+            raise ValueError('Product {!r} is missing {}'.format(product_id, missing))
+
+    slot_values = tuple(tuple(values) for values in data['slot_values'])
+    slot_synonyms = tuple(dict(synonyms) for synonyms in data.get('slot_synonyms', [{}] * len(slot_values)))
+    if len(slot_synonyms) != len(slot_values):
+        raise ValueError('slot_synonyms needs one mapping per slot')
+    for values, synonyms in zip(slot_values, slot_synonyms):
+        for synonym, value in synonyms.items():
+            if value not in values:
+                raise ValueError('Synonym {!r} maps to unknown value {!r}'.format(synonym, value))
+    message_prefix = data['message_prefix']
+
+    # Identical attachments are shared, so each one is held in memory (and pickled) once;
+    # the pool also fits them to Lex's card limits.
+    attachments = AttachmentPool()
+    recommendations = {}
+    for intent_name, combinations in data['intents'].items():
+        index = {}
+        for code, combination in combinations.items():
+            key = decode_combination(code, slot_values)
+            if key in index:
+                raise ValueError('Duplicate recommendation for {} in {}'.format(key, intent_name))
+            if not combination['products']:
+                raise ValueError('Combination {} in {} recommends no products'.format(code, intent_name))
+            cards = []
+            for ref in combination['products']:
+                cards.append(attachments.add(build_attachment(products, ref)))
+            index[key] = (message_prefix + combination['message'], tuple(cards))
+        recommendations[intent_name] = index
+
+    combination_codes = dict(
+        (key, encode_combination(key, slot_values)) for key in itertools.product(*slot_values)
+    )
+
+    return {
+        'format': CATALOG_FORMAT,
+        'version': data['version'],
+        'slot_values': slot_values,
+        'slot_synonyms': slot_synonyms,
+        'combination_codes': combination_codes,
+        'recommendations': recommendations,
+    }
+
+
+def build_candidate_index(recommendations, slot_values):
+    """
+    Index every partially answered slot tuple, with None for unanswered slots, to the
+    recommendations still possible: a tuple of full slot tuples in combination code
+    order. Combinations that recommend the same message and products are represented
+    by the first of them only, so a single candidate means the answer is settled.
+    """
+    def code_order(key):
+        return encode_combination(key, slot_values)
+
+    # Attachments are interned by build_catalog, so identical cards are the same object.
+    representatives = {}
+    for key in sorted(recommendations, key=code_order):
+        message, cards = recommendations[key]
+        representatives.setdefault((message, tuple(map(id, cards))), key)
+
+    index = {}
+    for key, (message, cards) in recommendations.items():
+        candidate = representatives[(message, tuple(map(id, cards)))]
+        for answered in itertools.product((False, True), repeat=len(key)):
+            partial_key = tuple(value if known else None for value, known in zip(key, answered))
+            index.setdefault(partial_key, set()).add(candidate)
+    return dict((key, tuple(sorted(candidates, key=code_order))) for key, candidates in index.items())
+
+
+def build_question_plan(candidate_index, slot_values):
+    """
+    Compile the quiz into a decision tree over candidate_index (see
+    build_candidate_index). Returns ({partial slot tuple: position of the slot to ask
+    next}, expected number of questions from the start). Every state with more than
+    one candidate left asks the slot that minimizes the expected number of remaining
+    questions, counting every combination as equally likely; ties go to the earlier
+    slot. Slots whose answer cannot change the candidates are never asked.
+    """
+    plan = {}
+    expected_questions = {}
+
+    def questions(key):
+        if key in expected_questions:
+            return expected_questions[key]
+        candidates = candidate_index.get(key, ())
+        best = None
+        if len(candidates) > 1:
+            for position, value in enumerate(key):
+                if value is not None:
+                    continue
+                answers = [key[:position] + (answer,) + key[position + 1:] for answer in slot_values[position]]
+                if all(candidate_index.get(answer, ()) == candidates for answer in answers):
+                    continue
+                expected = 1 + sum(questions(answer) for answer in answers) / float(len(answers))
+                if best is None or expected < best[0]:
+                    best = (expected, position)
+        if best is None:
+            expected_questions[key] = 0
+        else:
+            expected_questions[key], plan[key] = best
+        return expected_questions[key]
+
+    start = questions((None,) * len(slot_values))
+    return plan, start
+
+
+def build_slot_weights(recommendations, slot_values):
+    """
+    Weigh each slot by how often changing only its answer changes the recommendation:
+    the share of pairs of combinations differing in that slot alone that recommend
+    differently.
+    """
+    weights = []
+    for position, values in enumerate(slot_values):
+        pairs = changed = 0
+        for key, recommendation in recommendations.items():
+            for value in values:
+                if value == key[position]:
+                    continue
+                other = recommendations.get(key[:position] + (value,) + key[position + 1:])
+                if other is not None:
+                    pairs += 1
+                    changed += other != recommendation
+        weights.append(changed / float(pairs) if pairs else 1.0)
+    return tuple(weights)
+
+
+def build_fallback_index(recommendations, slot_values):
+    """
+    Map every slot combination the catalog has no recommendation for to the nearest
+    one it has: the fewest differing slots, weighted by build_slot_weights, with ties
+    going to the lowest combination code.
+    """
+    weights = build_slot_weights(recommendations, slot_values)
+    known = sorted(recommendations, key=lambda key: encode_combination(key, slot_values))
+    fallbacks = {}
+    if not known:
+        return fallbacks
+    for key in itertools.product(*slot_values):
+        if key not in recommendations:
+            fallbacks[key] = min(known, key=lambda candidate: sum(
+                weight for weight, value, other in zip(weights, key, candidate) if value != other
+            ))
+    return fallbacks
+
+
+def builder_fingerprint():
+    """
+    Hash of the source of the modules that build the catalog, so a pickle compiled by
+    other code is not trusted, or None when the source cannot be read.
+    """
+    digest = hashlib.sha1()
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        for name in BUILDER_MODULES:
+            with open(os.path.join(here, name), 'rb') as f:
+                digest.update(f.read())
+    except (IOError, OSError):
+        logger.warning('Cannot read the catalog builder source', exc_info=True)
+        return None
+    return digest.hexdigest()
+
+
+def read_catalog(path):
+    with open(path) as f:
+        return build_catalog(json.load(f))
+
+
+def load_compiled_catalog(path):
+    """
+    Return the precompiled catalog for path, or None when it is missing, older than
+    the JSON source, unreadable or compiled by other code.
+    """
+    compiled_path = compiled_catalog_path(path)
+    if not os.path.exists(compiled_path):
+        return None
+    if os.path.getmtime(compiled_path) < os.path.getmtime(path):
+        logger.warning('Ignoring stale compiled catalog %s', compiled_path)
+        return None
+    try:
+        with open(compiled_path, 'rb') as f:
+            compiled = pickle.load(f)
+    except Exception:
+        logger.warning('Ignoring unreadable compiled catalog %s', compiled_path, exc_info=True)
+        return None
+    if not isinstance(compiled, dict) or compiled.get('compiled_format') != COMPILED_FORMAT:
+        logger.warning('Ignoring compiled catalog %s in an older layout', compiled_path)
+        return None
+    builder = builder_fingerprint()
+    if builder is None or compiled.get('builder') != builder:
+        logger.warning('Ignoring compiled catalog %s built by other code', compiled_path)
+        return None
+    return compiled['catalog']
+
+
+def load_catalog(path=DEFAULT_CATALOG_PATH):
+    """
+    Load the catalog at path, preferring its precompiled pickle.
+    """
+    catalog = load_compiled_catalog(path)
+    if catalog is None:
+        catalog = read_catalog(path)
+    return catalog
+
+
+def compile_catalog(path=DEFAULT_CATALOG_PATH):
+    """
+    Validate the catalog at path and write its precompiled pickle next to it.
+    """
+    catalog = read_catalog(path)
+    compiled_path = compiled_catalog_path(path)
+    with open(compiled_path, 'wb') as f:
+        pickle.dump({
+            'compiled_format': COMPILED_FORMAT,
+            'builder': builder_fingerprint(),
+            'catalog': catalog,
+        }, f, PICKLE_PROTOCOL)
+    return compiled_path
+
+
+if __name__ == '__main__':
+    print(compile_catalog(*sys.argv[1:]))
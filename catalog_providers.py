@@ -0,0 +1,282 @@
+"""
+Catalog providers: where basic.py gets its catalog from.
+
+A provider's load() returns a built catalog (see catalog.build_catalog).
+FileCatalogProvider reads catalog.json or its compiled pickle,
+InMemoryCatalogProvider builds parsed catalog data, and KeyValueCatalogProvider
+reads a catalog kept as items in a key-value store such as a DynamoDB table, so
+products can change without a deploy. CatalogRefresher sits in front of any of
+them and reloads the catalog in the background once it is older than a maximum
+age, without holding up the requests that find it stale.
+
+Key-value items are JSON-compatible dicts. CATALOG_ITEM holds everything but the
+products, plus the list of 'product_ids'; each product is its own item under
+PRODUCT_PREFIX + id. export_catalog() writes catalog.json data in that layout:
+
+    python catalog_providers.py TABLE [catalog.json]
+"""
+import json
+import logging
+import random
+import sys
+import threading
+import time
+
+from catalog import DEFAULT_CATALOG_PATH, build_catalog, load_catalog
+
+logger = logging.getLogger()
+
+CATALOG_ITEM = 'catalog'
+PRODUCT_PREFIX = 'product#'
+
+# DynamoDB's BatchGetItem limit.
+BATCH_SIZE = 100
+
+# Unprocessed keys (throttling) are retried with exponential backoff and full
+# jitter, at most BATCH_ATTEMPTS calls per batch.
+BATCH_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 0.05
+BACKOFF_MAX_SECONDS = 2.0
+
+
+class FileCatalogProvider(object):
+
+    def __init__(self, path=DEFAULT_CATALOG_PATH):
+        self.path = path
+
+    def load(self):
+        return load_catalog(self.path)
+
+
+class InMemoryCatalogProvider(object):
+
+    def __init__(self, data):
+        self.data = data
+
+    def load(self):
+        return build_catalog(self.data)
+
+
+class InMemoryKeyValueStore(object):
+    """
+    Local stand-in for a key-value store, counting calls the way a remote store bills them.
+    """
+
+    def __init__(self, items=None):
+        self.items = dict(items or {})
+        self.get_calls = 0
+        self.batch_calls = 0
+
+    def put_item(self, key, item):
+        self.items[key] = item
+
+    def get_item(self, key):
+        self.get_calls += 1
+        return self.items.get(key)
+
+    def batch_get_items(self, keys):
+        """
+        Return {key: item} for the keys that exist, in one call.
+        """
+        self.batch_calls += 1
+        return dict((key, self.items[key]) for key in keys if key in self.items)
+
+
+class DynamoDBKeyValueStore(object):
+    """
+    Key-value store on a DynamoDB table with a string partition key 'id'. Items are
+    stored as JSON in a 'data' attribute, so numbers come back as plain numbers.
+    Reads are strongly consistent, so a catalog read right after export_catalog()
+    never comes with stale products.
+    """
+
+    def __init__(self, table_name, client=None, sleep=time.sleep):
+        if client is None:
+            import boto3
+            client = boto3.client('dynamodb')
+        self.table_name = table_name
+        self.client = client
+        self.sleep = sleep
+
+    def put_item(self, key, item):
+        self.client.put_item(TableName=self.table_name, Item={'id': {'S': key}, 'data': {'S': json.dumps(item)}})
+
+    def get_item(self, key):
+        response = self.client.get_item(TableName=self.table_name, Key={'id': {'S': key}}, ConsistentRead=True)
+        if 'Item' not in response:
+            return None
+        return json.loads(response['Item']['data']['S'])
+
+    def batch_get_items(self, keys):
+        items = {}
+        keys = list(keys)
+        for start in range(0, len(keys), BATCH_SIZE):
+            request = {self.table_name: {
+                'Keys': [{'id': {'S': key}} for key in keys[start:start + BATCH_SIZE]],
+                'ConsistentRead': True,
+            }}
+            for attempt in range(BATCH_ATTEMPTS):
+                if attempt:
+                    self.sleep(random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)))
+                response = self.client.batch_get_item(RequestItems=request)
+                for record in response['Responses'].get(self.table_name, []):
+                    items[record['id']['S']] = json.loads(record['data']['S'])
+                request = response.get('UnprocessedKeys')
+                if not request:
+                    break
+            else:
+                raise RuntimeError('{} keys still unprocessed after {} attempts'.format(
+                    len(request[self.table_name]['Keys']), BATCH_ATTEMPTS))
+        return items
+
+
+def export_catalog(data, store):
+    """
+    Write parsed catalog.json data to store as one catalog item and one item per product.
+    """
+    item = dict((key, value) for key, value in data.items() if key != 'products')
+    item['product_ids'] = sorted(data['products'])
+    for product_id, product in data['products'].items():
+        store.put_item(PRODUCT_PREFIX + product_id, product)
+    store.put_item(CATALOG_ITEM, item)
+
+
+class KeyValueCatalogProvider(object):
+    """
+    Loads the catalog from a key-value store. The catalog item and the products it
+    listed last time are fetched in one batch; only products added since then need a
+    second one.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.product_ids = ()
+
+    def load(self):
+        items = self.store.batch_get_items([CATALOG_ITEM] + [PRODUCT_PREFIX + product_id for product_id in self.product_ids])
+        item = items.get(CATALOG_ITEM)
+        if item is None:
+            raise ValueError('Key-value store has no {!r} item'.format(CATALOG_ITEM))
+        missing = [PRODUCT_PREFIX + product_id for product_id in item['product_ids'] if PRODUCT_PREFIX + product_id not in items]
+        if missing:
+            items.update(self.store.batch_get_items(missing))
+
+        data = dict((key, value) for key, value in item.items() if key != 'product_ids')
+        data['products'] = {}
+        for product_id in item['product_ids']:
+            product = items.get(PRODUCT_PREFIX + product_id)
+            if product is None:
+                raise ValueError('Key-value store has no item for product {!r}'.format(product_id))
+            data['products'][product_id] = product
+        catalog = build_catalog(data)
+        self.product_ids = tuple(item['product_ids'])
+        return catalog
+
+
+def catalog_provider(source):
+    """
+    Return the provider for a CATALOG_SOURCE setting: 'file', 'file:PATH' or 'dynamodb:TABLE'.
+    """
+    kind, _, location = source.partition(':')
+    if kind == 'file':
+        return FileCatalogProvider(location or DEFAULT_CATALOG_PATH)
+    if kind == 'dynamodb' and location:
+        return KeyValueCatalogProvider(DynamoDBKeyValueStore(location))
+    raise ValueError('Unsupported catalog source {!r}'.format(source))
+
+
+class CatalogRefresher(object):
+    """
+    Keeps the provider's catalog, and whatever prepare() derives from it, with
+    stale-while-revalidate semantics. get() never waits on the provider after the
+    first load: once the catalog is max_age seconds old (0 keeps it forever), it
+    starts a reload on a background thread and keeps returning the current state
+    until the reload is done. New versions are published by compare-and-swap on the
+    version stamp, so a reload that started from an older version never replaces a
+    newer one. A reload that fails, or finds the same version, keeps the current
+    state. With background=False, reloads run inside get() instead.
+
+    In Lambda, background threads only run while the container is handling an
+    invocation, so a reload started by one request can finish during later ones.
+    """
+
+    def __init__(self, provider, max_age=0, prepare=None, clock=time.time, background=True):
+        self.provider = provider
+        self.max_age = max_age
+        self.prepare = prepare if prepare is not None else (lambda catalog: catalog)
+        self.clock = clock
+        self.background = background
+        self.lock = threading.Lock()
+        self.refreshing = False
+        self.version = None
+        self.state = None
+        self.checked_at = None
+
+    def get(self):
+        if self.state is None:
+            self.refresh()
+        elif self.max_age and self.clock() - self.checked_at >= self.max_age:
+            if self.background:
+                self.refresh_in_background()
+            else:
+                self.refresh()
+        return self.state
+
+    def refresh_in_background(self):
+        """
+        Start a reload on a daemon thread unless one is already running. Returns the
+        thread, or None.
+        """
+        with self.lock:
+            if self.refreshing:
+                return None
+            self.refreshing = True
+        thread = threading.Thread(target=self.refresh)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def refresh(self):
+        """
+        Reload the catalog. Returns True if a new version was published.
+        """
+        expected_version = self.version
+        try:
+            catalog = self.provider.load()
+            if catalog['version'] == expected_version:
+                self.checked(expected_version)
+                return False
+            state = self.prepare(catalog)
+        except Exception:
+            if self.state is None:
+                raise
+            logger.warning('Catalog reload failed, keeping version %s', self.version, exc_info=True)
+            self.checked(expected_version)
+            return False
+        finally:
+            self.refreshing = False
+        return self.compare_and_swap(expected_version, catalog['version'], state)
+
+    def checked(self, version):
+        with self.lock:
+            if self.version == version:
+                self.checked_at = self.clock()
+
+    def compare_and_swap(self, expected_version, version, state):
+        """
+        Publish state as version only if the current version is still expected_version.
+        """
+        with self.lock:
+            if self.version != expected_version:
+                return False
+            if expected_version is not None:
+                logger.info('Catalog version %s replaces %s', version, expected_version)
+            self.state = state
+            self.version = version
+            self.checked_at = self.clock()
+            return True
+
+
+if __name__ == '__main__':
+    with open(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CATALOG_PATH) as f:
+        export_catalog(json.load(f), DynamoDBKeyValueStore(sys.argv[1]))
@@ -0,0 +1,242 @@
+import json
+import threading
+import unittest
+
+import basic
+import catalog
+import catalog_providers
+from bench_handler import INTENT_SLOTS, build_event
+
+
+def read_catalog_data():
+    with open(catalog.DEFAULT_CATALOG_PATH) as f:
+        return json.load(f)
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeDynamoDBClient(object):
+    """
+    Just enough of the DynamoDB client API; batch_get_item leaves one key unprocessed per call.
+    """
+
+    def __init__(self):
+        self.items = {}
+        self.batch_calls = 0
+        self.consistent_reads = []
+
+    def put_item(self, TableName, Item):
+        self.items[Item['id']['S']] = Item
+
+    def get_item(self, TableName, Key, ConsistentRead=False):
+        self.consistent_reads.append(ConsistentRead)
+        item = self.items.get(Key['id']['S'])
+        return {'Item': item} if item else {}
+
+    def batch_get_item(self, RequestItems):
+        self.batch_calls += 1
+        self.consistent_reads.append(RequestItems['bots'].get('ConsistentRead', False))
+        keys = RequestItems['bots']['Keys']
+        found = [self.items[key['id']['S']] for key in keys[:-1] if key['id']['S'] in self.items]
+        response = {'Responses': {'bots': found}}
+        if len(keys) > 1:
+            response['UnprocessedKeys'] = {'bots': {'Keys': keys[-1:], 'ConsistentRead': True}}
+        elif keys[0]['id']['S'] in self.items:
+            found.append(self.items[keys[0]['id']['S']])
+        return response
+
+
+class ThrottledDynamoDBClient(FakeDynamoDBClient):
+    """
+    Never processes any key.
+    """
+
+    def batch_get_item(self, RequestItems):
+        self.batch_calls += 1
+        return {'Responses': {}, 'UnprocessedKeys': RequestItems}
+
+
+class FailingProvider(object):
+
+    def load(self):
+        raise IOError('store unavailable')
+
+
+class KeyValueCatalogProviderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = read_catalog_data()
+        self.store = catalog_providers.InMemoryKeyValueStore()
+        catalog_providers.export_catalog(self.data, self.store)
+
+    def test_matches_file_catalog(self):
+        """The store holds the same catalog as catalog.json"""
+        loaded = catalog_providers.KeyValueCatalogProvider(self.store).load()
+        expected = catalog_providers.FileCatalogProvider().load()
+        self.assertEqual(loaded['version'], expected['version'])
+        self.assertEqual(loaded['recommendations'], expected['recommendations'])
+
+    def test_reloads_in_one_batch(self):
+        """After the first load, the catalog and its products come in one batch call"""
+        provider = catalog_providers.KeyValueCatalogProvider(self.store)
+        provider.load()
+        self.assertEqual(self.store.batch_calls, 2)
+        provider.load()
+        self.assertEqual(self.store.batch_calls, 3)
+        self.assertEqual(self.store.get_calls, 0)
+
+    def test_missing_product(self):
+        """A catalog listing a product the store lacks fails to load"""
+        del self.store.items[catalog_providers.PRODUCT_PREFIX + 'brother_hl_l2350dw']
+        provider = catalog_providers.KeyValueCatalogProvider(self.store)
+        self.assertRaises(ValueError, provider.load)
+
+    def test_dynamodb_store(self):
+        """The DynamoDB store round-trips items and retries unprocessed keys"""
+        client = FakeDynamoDBClient()
+        sleeps = []
+        store = catalog_providers.DynamoDBKeyValueStore('bots', client, sleeps.append)
+        store.put_item('a', {'price': 129.99})
+        store.put_item('b', {'price': 5})
+        self.assertEqual(store.get_item('a'), {'price': 129.99})
+        self.assertIsNone(store.get_item('c'))
+        self.assertEqual(store.batch_get_items(['a', 'b', 'c']), {'a': {'price': 129.99}, 'b': {'price': 5}})
+        self.assertEqual(len(sleeps), 1)
+        self.assertTrue(all(client.consistent_reads))
+
+    def test_dynamodb_backoff(self):
+        """Throttled batches back off with jitter and give up after BATCH_ATTEMPTS calls"""
+        client = ThrottledDynamoDBClient()
+        sleeps = []
+        store = catalog_providers.DynamoDBKeyValueStore('bots', client, sleeps.append)
+        self.assertRaises(RuntimeError, store.batch_get_items, ['a'])
+        self.assertEqual(client.batch_calls, catalog_providers.BATCH_ATTEMPTS)
+        self.assertEqual(len(sleeps), catalog_providers.BATCH_ATTEMPTS - 1)
+        for attempt, seconds in enumerate(sleeps, 1):
+            cap = min(catalog_providers.BACKOFF_MAX_SECONDS, catalog_providers.BACKOFF_BASE_SECONDS * 2 ** attempt)
+            self.assertTrue(0 <= seconds <= cap)
+
+    def test_catalog_provider(self):
+        """CATALOG_SOURCE settings map to providers"""
+        provider = catalog_providers.catalog_provider('file:/tmp/catalog.json')
+        self.assertEqual(provider.path, '/tmp/catalog.json')
+        self.assertEqual(catalog_providers.catalog_provider('file').path, catalog.DEFAULT_CATALOG_PATH)
+        self.assertRaises(ValueError, catalog_providers.catalog_provider, 'redis:catalog')
+
+
+class BlockingProvider(object):
+    """
+    Loads from provider once release is set, so a test can look at a reload in flight.
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.release = threading.Event()
+
+    def load(self):
+        self.release.wait(5)
+        return self.provider.load()
+
+
+class CatalogRefresherTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = read_catalog_data()
+        self.clock = FakeClock()
+        self.provider = catalog_providers.InMemoryCatalogProvider(self.data)
+        self.prepared = []
+
+    def prepare(self, catalog):
+        self.prepared.append(catalog['version'])
+        return ('prepared', catalog)
+
+    def refresher(self, provider=None, background=False):
+        return catalog_providers.CatalogRefresher(
+            provider or self.provider, max_age=60, prepare=self.prepare, clock=self.clock, background=background)
+
+    def test_reloads_after_max_age(self):
+        """The catalog is kept until max_age and replaced when its version changes"""
+        refresher = self.refresher()
+        first = refresher.get()
+        self.data['version'] += 1
+        self.clock.now = 59
+        self.assertIs(refresher.get(), first)
+        self.clock.now = 60
+        self.assertEqual(refresher.get()[1]['version'], self.data['version'])
+        self.assertEqual(refresher.version, self.data['version'])
+
+    def test_same_version_keeps_state(self):
+        """A reload that finds the same version keeps the current state, unprepared"""
+        refresher = self.refresher()
+        first = refresher.get()
+        self.clock.now = 120
+        self.assertIs(refresher.get(), first)
+        self.assertEqual(len(self.prepared), 1)
+
+    def test_failed_reload_keeps_state(self):
+        """A failing provider does not take the catalog away"""
+        refresher = self.refresher()
+        first = refresher.get()
+        refresher.provider = FailingProvider()
+        self.clock.now = 120
+        self.assertIs(refresher.get(), first)
+
+    def test_stale_while_revalidate(self):
+        """Requests get the current state while a background reload is in flight"""
+        blocking = BlockingProvider(self.provider)
+        blocking.release.set()
+        refresher = self.refresher(blocking, background=True)
+        first = refresher.get()
+        blocking.release.clear()
+        self.data['version'] += 1
+        self.clock.now = 60
+        thread = refresher.refresh_in_background()
+        self.assertIsNotNone(thread)
+        self.assertIsNone(refresher.refresh_in_background())
+        self.assertIs(refresher.get(), first)
+        blocking.release.set()
+        thread.join(5)
+        self.assertEqual(refresher.get()[1]['version'], self.data['version'])
+
+    def test_compare_and_swap(self):
+        """A reload that started from an older version cannot replace a newer one"""
+        refresher = self.refresher()
+        refresher.get()
+        current = refresher.version
+        self.assertTrue(refresher.compare_and_swap(current, current + 2, 'newer'))
+        self.assertFalse(refresher.compare_and_swap(current, current + 1, 'older'))
+        self.assertEqual((refresher.version, refresher.state), (current + 2, 'newer'))
+
+
+class RefreshCatalogTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog_refresher = basic.catalog_refresher
+
+    def tearDown(self):
+        basic.catalog_refresher = self.catalog_refresher
+        basic.refresh_catalog()
+
+    def test_new_catalog_is_installed(self):
+        """Requests are answered from a new catalog version"""
+        data = read_catalog_data()
+        data['version'] += 1
+        data['message_prefix'] = 'Try these: '
+        provider = catalog_providers.InMemoryCatalogProvider(data)
+        basic.catalog_refresher = catalog_providers.CatalogRefresher(provider, prepare=basic.prepare_catalog)
+        slots = dict(zip(INTENT_SLOTS['QuizContinue'], ('color', 'WiFi Wireless', 'Letter Legal', 'Print Only')))
+        event = build_event('QuizContinue', slots)
+        res = basic.lambda_handler(event, None)
+        self.assertTrue(res['dialogAction']['message']['content'].startswith('Try these: '))
+        self.assertEqual(basic.CATALOG['version'], data['version'])
+
+
+if __name__ == '__main__':
+    unittest.main()
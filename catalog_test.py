@@ -0,0 +1,199 @@
+import copy
+import json
+import os
+import shutil
+import tempfile
+import timeit
+import unittest
+
+import catalog
+
+
+def read_catalog_data():
+    with open(catalog.DEFAULT_CATALOG_PATH) as f:
+        return json.load(f)
+
+
+class CatalogTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = read_catalog_data()
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'catalog.json')
+        shutil.copy(catalog.DEFAULT_CATALOG_PATH, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_products_are_defined_once(self):
+        """Every product reference resolves and every product is referenced"""
+        referenced = set()
+        for combinations in self.data['intents'].values():
+            for combination in combinations.values():
+                for ref in combination['products']:
+                    referenced.add(ref['id'] if isinstance(ref, dict) else ref)
+        self.assertEqual(referenced, set(self.data['products']))
+
+    def test_decode_combination(self):
+        """Combination codes decode to slot tuples"""
+        slot_values = self.data['slot_values']
+        self.assertEqual(
+            catalog.decode_combination('2132', slot_values),
+            ('color', 'Ethernet Wired', '24"-44" Wide Format', 'Print Copy Scan')
+        )
+        for code in ('', '113', '11111', '3111', '1101', 'a111'):
+            self.assertRaises(ValueError, catalog.decode_combination, code, slot_values)
+
+    def test_rejects_unknown_product(self):
+        """Unknown product references fail validation"""
+        data = copy.deepcopy(self.data)
+        data['intents']['QuizContinue']['1111']['products'] = ['no_such_printer']
+        self.assertRaises(ValueError, catalog.build_catalog, data)
+
+    def test_rejects_unsupported_format(self):
+        """Catalogs in another format fail validation"""
+        data = copy.deepcopy(self.data)
+        data['format'] = catalog.CATALOG_FORMAT + 1
+        self.assertRaises(ValueError, catalog.build_catalog, data)
+
+    def test_rejects_incomplete_product(self):
+        """Products without every attachment field fail validation"""
+        data = copy.deepcopy(self.data)
+        del data['products']['brother_hl_l2350dw']['imageUrl']
+        self.assertRaises(ValueError, catalog.build_catalog, data)
+
+    def test_rejects_oversized_attachment(self):
+        """Attachments Lex would reject fail validation; long titles are shortened"""
+        data = copy.deepcopy(self.data)
+        data['products']['brother_hl_l2350dw']['imageUrl'] = 'https://example.com/' + 'x' * 250
+        self.assertRaises(ValueError, catalog.build_catalog, data)
+
+        data = copy.deepcopy(self.data)
+        data['products']['brother_hl_l2350dw']['title'] = 'Brother HL-L2350DW ' * 5
+        built = catalog.build_catalog(data)
+        titles = [card['title'] for index in built['recommendations'].values() for message, cards in index.values() for card in cards]
+        self.assertTrue(all(len(title) <= 80 for title in titles))
+
+    def test_candidate_index(self):
+        """Partial answers index the distinct recommendations still possible"""
+        built = catalog.build_catalog(self.data)
+        recommendations = built['recommendations']['QuizContinue']
+        index = catalog.build_candidate_index(recommendations, built['slot_values'])
+        self.assertEqual(len(index), 3 * 3 * 4 * 4)
+        distinct = set((message, tuple(map(id, cards))) for message, cards in recommendations.values())
+        self.assertEqual(len(index[(None, None, None, None)]), len(distinct))
+        for key in recommendations:
+            self.assertEqual(len(index[key]), 1)
+            self.assertEqual(recommendations[index[key][0]], recommendations[key])
+        # The connection does not matter for this answer, so the quiz is settled.
+        settled = index[('black and white', 'WiFi Wireless', 'Letter Legal 11x17', None)]
+        self.assertEqual(len(settled), 1)
+        self.assertEqual(recommendations[settled[0]], recommendations[('black and white', 'WiFi Wireless', 'Letter Legal 11x17', 'Print Only')])
+
+    def test_question_plan(self):
+        """The question plan settles every combination in fewer questions than asking all four"""
+        built = catalog.build_catalog(self.data)
+        for intent_name, recommendations in built['recommendations'].items():
+            index = catalog.build_candidate_index(recommendations, built['slot_values'])
+            plan, expected = catalog.build_question_plan(index, built['slot_values'])
+            self.assertLess(expected, 4)
+            total = 0
+            for key in recommendations:
+                partial_key = (None,) * len(key)
+                while partial_key in plan:
+                    position = plan[partial_key]
+                    self.assertIsNone(partial_key[position])
+                    answered = partial_key[:position] + (key[position],) + partial_key[position + 1:]
+                    # Every question asked narrows the candidates for some answer.
+                    self.assertTrue(any(
+                        index[partial_key[:position] + (value,) + partial_key[position + 1:]] != index[partial_key]
+                        for value in built['slot_values'][position]
+                    ))
+                    partial_key = answered
+                    total += 1
+                self.assertEqual(len(index[partial_key]), 1, (intent_name, key))
+            self.assertAlmostEqual(total / float(len(recommendations)), expected)
+
+    def test_fallback_index(self):
+        """Combinations missing from the catalog fall back to the nearest one"""
+        data = copy.deepcopy(self.data)
+        # The connection rarely changes the recommendation, the color always does.
+        del data['intents']['QuizContinue']['1111']
+        built = catalog.build_catalog(data)
+        recommendations = built['recommendations']['QuizContinue']
+        weights = catalog.build_slot_weights(recommendations, built['slot_values'])
+        self.assertEqual(max(weights), weights[0])
+        self.assertEqual(min(weights), weights[1])
+        fallbacks = catalog.build_fallback_index(recommendations, built['slot_values'])
+        missing = catalog.decode_combination('1111', built['slot_values'])
+        self.assertEqual(fallbacks, {missing: catalog.decode_combination('1211', built['slot_values'])})
+        self.assertEqual(catalog.build_fallback_index(catalog.build_catalog(self.data)['recommendations']['QuizContinue'], built['slot_values']), {})
+
+    def test_overrides_apply_to_one_combination(self):
+        """An attachment override does not change the shared product"""
+        index = catalog.build_catalog(self.data)['recommendations']['QuizContinue']
+        overridden = index[('black and white', 'Ethernet Wired', 'Letter Legal 11x17', 'Print Only')][1][1]
+        plain = index[('black and white', 'WiFi Wireless', 'Letter Legal 11x17', 'Print Copy Scan Fax')][1][1]
+        self.assertEqual(overridden['title'], plain['title'])
+        self.assertNotEqual(overridden['subTitle'], plain['subTitle'])
+
+    def test_compiled_catalog_matches_source(self):
+        """The precompiled catalog is preferred and equals the JSON source"""
+        self.assertIsNone(catalog.load_compiled_catalog(self.path))
+        compiled_path = catalog.compile_catalog(self.path)
+        self.assertTrue(os.path.exists(compiled_path))
+        self.assertEqual(catalog.load_compiled_catalog(self.path), catalog.read_catalog(self.path))
+        self.assertEqual(catalog.load_catalog(self.path), catalog.read_catalog(self.path))
+
+    def test_stale_compiled_catalog_is_ignored(self):
+        """A pickle older than its JSON source is not used"""
+        compiled_path = catalog.compile_catalog(self.path)
+        mtime = os.path.getmtime(self.path)
+        os.utime(compiled_path, (mtime - 10, mtime - 10))
+        self.assertIsNone(catalog.load_compiled_catalog(self.path))
+        self.assertEqual(catalog.load_catalog(self.path), catalog.read_catalog(self.path))
+
+    def test_corrupt_compiled_catalog_is_ignored(self):
+        """An unreadable pickle falls back to the JSON source"""
+        compiled_path = catalog.compile_catalog(self.path)
+        with open(compiled_path, 'wb') as f:
+            f.write(b'not a pickle')
+        self.assertIsNone(catalog.load_compiled_catalog(self.path))
+
+    def test_compiled_catalog_from_other_code_is_ignored(self):
+        """Pickles in an older layout or built by other code are not used"""
+        compiled_path = catalog.compile_catalog(self.path)
+        with open(compiled_path, 'wb') as f:
+            # A catalog.pickle from before the compiled layout had its own version.
+            catalog.pickle.dump(catalog.read_catalog(self.path), f, catalog.PICKLE_PROTOCOL)
+        self.assertIsNone(catalog.load_compiled_catalog(self.path))
+
+        with open(compiled_path, 'wb') as f:
+            catalog.pickle.dump({
+                'compiled_format': catalog.COMPILED_FORMAT,
+                'builder': 'older catalog.py',
+                'catalog': catalog.read_catalog(self.path),
+            }, f, catalog.PICKLE_PROTOCOL)
+        self.assertIsNone(catalog.load_compiled_catalog(self.path))
+        self.assertEqual(catalog.load_catalog(self.path), catalog.read_catalog(self.path))
+
+    def test_compiled_catalog_without_builder_source(self):
+        """Without readable builder source the pickle is skipped, not fatal"""
+        catalog.compile_catalog(self.path)
+        modules = catalog.BUILDER_MODULES
+        catalog.BUILDER_MODULES = ('no_such_module.py',)
+        try:
+            self.assertIsNone(catalog.load_compiled_catalog(self.path))
+            self.assertEqual(catalog.load_catalog(self.path), catalog.read_catalog(self.path))
+        finally:
+            catalog.BUILDER_MODULES = modules
+
+    def test_compiled_catalog_load_budget(self):
+        """Loading the precompiled catalog stays within its cold-start budget"""
+        catalog.compile_catalog(self.path)
+        best = min(timeit.repeat(lambda: catalog.load_compiled_catalog(self.path), number=1, repeat=20))
+        self.assertLess(best, 0.001)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Cold-start accounting for the Lambda handler module.
+
+basic.py records how long each stage of its initialization takes and logs the
+breakdown once per container. Set COLD_START_BUDGET_MS to get a warning when a
+cold start runs over budget. On Python 3.7+ runtimes, set
+PYTHONPROFILEIMPORTTIME=1 on the function for a per-module import breakdown:
+Python then writes the same report as `python -X importtime` to stderr, which
+Lambda captures into the logs. Python 2.7 ignores that variable; there, the
+imports worth watching are timed as stages of their own (catalog_import).
+"""
+import contextlib
+import logging
+import os
+import re
+
+from instrumentation import timer
+
+logger = logging.getLogger()
+
+COLD_START_BUDGET_MS = float(os.environ.get('COLD_START_BUDGET_MS', '0'))
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)\s*$')
+
+
+class StartupTimeline(object):
+    """
+    Time spent in each named stage of module initialization.
+    """
+
+    def __init__(self):
+        self.started = timer()
+        self.stages = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        started = timer()
+        try:
+            yield
+        finally:
+            self.stages.append((name, timer() - started))
+
+    def elapsed(self):
+        return timer() - self.started
+
+    def report(self, budget_ms=COLD_START_BUDGET_MS):
+        """
+        Log the cold start breakdown, warning when it exceeds budget_ms. Returns the
+        elapsed time in milliseconds.
+        """
+        elapsed_ms = self.elapsed() * 1000
+        breakdown = ' '.join('{}={:.2f}ms'.format(name, seconds * 1000) for name, seconds in self.stages)
+        logger.info('cold start %.2fms: %s', elapsed_ms, breakdown)
+        if budget_ms and elapsed_ms > budget_ms:
+            logger.warning('cold start %.2fms exceeded the %.2fms budget', elapsed_ms, budget_ms)
+        return elapsed_ms
+
+
+def parse_importtime(output):
+    """
+    Parse `python -X importtime` output into {module: (self_us, cumulative_us)}.
+    """
+    modules = {}
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(3)] = (int(match.group(1)), int(match.group(2)))
+    return modules
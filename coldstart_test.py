@@ -0,0 +1,90 @@
+import logging
+import os
+import subprocess
+import sys
+import unittest
+
+import coldstart
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Generous enough for a loaded CI box; a normal cold import of basic takes ~30ms.
+COLD_START_BUDGET_US = 250000
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@unittest.skipIf(sys.version_info < (3, 7), '-X importtime needs Python 3.7+')
+class ImportTimeTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        output = subprocess.check_output(
+            [sys.executable, '-X', 'importtime', '-c', 'import basic'],
+            cwd=HERE,
+            stderr=subprocess.STDOUT
+        ).decode('utf-8')
+        cls.modules = coldstart.parse_importtime(output)
+
+    def test_optional_dependencies_are_deferred(self):
+        """Importing the handler does not import dateutil or datetime"""
+        self.assertIn('basic', self.modules)
+        for name in ('dateutil', 'dateutil.parser', 'dateutil.tz', 'datetime'):
+            self.assertNotIn(name, self.modules)
+
+    def test_cold_start_budget(self):
+        """Importing the handler stays within the cold start budget"""
+        self_us, cumulative_us = self.modules['basic']
+        self.assertLess(cumulative_us, COLD_START_BUDGET_US)
+
+
+class StartupTimelineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = ListHandler()
+        logging.getLogger().addHandler(self.handler)
+        self.level = logging.getLogger().level
+        logging.getLogger().setLevel(logging.INFO)
+
+    def tearDown(self):
+        logging.getLogger().removeHandler(self.handler)
+        logging.getLogger().setLevel(self.level)
+
+    def test_report_logs_every_stage(self):
+        """The report names each stage"""
+        timeline = coldstart.StartupTimeline()
+        with timeline.stage('first'):
+            pass
+        with timeline.stage('second'):
+            pass
+        timeline.report(budget_ms=0)
+        self.assertEqual([name for name, seconds in timeline.stages], ['first', 'second'])
+        self.assertEqual(len(self.handler.records), 1)
+        message = self.handler.records[0].getMessage()
+        self.assertIn('first=', message)
+        self.assertIn('second=', message)
+
+    def test_report_warns_over_budget(self):
+        """A cold start over budget logs a warning"""
+        timeline = coldstart.StartupTimeline()
+        timeline.started -= 1
+        timeline.report(budget_ms=10)
+        self.assertEqual(self.handler.records[-1].levelno, logging.WARNING)
+
+    def test_handler_module_records_stages(self):
+        """basic.py times its catalog and profile setup"""
+        import basic
+        names = [name for name, seconds in basic.STARTUP.stages]
+        self.assertEqual(names, ['catalog_import', 'catalog_load', 'profiles'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Per-request stage timing for the Lex fulfillment pipeline.
+
+lambda_handler starts a RequestTimer for every request and the code it calls
+marks the end of each stage, so a request costs one clock read per stage.
+A LatencyRecorder collects finished timers and periodically hands p50/p95/p99
+aggregates per intent and per slot combination to an exporter: CloudWatch
+Embedded Metric Format lines in Lambda, or an in-memory list in tests.
+"""
+import collections
+import json
+import math
+import sys
+import time
+
+# perf_counter is monotonic; the Python 2.7 runtime falls back to time.time.
+timer = getattr(time, 'perf_counter', time.time)
+
+PERCENTILES = (('p50', 0.50), ('p95', 0.95), ('p99', 0.99))
+
+
+class RequestTimer(object):
+    """
+    Time between consecutive stage boundaries of one request. combination is the
+    code of the slot combination the request resolved to, if any.
+    """
+    __slots__ = ('started', 'last', 'stages', 'combination')
+
+    def __init__(self):
+        self.started = self.last = timer()
+        self.stages = []
+        self.combination = None
+
+    def mark(self, stage):
+        """
+        End the current stage and record it as stage.
+        """
+        now = timer()
+        self.stages.append((stage, now - self.last))
+        self.last = now
+
+    def elapsed(self):
+        return timer() - self.started
+
+
+def percentile(sorted_samples, fraction):
+    """
+    Nearest-rank percentile of a sorted, non-empty list.
+    """
+    rank = int(math.ceil(fraction * len(sorted_samples)))
+    return sorted_samples[max(rank, 1) - 1]
+
+
+class LatencyRecorder(object):
+    """
+    Collects stage latencies per intent and per slot combination, and exports their
+    percentiles every flush_every requests or flush_seconds, whichever comes first.
+    """
+
+    def __init__(self, exporter, flush_every=1000, flush_seconds=60):
+        self.exporter = exporter
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.samples = collections.defaultdict(list)
+        self.requests = 0
+        self.flushed = timer()
+
+    def record(self, intent, request_timer):
+        samples = self.samples
+        combination = request_timer.combination
+        stages = request_timer.stages + [('total', request_timer.elapsed())]
+        for stage, seconds in stages:
+            samples[(intent, None, stage)].append(seconds)
+            if combination is not None:
+                samples[(intent, combination, stage)].append(seconds)
+
+        self.requests += 1
+        if self.requests >= self.flush_every or timer() - self.flushed >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        """
+        Export and reset the collected samples. Returns the exported aggregates.
+        """
+        aggregates = []
+        for (intent, combination, stage), samples in self.samples.items():
+            samples.sort()
+            aggregate = {
+                'intent': intent,
+                'combination': combination,
+                'stage': stage,
+                'count': len(samples),
+            }
+            for name, fraction in PERCENTILES:
+                aggregate[name] = percentile(samples, fraction) * 1000
+            aggregates.append(aggregate)
+
+        self.samples = collections.defaultdict(list)
+        self.requests = 0
+        self.flushed = timer()
+        if aggregates:
+            self.exporter.export(aggregates)
+        return aggregates
+
+
+class InMemoryExporter(object):
+    """
+    Keeps every exported batch of aggregates, for tests and benchmarks.
+    """
+
+    def __init__(self):
+        self.batches = []
+
+    def export(self, aggregates):
+        self.batches.append(aggregates)
+
+
+class EmbeddedMetricFormatExporter(object):
+    """
+    Writes each aggregate as one CloudWatch Embedded Metric Format line. Lambda sends
+    stdout to CloudWatch Logs, which turns the lines into metrics.
+    """
+
+    def __init__(self, namespace='PrinterBot', stream=None):
+        self.namespace = namespace
+        self.stream = stream
+
+    def build_line(self, aggregate, timestamp):
+        dimensions = ['Intent', 'Stage']
+        line = {'Intent': aggregate['intent'], 'Stage': aggregate['stage'], 'Requests': aggregate['count']}
+        if aggregate['combination'] is not None:
+            dimensions = ['Intent', 'Combination', 'Stage']
+            line['Combination'] = aggregate['combination']
+
+        metrics = [{'Name': 'Requests', 'Unit': 'Count'}]
+        for name, fraction in PERCENTILES:
+            metric = 'Latency' + name.upper()
+            metrics.append({'Name': metric, 'Unit': 'Milliseconds'})
+            line[metric] = round(aggregate[name], 3)
+
+        line['_aws'] = {
+            'Timestamp': timestamp,
+            'CloudWatchMetrics': [{
+                'Namespace': self.namespace,
+                'Dimensions': [dimensions],
+                'Metrics': metrics
+            }]
+        }
+        return json.dumps(line, sort_keys=True)
+
+    def export(self, aggregates):
+        stream = self.stream or sys.stdout
+        timestamp = int(time.time() * 1000)
+        for aggregate in aggregates:
+            stream.write(self.build_line(aggregate, timestamp) + '\n')
+        stream.flush()
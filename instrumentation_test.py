@@ -0,0 +1,170 @@
+import itertools
+import json
+import logging
+import unittest
+
+import basic
+import bench_handler
+import instrumentation
+import lex
+from coldstart_test import ListHandler
+
+SLOTS = dict(zip(bench_handler.INTENT_SLOTS['QuizContinue'], ('color', 'WiFi Wireless', 'Letter Legal', 'Print Only')))
+
+
+def build_event(slots=SLOTS):
+    return bench_handler.build_event('QuizContinue', dict(slots))
+
+
+class ListStream(object):
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, text):
+        self.lines.append(text)
+
+    def flush(self):
+        pass
+
+
+class RequestTimerTestCase(unittest.TestCase):
+
+    def test_marks_consecutive_stages(self):
+        """Each mark records the time since the previous one"""
+        request_timer = instrumentation.RequestTimer()
+        request_timer.mark('first')
+        request_timer.mark('second')
+        self.assertEqual([stage for stage, seconds in request_timer.stages], ['first', 'second'])
+        self.assertTrue(all(seconds >= 0 for stage, seconds in request_timer.stages))
+        self.assertGreaterEqual(request_timer.elapsed(), sum(seconds for stage, seconds in request_timer.stages))
+
+    def test_recommendation_stages(self):
+        """A fulfilled request times slot extraction, validation and lookup"""
+        request_timer = instrumentation.RequestTimer()
+        basic.dispatch(lex.LexEvent.from_dict(build_event()), request_timer)
+        self.assertEqual([stage for stage, seconds in request_timer.stages], ['slots', 'validate', 'lookup'])
+
+
+class LatencyRecorderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.exporter = instrumentation.InMemoryExporter()
+        self.recorder = basic.latency_recorder
+        basic.latency_recorder = instrumentation.LatencyRecorder(self.exporter, flush_every=10)
+
+    def tearDown(self):
+        basic.latency_recorder = self.recorder
+
+    def aggregates(self, intent, combination, stage):
+        return [
+            aggregate for aggregate in self.exporter.batches[-1]
+            if (aggregate['intent'], aggregate['combination'], aggregate['stage']) == (intent, combination, stage)
+        ]
+
+    def test_percentile(self):
+        """Nearest-rank percentiles"""
+        samples = list(range(1, 101))
+        self.assertEqual(instrumentation.percentile(samples, 0.50), 50)
+        self.assertEqual(instrumentation.percentile(samples, 0.95), 95)
+        self.assertEqual(instrumentation.percentile(samples, 0.99), 99)
+        self.assertEqual(instrumentation.percentile([7], 0.99), 7)
+        self.assertEqual(instrumentation.percentile([7, 8], 0.0), 7)
+
+    def test_flushes_every_n_requests(self):
+        """Aggregates per intent and per combination are exported every flush_every requests"""
+        for _ in range(9):
+            basic.lambda_handler(build_event(), None)
+        self.assertEqual(self.exporter.batches, [])
+        basic.lambda_handler(build_event(), None)
+        self.assertEqual(len(self.exporter.batches), 1)
+
+        per_intent = self.aggregates('QuizContinue', None, 'total')
+        per_combination = self.aggregates('QuizContinue', '2211', 'validate')
+        self.assertEqual(len(per_intent), 1)
+        self.assertEqual(per_intent[0]['count'], 10)
+        self.assertEqual(per_combination[0]['count'], 10)
+        for aggregate in per_intent + per_combination:
+            self.assertTrue(0 <= aggregate['p50'] <= aggregate['p95'] <= aggregate['p99'])
+
+    def test_unmatched_requests_are_recorded_per_intent_only(self):
+        """Requests that resolve to no combination only count towards their intent"""
+        slots = dict(SLOTS, slotOne=None)
+        for _ in range(10):
+            basic.lambda_handler(build_event(slots), None)
+        combinations = set(aggregate['combination'] for aggregate in self.exporter.batches[-1])
+        self.assertEqual(combinations, set([None]))
+
+    def test_flush_resets_samples(self):
+        """A flush without new samples exports nothing"""
+        basic.lambda_handler(build_event(), None)
+        self.assertTrue(basic.latency_recorder.flush())
+        self.assertEqual(basic.latency_recorder.flush(), [])
+        self.assertEqual(len(self.exporter.batches), 1)
+
+    def test_embedded_metric_format(self):
+        """EMF lines declare their dimensions and metrics"""
+        stream = ListStream()
+        exporter = instrumentation.EmbeddedMetricFormatExporter(stream=stream)
+        exporter.export([
+            {'intent': 'QuizContinue', 'combination': '2211', 'stage': 'total', 'count': 3,
+             'p50': 1.0, 'p95': 2.0, 'p99': 3.0},
+        ])
+        self.assertEqual(len(stream.lines), 1)
+        line = json.loads(stream.lines[0])
+        metrics = line['_aws']['CloudWatchMetrics'][0]
+        self.assertEqual(metrics['Dimensions'], [['Intent', 'Combination', 'Stage']])
+        for metric in metrics['Metrics']:
+            self.assertIn(metric['Name'], line)
+        self.assertEqual(line['LatencyP99'], 3.0)
+        self.assertEqual(line['Combination'], '2211')
+
+
+class SampledRequestLogTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = ListHandler()
+        basic.request_logger.addHandler(self.handler)
+        self.log_every = basic.REQUEST_LOG_EVERY
+        self.counter = basic.request_counter
+        basic.request_counter = itertools.count(1)
+
+    def tearDown(self):
+        basic.request_logger.removeHandler(self.handler)
+        basic.REQUEST_LOG_EVERY = self.log_every
+        basic.request_counter = self.counter
+
+    def test_logs_one_line_per_n_requests(self):
+        """With REQUEST_LOG_EVERY=3, six requests log two JSON lines"""
+        basic.REQUEST_LOG_EVERY = 3
+        for _ in range(6):
+            basic.lambda_handler(build_event(), None)
+        self.assertEqual(len(self.handler.records), 2)
+        line = json.loads(self.handler.records[0].getMessage())
+        self.assertEqual(line['userId'], 'bench')
+        self.assertEqual(line['intent'], 'QuizContinue')
+        self.assertEqual(sorted(line['stagesMs']), ['lookup', 'slots', 'validate'])
+        self.assertGreaterEqual(line['latencyMs'], 0)
+        self.assertEqual(sorted(line['responseCache']), ['hits', 'misses', 'size'])
+
+    def test_sampling_off(self):
+        """REQUEST_LOG_EVERY=0 logs nothing"""
+        basic.REQUEST_LOG_EVERY = 0
+        for _ in range(5):
+            basic.lambda_handler(build_event(), None)
+        self.assertEqual(self.handler.records, [])
+
+    def test_sampled_log_ignores_log_level(self):
+        """Sampled lines are logged even when the root logger only passes warnings"""
+        basic.REQUEST_LOG_EVERY = 1
+        level = basic.logger.level
+        basic.logger.setLevel(logging.WARNING)
+        try:
+            basic.lambda_handler(build_event(), None)
+        finally:
+            basic.logger.setLevel(level)
+        self.assertEqual(len(self.handler.records), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
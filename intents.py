@@ -0,0 +1,63 @@
+"""
+Dispatch table from Lex intent names to the functions that handle them.
+
+Handlers are registered with decorators and looked up with one dictionary access
+per request:
+
+    intents = IntentRegistry()
+
+    @intents.intent('QuizContinue', slots=(...), reservation_keys=(...))
+    def get_recommendation(request, profile, request_timer):
+        ...
+
+    @intents.fallback
+    def unsupported_intent(request, profile, request_timer):
+        ...
+
+The keyword options of a registration are kept in options; basic.py builds each
+quiz intent's profile from them. A handler may be registered for several intents
+by stacking decorators. Intents without a handler go to the fallback.
+"""
+
+
+class IntentRegistry(object):
+
+    def __init__(self):
+        self.handlers = {}
+        self.options = {}
+        self.fallback_handler = None
+
+    def __contains__(self, intent_name):
+        return intent_name in self.handlers
+
+    def __len__(self):
+        return len(self.handlers)
+
+    def intent(self, intent_name, **options):
+        """
+        Decorator registering the decorated function as the handler of intent_name.
+        """
+        if intent_name in self.handlers:
+            raise ValueError('Intent {!r} is already registered'.format(intent_name))
+
+        def register(handler):
+            self.handlers[intent_name] = handler
+            self.options[intent_name] = options
+            return handler
+        return register
+
+    def fallback(self, handler):
+        """
+        Decorator registering the handler of intents that have none of their own.
+        """
+        self.fallback_handler = handler
+        return handler
+
+    def handler(self, intent_name):
+        """
+        Return the handler of intent_name, or the fallback handler.
+        """
+        handler = self.handlers.get(intent_name, self.fallback_handler)
+        if handler is None:
+            raise ValueError('Intent with name {} not supported'.format(intent_name))
+        return handler
@@ -0,0 +1,52 @@
+import unittest
+
+import intents
+
+
+def answer(request, profile, request_timer=None):
+    return 'answer'
+
+
+def fallback(request, profile, request_timer=None):
+    return 'fallback'
+
+
+class IntentRegistryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = intents.IntentRegistry()
+
+    def test_decorator_registers_handler_and_options(self):
+        """The decorated function handles its intent and keeps its options"""
+        decorated = self.registry.intent('Quiz', slots=('a', 'b'))(answer)
+        self.assertIs(decorated, answer)
+        self.assertIs(self.registry.handler('Quiz'), answer)
+        self.assertEqual(self.registry.options['Quiz'], {'slots': ('a', 'b')})
+        self.assertIn('Quiz', self.registry)
+
+    def test_stacked_registrations(self):
+        """One handler can serve several intents"""
+        self.registry.intent('Scanners')(self.registry.intent('Plotters')(answer))
+        self.assertIs(self.registry.handler('Scanners'), answer)
+        self.assertIs(self.registry.handler('Plotters'), answer)
+        self.assertEqual(len(self.registry), 2)
+
+    def test_duplicate_intent(self):
+        """An intent cannot be registered twice"""
+        self.registry.intent('Quiz')(answer)
+        self.assertRaises(ValueError, self.registry.intent, 'Quiz')
+
+    def test_unknown_intent_uses_fallback(self):
+        """Intents without a handler get the fallback"""
+        self.registry.intent('Quiz')(answer)
+        self.registry.fallback(fallback)
+        self.assertIs(self.registry.handler('OrderPizza'), fallback)
+        self.assertNotIn('OrderPizza', self.registry)
+
+    def test_unknown_intent_without_fallback(self):
+        """Without a fallback, unknown intents are an error"""
+        self.assertRaises(ValueError, self.registry.handler, 'OrderPizza')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,331 @@
+"""
+Typed model of the Lex Lambda event and of the responses the handler returns.
+
+LexEvent reads the fields basic.py uses out of the raw event once per request,
+from either a Lex V1 event (currentIntent) or a Lex V2 one (sessionState); V2
+slots are read into the same {slot name: value} dict V1 events carry, so the
+bot handles both the same way. Responses are LexResponse objects holding one of
+the dialog actions below; to_dict() encodes them into the V1 dict Lambda
+serializes, leaving out fields that are None, and to_v2_dict() into a V2
+response. All of them are __slots__ classes, so a request allocates no
+instance dicts. See bench_model.py for memory and encoding time against plain
+dict literals.
+"""
+import json
+
+from cache import LRUCache
+
+# Compact separators; Lex does not care about whitespace.
+JSON_SEPARATORS = (',', ':')
+
+# V2 messages of the shared, already encoded dialogActions, keyed by id(); see
+# v2_messages().
+V2_MESSAGES = LRUCache(256)
+
+
+def v2_slot_value(slot):
+    """
+    The interpreted value of a V2 slot (its original value if Lex resolved none),
+    or None if it is not filled.
+    """
+    value = slot.get('value') if slot else None
+    if not value:
+        return None
+    return value.get('interpretedValue') or value.get('originalValue')
+
+
+def read_v2_slots(slots):
+    """
+    Return the {slot name: value} dict of V2 slots.
+    """
+    return dict((name, v2_slot_value(slot)) for name, slot in (slots or {}).items())
+
+
+def write_v2_slots(slots, v2_slots):
+    """
+    Encode {slot name: value} slots as V2 slots, reusing the request's slot
+    objects in v2_slots for values that did not change, or v2_slots itself if
+    none did.
+    """
+    if slots is None:
+        return None
+    v2_slots = v2_slots or {}
+    if len(slots) == len(v2_slots):
+        for name, value in slots.items():
+            if v2_slot_value(v2_slots.get(name)) != value:
+                break
+        else:
+            return v2_slots
+    encoded = {}
+    for name, value in slots.items():
+        slot = v2_slots.get(name)
+        if v2_slot_value(slot) == value:
+            encoded[name] = slot
+        elif value is None:
+            encoded[name] = None
+        else:
+            encoded[name] = {'shape': 'Scalar', 'value': {'originalValue': value, 'interpretedValue': value, 'resolvedValues': [value]}}
+    return encoded
+
+
+def image_response_card(attachment):
+    """
+    Encode a V1 generic attachment as a V2 ImageResponseCard.
+    """
+    card = {'title': attachment['title']}
+    if attachment.get('subTitle'):
+        card['subtitle'] = attachment['subTitle']
+    if attachment.get('imageUrl'):
+        card['imageUrl'] = attachment['imageUrl']
+    if attachment.get('buttons'):
+        card['buttons'] = [{'text': button['text'], 'value': button['value']} for button in attachment['buttons']]
+    return card
+
+
+def encode_v2_messages(message, response_card):
+    """
+    The V2 messages[] of a V1 message and responseCard. V2 cards cannot link
+    anywhere, so each attachment's attachmentLinkUrl follows its card as a plain
+    text message.
+    """
+    messages = []
+    if message is not None:
+        messages.append(message)
+    if response_card is not None:
+        for attachment in response_card.get('genericAttachments') or ():
+            messages.append({'contentType': 'ImageResponseCard', 'imageResponseCard': image_response_card(attachment)})
+            if attachment.get('attachmentLinkUrl'):
+                messages.append({'contentType': 'PlainText', 'content': attachment['attachmentLinkUrl']})
+    return messages
+
+
+def v2_messages(dialog_action):
+    """
+    The V2 messages[] of an encoded V1 dialogAction. The recommendation templates
+    are shared by every response for their combination, so their messages are
+    encoded once and shared too; callers must never mutate them.
+    """
+    entry = V2_MESSAGES.get(id(dialog_action))
+    if entry is None or entry[0] is not dialog_action:
+        entry = (dialog_action, encode_v2_messages(dialog_action.get('message'), dialog_action.get('responseCard')))
+        V2_MESSAGES.put(id(dialog_action), entry)
+    return entry[1]
+
+
+class LexEvent(object):
+    """
+    The parts of a Lex V1 or V2 input event the bot reads. lex_version is 1 or 2;
+    v2_slots keeps a V2 event's own slot objects for its response.
+    """
+    __slots__ = (
+        'intent_name', 'slots', 'confirmation_status', 'invocation_source',
+        'user_id', 'bot_name', 'input_transcript', 'session_attributes',
+        'lex_version', 'v2_slots'
+    )
+
+    def __init__(self, intent_name, slots=None, confirmation_status=None, invocation_source=None,
+                 user_id=None, bot_name=None, input_transcript=None, session_attributes=None,
+                 lex_version=1, v2_slots=None):
+        self.intent_name = intent_name
+        self.slots = slots
+        self.confirmation_status = confirmation_status
+        self.invocation_source = invocation_source
+        self.user_id = user_id
+        self.bot_name = bot_name
+        self.input_transcript = input_transcript
+        self.session_attributes = session_attributes
+        self.lex_version = lex_version
+        self.v2_slots = v2_slots
+
+    @classmethod
+    def from_dict(cls, event):
+        """
+        Read a Lex V1 or V2 event; lex_version tells which it was.
+        """
+        if 'sessionState' in event:
+            return cls.from_v2_dict(event)
+        intent = event['currentIntent']
+        bot = event.get('bot') or {}
+        return cls(
+            intent['name'],
+            intent.get('slots'),
+            intent.get('confirmationStatus'),
+            event.get('invocationSource'),
+            event.get('userId'),
+            bot.get('name'),
+            event.get('inputTranscript'),
+            event.get('sessionAttributes'),
+        )
+
+    @classmethod
+    def from_v2_dict(cls, event):
+        session_state = event['sessionState']
+        intent = session_state['intent']
+        bot = event.get('bot') or {}
+        v2_slots = intent.get('slots')
+        return cls(
+            intent['name'],
+            read_v2_slots(v2_slots) if v2_slots is not None else None,
+            intent.get('confirmationState'),
+            event.get('invocationSource'),
+            event.get('sessionId'),
+            bot.get('name'),
+            event.get('inputTranscript'),
+            session_state.get('sessionAttributes'),
+            2,
+            v2_slots,
+        )
+
+
+class DialogAction(object):
+    """
+    Base class of the dialog actions. FIELDS pairs each attribute with its key in
+    the encoded dialogAction.
+    """
+    __slots__ = ()
+    TYPE = None
+    FIELDS = ()
+    # The V2 intent state; Close uses its fulfillment state.
+    INTENT_STATE = 'InProgress'
+
+    def to_dict(self):
+        action = {'type': self.TYPE}
+        for attribute, key in self.FIELDS:
+            value = getattr(self, attribute)
+            if value is not None:
+                action[key] = value
+        return action
+
+
+class ElicitSlot(DialogAction):
+    __slots__ = ('intent_name', 'slots', 'slot_to_elicit', 'message', 'response_card')
+    TYPE = 'ElicitSlot'
+    FIELDS = (
+        ('intent_name', 'intentName'),
+        ('slots', 'slots'),
+        ('slot_to_elicit', 'slotToElicit'),
+        ('message', 'message'),
+        ('response_card', 'responseCard'),
+    )
+
+    def __init__(self, intent_name, slots, slot_to_elicit, message=None, response_card=None):
+        self.intent_name = intent_name
+        self.slots = slots
+        self.slot_to_elicit = slot_to_elicit
+        self.message = message
+        self.response_card = response_card
+
+
+class ConfirmIntent(DialogAction):
+    __slots__ = ('intent_name', 'slots', 'message', 'response_card')
+    TYPE = 'ConfirmIntent'
+    FIELDS = (
+        ('intent_name', 'intentName'),
+        ('slots', 'slots'),
+        ('message', 'message'),
+        ('response_card', 'responseCard'),
+    )
+
+    def __init__(self, intent_name, slots, message=None, response_card=None):
+        self.intent_name = intent_name
+        self.slots = slots
+        self.message = message
+        self.response_card = response_card
+
+
+class Close(DialogAction):
+    __slots__ = ('fulfillment_state', 'message', 'response_card')
+    TYPE = 'Close'
+    INTENT_STATE = None
+    FIELDS = (
+        ('fulfillment_state', 'fulfillmentState'),
+        ('message', 'message'),
+        ('response_card', 'responseCard'),
+    )
+
+    def __init__(self, fulfillment_state, message=None, response_card=None):
+        self.fulfillment_state = fulfillment_state
+        self.message = message
+        self.response_card = response_card
+
+
+class Delegate(DialogAction):
+    __slots__ = ('slots',)
+    TYPE = 'Delegate'
+    FIELDS = (
+        ('slots', 'slots'),
+    )
+
+    def __init__(self, slots):
+        self.slots = slots
+
+
+class LexResponse(object):
+    """
+    A Lex response. dialog_action is a DialogAction, or an already encoded V1
+    dialogAction dict such as the shared recommendation templates, which to_dict()
+    passes through untouched.
+    """
+    __slots__ = ('session_attributes', 'dialog_action')
+
+    def __init__(self, session_attributes, dialog_action):
+        self.session_attributes = session_attributes
+        self.dialog_action = dialog_action
+
+    def to_dict(self):
+        dialog_action = self.dialog_action
+        if isinstance(dialog_action, DialogAction):
+            dialog_action = dialog_action.to_dict()
+        response = {'dialogAction': dialog_action}
+        if self.session_attributes is not None:
+            response['sessionAttributes'] = self.session_attributes
+        return response
+
+    def to_v2_dict(self, request):
+        """
+        Encode as the V2 response to the LexEvent request: the dialog action's type,
+        the intent with its slots and state, and its message and response card as
+        messages[].
+        """
+        dialog_action = self.dialog_action
+        if isinstance(dialog_action, DialogAction):
+            action_type = dialog_action.TYPE
+            intent_name = getattr(dialog_action, 'intent_name', None) or request.intent_name
+            slots = getattr(dialog_action, 'slots', request.slots)
+            slot_to_elicit = getattr(dialog_action, 'slot_to_elicit', None)
+            intent_state = dialog_action.INTENT_STATE or dialog_action.fulfillment_state
+            messages = encode_v2_messages(getattr(dialog_action, 'message', None), getattr(dialog_action, 'response_card', None))
+        else:
+            action_type = dialog_action['type']
+            intent_name = dialog_action.get('intentName') or request.intent_name
+            slots = dialog_action.get('slots', request.slots)
+            slot_to_elicit = dialog_action.get('slotToElicit')
+            intent_state = dialog_action.get('fulfillmentState') or DialogAction.INTENT_STATE
+            messages = v2_messages(dialog_action)
+
+        action = {'type': action_type}
+        if slot_to_elicit is not None:
+            action['slotToElicit'] = slot_to_elicit
+        intent = {'name': intent_name, 'state': intent_state}
+        if slots is not None:
+            intent['slots'] = write_v2_slots(slots, request.v2_slots)
+        if request.confirmation_status is not None:
+            intent['confirmationState'] = request.confirmation_status
+        session_state = {'dialogAction': action, 'intent': intent}
+        if self.session_attributes is not None:
+            session_state['sessionAttributes'] = self.session_attributes
+        response = {'sessionState': session_state}
+        if messages:
+            response['messages'] = messages
+        return response
+
+    def encode(self, request):
+        """
+        Encode in the Lex version of the LexEvent request.
+        """
+        if request.lex_version == 2:
+            return self.to_v2_dict(request)
+        return self.to_dict()
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), separators=JSON_SEPARATORS)
@@ -0,0 +1,189 @@
+import json
+import unittest
+
+import lex
+
+EVENT = {
+    'currentIntent': {
+        'name': 'QuizContinue',
+        'slots': {'slotFour': 'color'},
+        'confirmationStatus': 'None'
+    },
+    'bot': {'name': 'TestBot'},
+    'userId': 'uid',
+    'invocationSource': 'DialogCodeHook',
+    'inputTranscript': 'color',
+    'sessionAttributes': {'currentReservation': '{}'}
+}
+
+MESSAGE = {'contentType': 'PlainText', 'content': 'Enter a valid color choice'}
+
+COLOR_SLOT = {'shape': 'Scalar', 'value': {'originalValue': 'colour', 'interpretedValue': 'color', 'resolvedValues': ['color']}}
+
+V2_EVENT = {
+    'messageVersion': '1.0',
+    'invocationSource': 'DialogCodeHook',
+    'inputMode': 'Text',
+    'sessionId': 'uid',
+    'inputTranscript': 'colour',
+    'bot': {'id': 'BOTID', 'name': 'TestBot', 'aliasId': 'TSTALIASID', 'localeId': 'en_US', 'version': 'DRAFT'},
+    'sessionState': {
+        'sessionAttributes': {'currentReservation': '#2000'},
+        'intent': {
+            'name': 'QuizContinue',
+            'slots': {'slotFour': COLOR_SLOT, 'slotThree': None},
+            'state': 'InProgress',
+            'confirmationState': 'None'
+        }
+    }
+}
+
+
+class LexEventTestCase(unittest.TestCase):
+
+    def test_from_dict(self):
+        """The fields the bot reads are copied out of the raw event"""
+        request = lex.LexEvent.from_dict(EVENT)
+        self.assertEqual(request.intent_name, 'QuizContinue')
+        self.assertIs(request.slots, EVENT['currentIntent']['slots'])
+        self.assertEqual(request.user_id, 'uid')
+        self.assertEqual(request.bot_name, 'TestBot')
+        self.assertEqual(request.invocation_source, 'DialogCodeHook')
+        self.assertIs(request.session_attributes, EVENT['sessionAttributes'])
+
+    def test_optional_fields(self):
+        """Optional event fields default to None"""
+        request = lex.LexEvent.from_dict({'currentIntent': {'name': 'QuizContinue'}})
+        self.assertIsNone(request.slots)
+        self.assertIsNone(request.bot_name)
+        self.assertIsNone(request.session_attributes)
+
+    def test_from_v2_dict(self):
+        """A V2 event is read into the same fields, with plain slot values"""
+        request = lex.LexEvent.from_dict(V2_EVENT)
+        self.assertEqual(request.lex_version, 2)
+        self.assertEqual(request.intent_name, 'QuizContinue')
+        self.assertEqual(request.slots, {'slotFour': 'color', 'slotThree': None})
+        self.assertEqual(request.user_id, 'uid')
+        self.assertEqual(request.bot_name, 'TestBot')
+        self.assertEqual(request.confirmation_status, 'None')
+        self.assertIs(request.session_attributes, V2_EVENT['sessionState']['sessionAttributes'])
+        self.assertEqual(lex.LexEvent.from_dict(EVENT).lex_version, 1)
+
+    def test_v2_slot_without_interpretation(self):
+        """A V2 slot Lex could not resolve keeps what the user said"""
+        self.assertEqual(lex.v2_slot_value({'value': {'originalValue': 'purple', 'resolvedValues': []}}), 'purple')
+        self.assertIsNone(lex.v2_slot_value(None))
+
+    def test_has_no_instance_dict(self):
+        """Model objects are __slots__ objects"""
+        for obj in (lex.LexEvent('QuizContinue'), lex.Delegate({}), lex.LexResponse({}, lex.Delegate({}))):
+            self.assertFalse(hasattr(obj, '__dict__'))
+
+
+class LexResponseTestCase(unittest.TestCase):
+
+    def test_elicit_slot(self):
+        """ElicitSlot encodes to the Lex V1 dialogAction"""
+        slots = {'slotFour': None}
+        response = lex.LexResponse({}, lex.ElicitSlot('QuizContinue', slots, 'slotFour', MESSAGE)).to_dict()
+        self.assertEqual(response, {
+            'sessionAttributes': {},
+            'dialogAction': {
+                'type': 'ElicitSlot',
+                'intentName': 'QuizContinue',
+                'slots': slots,
+                'slotToElicit': 'slotFour',
+                'message': MESSAGE
+            }
+        })
+
+    def test_skips_none_fields(self):
+        """Fields that are None are left out"""
+        response = lex.LexResponse(None, lex.Close('Fulfilled')).to_dict()
+        self.assertEqual(response, {'dialogAction': {'type': 'Close', 'fulfillmentState': 'Fulfilled'}})
+
+    def test_encoded_dialog_action_is_shared(self):
+        """An already encoded dialogAction is passed through as is"""
+        template = {'type': 'Close', 'fulfillmentState': 'Fulfilled'}
+        self.assertIs(lex.LexResponse({}, template).to_dict()['dialogAction'], template)
+
+    def test_to_json(self):
+        """to_json encodes compactly"""
+        encoded = lex.LexResponse({}, lex.Delegate({'slotFour': 'color'})).to_json()
+        self.assertNotIn(' ', encoded.replace('slotFour', ''))
+        self.assertEqual(json.loads(encoded), {'sessionAttributes': {}, 'dialogAction': {'type': 'Delegate', 'slots': {'slotFour': 'color'}}})
+
+
+
+class LexV2ResponseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.request = lex.LexEvent.from_dict(V2_EVENT)
+
+    def test_elicit_slot(self):
+        """ElicitSlot encodes to a V2 session state and messages"""
+        slots = {'slotFour': None, 'slotThree': None}
+        response = lex.LexResponse({}, lex.ElicitSlot('QuizContinue', slots, 'slotFour', MESSAGE)).to_v2_dict(self.request)
+        self.assertEqual(response, {
+            'sessionState': {
+                'sessionAttributes': {},
+                'dialogAction': {'type': 'ElicitSlot', 'slotToElicit': 'slotFour'},
+                'intent': {
+                    'name': 'QuizContinue',
+                    'slots': slots,
+                    'state': 'InProgress',
+                    'confirmationState': 'None'
+                }
+            },
+            'messages': [MESSAGE]
+        })
+
+    def test_unchanged_slots_are_reused(self):
+        """Slots the bot did not change go back as the request's own objects"""
+        response = lex.LexResponse({}, lex.Delegate(self.request.slots)).to_v2_dict(self.request)
+        self.assertIs(response['sessionState']['intent']['slots'], V2_EVENT['sessionState']['intent']['slots'])
+
+        slots = {'slotFour': 'color', 'slotThree': 'WiFi Wireless'}
+        encoded = lex.write_v2_slots(slots, self.request.v2_slots)
+        self.assertIs(encoded['slotFour'], COLOR_SLOT)
+        self.assertEqual(encoded['slotThree']['value']['interpretedValue'], 'WiFi Wireless')
+
+    def test_close_template(self):
+        """A shared V1 Close template becomes the intent state and cards, encoded once"""
+        template = {
+            'type': 'Close',
+            'fulfillmentState': 'Fulfilled',
+            'message': MESSAGE,
+            'responseCard': {
+                'version': '0',
+                'contentType': 'application/vnd.amazonaws.card.generic',
+                'genericAttachments': [{'title': 'Printer', 'subTitle': 'Printer', 'attachmentLinkUrl': 'https://example.com/p', 'imageUrl': 'https://example.com/p.jpg'}]
+            }
+        }
+        response = lex.LexResponse({}, template).to_v2_dict(self.request)
+        self.assertEqual(response['sessionState']['dialogAction'], {'type': 'Close'})
+        self.assertEqual(response['sessionState']['intent']['state'], 'Fulfilled')
+        self.assertEqual(response['messages'], [
+            MESSAGE,
+            {'contentType': 'ImageResponseCard', 'imageResponseCard': {'title': 'Printer', 'subtitle': 'Printer', 'imageUrl': 'https://example.com/p.jpg'}},
+            {'contentType': 'PlainText', 'content': 'https://example.com/p'},
+        ])
+        self.assertIs(lex.LexResponse({}, template).to_v2_dict(self.request)['messages'], response['messages'])
+
+    def test_close_object(self):
+        """Close takes the intent name from the request"""
+        response = lex.LexResponse(None, lex.Close('Failed', MESSAGE)).to_v2_dict(self.request)
+        self.assertEqual(response['sessionState']['intent']['name'], 'QuizContinue')
+        self.assertEqual(response['sessionState']['intent']['state'], 'Failed')
+        self.assertNotIn('sessionAttributes', response['sessionState'])
+
+    def test_encode_follows_request_version(self):
+        """encode() answers each event in its own version"""
+        response = lex.LexResponse({}, lex.Delegate({'slotFour': 'color'}))
+        self.assertIn('dialogAction', response.encode(lex.LexEvent.from_dict(EVENT)))
+        self.assertIn('sessionState', response.encode(self.request))
+
+
+if __name__ == '__main__':
+    unittest.main()
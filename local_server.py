@@ -0,0 +1,217 @@
+"""
+Serve lambda_handler over HTTP for local load testing.
+
+    python local_server.py serve --port 8080 --workers 8
+    python local_server.py load --workers 1,2,4,8 --requests 20000 --clients 8
+
+POST a Lex V1 or V2 event as JSON to any path, including the Lambda runtime interface
+emulator's /2015-03-31/functions/function/invocations; the response body is the
+handler's JSON response. Every connection gets its own thread, and at most
+--workers requests run the handler at once, however many keep-alive connections
+are open. `load` starts a server for each worker count, replays the bench_handler
+events over keep-alive connections from client threads and reports throughput and
+latency percentiles for each.
+"""
+import argparse
+import json
+import logging
+import sys
+import threading
+
+try:
+    from http.client import HTTPConnection
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from httplib import HTTPConnection
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+import basic
+import bench_handler
+from instrumentation import percentile, timer
+
+logger = logging.getLogger()
+
+INVOKE_PATH = '/2015-03-31/functions/function/invocations'
+
+
+class LambdaRequestHandler(BaseHTTPRequestHandler):
+    """
+    Passes each POSTed event to basic.lambda_handler.
+    """
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY every response
+    # waits out the client's delayed ACK.
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            event = json.loads(self.rfile.read(length).decode('utf-8'))
+        except ValueError as e:
+            self.send_json(400, {'errorMessage': 'Invalid JSON event: {}'.format(e)})
+            return
+        try:
+            with self.server.worker_slots:
+                response = basic.lambda_handler(event, None)
+        except Exception as e:
+            logger.exception('lambda_handler failed')
+            self.send_json(500, {'errorMessage': str(e), 'errorType': type(e).__name__})
+            return
+        self.send_json(200, response)
+
+    def send_json(self, status, body):
+        encoded = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args):
+        # One line per request would cost more than the handler itself.
+        pass
+
+
+class BoundedThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """
+    HTTPServer with a thread per connection that lets at most workers requests run
+    the handler at once. Idle keep-alive connections only hold their own thread, so
+    clients beyond workers wait for a free slot instead of for another client to
+    disconnect.
+    """
+    daemon_threads = True
+    # Open keep-alive connections must not hold up server_close().
+    block_on_close = False
+
+    def __init__(self, server_address, handler_class, workers=4):
+        HTTPServer.__init__(self, server_address, handler_class)
+        self.workers = workers
+        self.worker_slots = threading.BoundedSemaphore(workers)
+
+
+def start_server(port=0, workers=4, host='127.0.0.1'):
+    """
+    Start serving in a background thread and return the server; port 0 picks a free port.
+    """
+    server = BoundedThreadingHTTPServer((host, port), LambdaRequestHandler, workers)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def stop_server(server):
+    server.shutdown()
+    server.server_close()
+
+
+def drive(port, bodies, requests, clients, host='127.0.0.1'):
+    """
+    Send requests POSTs of bodies, round robin, from clients threads with one keep-alive
+    connection each. Returns (per-request latencies in seconds, wall clock seconds).
+    """
+    latencies = []
+    failures = []
+    lock = threading.Lock()
+
+    def client(index):
+        connection = HTTPConnection(host, port)
+        samples = []
+        try:
+            for number in range(index, requests, clients):
+                started = timer()
+                connection.request('POST', INVOKE_PATH, bodies[number % len(bodies)], {'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                samples.append(timer() - started)
+                if response.status != 200:
+                    failures.append(response.status)
+        finally:
+            connection.close()
+            with lock:
+                latencies.extend(samples)
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    started = timer()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = timer() - started
+    if failures:
+        raise RuntimeError('{} requests failed, e.g. with status {}'.format(len(failures), failures[0]))
+    return latencies, elapsed
+
+
+def run_load(worker_counts, requests=10000, clients=8, events=None):
+    """
+    Load a fresh server for each worker count. Returns a list of
+    {'workers', 'requests', 'throughput', 'p50_ms', 'p95_ms', 'p99_ms'}.
+    """
+    if events is None:
+        events = bench_handler.generate_events()
+    bodies = [json.dumps(event).encode('utf-8') for category, event in events]
+    results = []
+    for workers in worker_counts:
+        server = start_server(workers=workers)
+        try:
+            latencies, elapsed = drive(server.server_address[1], bodies, requests, clients)
+        finally:
+            stop_server(server)
+        latencies.sort()
+        results.append({
+            'workers': workers,
+            'requests': len(latencies),
+            'throughput': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+        })
+    return results
+
+
+def print_results(results):
+    print('{:>7} {:>9} {:>9} {:>8} {:>8} {:>8}'.format('workers', 'requests', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms'))
+    for result in results:
+        print('{:>7} {:>9} {:>9.0f} {:>8.3f} {:>8.3f} {:>8.3f}'.format(
+            result['workers'], result['requests'], result['throughput'], result['p50_ms'], result['p95_ms'], result['p99_ms']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command')
+    serve = commands.add_parser('serve', help='serve lambda_handler until interrupted')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('--workers', type=int, default=8, help='requests handled at once')
+    load = commands.add_parser('load', help='load a local server for each worker count and report')
+    load.add_argument('--workers', default='1,2,4,8', help='comma-separated worker counts')
+    load.add_argument('--requests', type=int, default=10000, help='requests per worker count')
+    load.add_argument('--clients', type=int, default=8, help='concurrent keep-alive connections')
+    load.add_argument('--events', help='JSON file of recorded Lex events to replay instead of generated ones')
+    args = parser.parse_args(argv)
+
+    bench_handler.quiet_logging()
+    if args.command == 'serve':
+        server = BoundedThreadingHTTPServer((args.host, args.port), LambdaRequestHandler, args.workers)
+        print('Serving lambda_handler on http://{}:{}{} with {} workers'.format(args.host, args.port, INVOKE_PATH, args.workers))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+    if args.command == 'load':
+        events = bench_handler.load_events(args.events) if args.events else None
+        worker_counts = [int(workers) for workers in args.workers.split(',')]
+        print_results(run_load(worker_counts, args.requests, args.clients, events))
+        return 0
+    parser.print_help()
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
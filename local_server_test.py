@@ -0,0 +1,76 @@
+import json
+import unittest
+
+import basic
+import bench_handler
+import local_server
+
+
+class LocalServerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = local_server.start_server(workers=2)
+        self.port = self.server.server_address[1]
+
+    def tearDown(self):
+        local_server.stop_server(self.server)
+
+    def post(self, body):
+        connection = local_server.HTTPConnection('127.0.0.1', self.port)
+        try:
+            connection.request('POST', local_server.INVOKE_PATH, body, {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            return response.status, json.loads(response.read().decode('utf-8'))
+        finally:
+            connection.close()
+
+    def test_serves_lambda_handler(self):
+        """A POSTed event gets the handler's response"""
+        category, event = bench_handler.generate_events()[0]
+        status, body = self.post(json.dumps(event).encode('utf-8'))
+        self.assertEqual(status, 200)
+        self.assertEqual(body, json.loads(json.dumps(basic.lambda_handler(event, None))))
+
+    def test_invalid_json(self):
+        """Bodies that are not JSON are rejected"""
+        status, body = self.post(b'{not json')
+        self.assertEqual(status, 400)
+        self.assertIn('errorMessage', body)
+
+    def test_handler_error(self):
+        """Handler exceptions are reported, not dropped"""
+        status, body = self.post(b'{}')
+        self.assertEqual(status, 500)
+        self.assertEqual(body['errorType'], 'KeyError')
+
+    def test_more_clients_than_workers(self):
+        """Keep-alive connections beyond the worker count are still served"""
+        category, event = bench_handler.generate_events()[0]
+        body = json.dumps(event).encode('utf-8')
+        connections = [local_server.HTTPConnection('127.0.0.1', self.port, timeout=5) for _ in range(4)]
+        try:
+            for _ in range(2):
+                for connection in connections:
+                    connection.request('POST', local_server.INVOKE_PATH, body, {'Content-Type': 'application/json'})
+                    response = connection.getresponse()
+                    response.read()
+                    self.assertEqual(response.status, 200)
+        finally:
+            for connection in connections:
+                connection.close()
+
+
+class RunLoadTestCase(unittest.TestCase):
+
+    def test_reports_each_worker_count(self):
+        """A short load run reports throughput and tail latency per worker count"""
+        results = local_server.run_load([1, 2], requests=40, clients=4)
+        self.assertEqual([result['workers'] for result in results], [1, 2])
+        for result in results:
+            self.assertEqual(result['requests'], 40)
+            self.assertGreater(result['throughput'], 0)
+            self.assertTrue(0 < result['p50_ms'] <= result['p95_ms'] <= result['p99_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,370 @@
+import itertools
+import json
+import os
+import unittest
+
+import basic
+import bench_handler
+import cache
+import catalog
+import lex
+from coldstart_test import ListHandler
+from bench_handler import COLOR_TYPES, CONC_TYPES, INTENT_SLOTS, PAPER_SIZES, PRINT_TYPES, build_event
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_golden_responses():
+    """
+    Responses recorded from the original if-chain implementation, keyed by (intent, slot tuple).
+    """
+    with open(os.path.join(FIXTURES, 'golden_responses.json')) as f:
+        records = json.load(f)
+    golden = {}
+    for record in records:
+        slot_names = INTENT_SLOTS[record['intent']]
+        key = tuple(record['slots'][name] for name in slot_names)
+        golden[(record['intent'], key)] = record['response']
+    return golden
+
+
+class RecommendationTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.golden = load_golden_responses()
+
+    def test_every_combination_matches_golden_response(self):
+        """Every slot combination returns the byte-identical recorded dialogAction"""
+        for intent_name, slot_names in sorted(INTENT_SLOTS.items()):
+            for key in itertools.product(COLOR_TYPES, CONC_TYPES, PAPER_SIZES, PRINT_TYPES):
+                event = build_event(intent_name, dict(zip(slot_names, key)))
+                res = basic.lambda_handler(event, None)
+                expected = self.golden[(intent_name, key)]
+                self.assertEqual(
+                    json.dumps(res['dialogAction'], sort_keys=True),
+                    json.dumps(expected['dialogAction'], sort_keys=True),
+                    (intent_name, key)
+                )
+
+    def test_v2_events_get_the_same_recommendation(self):
+        """A Lex V2 event gets the recommendation of the V1 event for the same answers"""
+        key = ('color', 'WiFi Wireless', 'Letter Legal 11x17', 'Print Copy Scan')
+        event = build_event('QuizContinue', dict(zip(INTENT_SLOTS['QuizContinue'], key)))
+        expected = self.golden[('QuizContinue', key)]['dialogAction']
+        res = basic.lambda_handler(bench_handler.to_v2_event(event), None)
+        self.assertEqual(res['sessionState']['intent']['state'], 'Fulfilled')
+        self.assertEqual(res['messages'][0], expected['message'])
+        self.assertEqual(
+            [message['imageResponseCard']['title'] for message in res['messages'] if message['contentType'] == 'ImageResponseCard'],
+            [attachment['title'] for attachment in expected['responseCard']['genericAttachments']]
+        )
+
+    def test_v2_invalid_answer(self):
+        """A Lex V2 event with an invalid answer elicits the slot again"""
+        slots = dict(zip(INTENT_SLOTS['QuizContinueA'], ('purple', None, None, None)))
+        res = basic.lambda_handler(bench_handler.to_v2_event(build_event('QuizContinueA', slots)), None)
+        self.assertEqual(res['sessionState']['dialogAction'], {'type': 'ElicitSlot', 'slotToElicit': 'slotSup'})
+        self.assertIsNone(res['sessionState']['intent']['slots']['slotSup'])
+        self.assertEqual(res['messages'][0]['content'], basic.VALIDATION_MESSAGES[0])
+
+    def test_fulfillment_returns_session_attributes(self):
+        """The Close response carries the request's session attributes"""
+        key = ('color', 'WiFi Wireless', 'Letter Legal', 'Print Only')
+        event = build_event('QuizContinue', dict(zip(INTENT_SLOTS['QuizContinue'], key)))
+        event['sessionAttributes'] = {'previous': 'value'}
+        res = basic.lambda_handler(event, None)
+        self.assertEqual(res['sessionAttributes']['previous'], 'value')
+        self.assertEqual(res['sessionAttributes']['currentReservation'], '#2211')
+
+    def test_reservation_record(self):
+        """The stored reservation decodes to the answers under the intent's keys"""
+        key = ('color', 'Ethernet Wired', 'Letter Legal 11x17', 'Print Copy Scan')
+        for intent_name, slot_names in INTENT_SLOTS.items():
+            profile = basic.INTENT_PROFILES[intent_name]
+            res = basic.lambda_handler(build_event(intent_name, dict(zip(slot_names, key))), None)
+            record = basic.current_reservation(res['sessionAttributes'], profile)
+            self.assertEqual(record, dict(zip(profile['reservation_keys'], key)))
+
+    def test_reservation_of_invalid_turn(self):
+        """A re-prompt keeps the answers before the violated slot"""
+        slots = dict(zip(INTENT_SLOTS['QuizContinue'], ('color', 'USB', 'Letter Legal', None)))
+        res = basic.lambda_handler(build_event('QuizContinue', slots), None)
+        self.assertEqual(res['dialogAction']['slotToElicit'], 'slotThree')
+        self.assertEqual(res['sessionAttributes']['currentReservation'], '#2000')
+        self.assertIsNone(basic.current_reservation({}, basic.INTENT_PROFILES['QuizContinue']))
+
+    def test_index_covers_catalog(self):
+        """Each intent profile has exactly one recommendation per slot combination"""
+        keys = set(itertools.product(COLOR_TYPES, CONC_TYPES, PAPER_SIZES, PRINT_TYPES))
+        for intent_name in INTENT_SLOTS:
+            profile = basic.INTENT_PROFILES[intent_name]
+            self.assertEqual(set(profile['recommendations']), keys, intent_name)
+            self.assertEqual(profile['slots'], INTENT_SLOTS[intent_name])
+
+    def test_responses_share_interned_templates(self):
+        """Repeated requests reuse the prebuilt dialogAction and only differ in session attributes"""
+        key = ('color', 'WiFi Wireless', 'Letter Legal', 'Print Only')
+        slots = dict(zip(INTENT_SLOTS['QuizContinue'], key))
+        first = basic.lambda_handler(build_event('QuizContinue', dict(slots)), None)
+        second = basic.lambda_handler(build_event('QuizContinue', dict(slots)), None)
+        self.assertIs(first['dialogAction'], second['dialogAction'])
+        self.assertIsNot(first['sessionAttributes'], second['sessionAttributes'])
+        self.assertEqual(first['dialogAction'], self.golden[('QuizContinue', key)]['dialogAction'])
+
+    def test_batch_matches_per_request_path(self):
+        """Batch recommendation ids agree with what each request would be answered with"""
+        keys = list(itertools.product(COLOR_TYPES, CONC_TYPES, PAPER_SIZES, PRINT_TYPES))
+        keys += [('Color', 'WiFi Wireless', 'Letter Legal', 'Print Only'), ('color', None, None, None)]
+        for intent_name, slot_names in sorted(INTENT_SLOTS.items()):
+            profile = basic.INTENT_PROFILES[intent_name]
+            ids = basic.recommend_batch(intent_name, keys)
+            self.assertEqual(len(ids), len(keys))
+            for key, recommendation_id in zip(keys, ids):
+                res = basic.lambda_handler(build_event(intent_name, dict(zip(slot_names, key))), None)
+                if recommendation_id is None:
+                    self.assertIsNotNone(res, key)
+                    self.assertNotEqual(res['dialogAction']['type'], 'Close', key)
+                else:
+                    canonical = catalog.decode_combination(recommendation_id, basic.CATALOG['slot_values'])
+                    self.assertIs(res['dialogAction'], profile['responses'][canonical])
+
+    def test_batch_columns(self):
+        """Columnar input gives the same ids as tuples"""
+        keys = list(itertools.product(COLOR_TYPES, CONC_TYPES, PAPER_SIZES, PRINT_TYPES))
+        columns = [list(column) for column in zip(*keys)]
+        self.assertEqual(
+            basic.recommend_batch('QuizContinue', columns=columns),
+            basic.recommend_batch('QuizContinue', iter(keys))
+        )
+        self.assertEqual(basic.recommend_batch('QuizContinue', [('color', 'WiFi Wireless', 'Letter Legal', 'Print Only')]), ['2211'])
+
+    def test_batch_unknown_intent(self):
+        """Intents without a catalog are rejected"""
+        self.assertRaises(ValueError, basic.recommend_batch, 'BillOfSale', [])
+
+
+class FallbackTestCase(unittest.TestCase):
+
+    def test_partial_dialog_turn_delegates(self):
+        """A dialog turn with unanswered slots lets Lex ask the next question"""
+        slots = dict(zip(INTENT_SLOTS['QuizContinue'], ('color', 'WiFi Wireless', None, None)))
+        event = build_event('QuizContinue', slots)
+        event['invocationSource'] = 'DialogCodeHook'
+        res = basic.lambda_handler(event, None)
+        self.assertEqual(res['dialogAction'], {'type': 'Delegate', 'slots': slots})
+
+    def test_partial_fulfillment_elicits_missing_slot(self):
+        """Fulfillment with an unanswered slot asks for it"""
+        slots = dict(zip(INTENT_SLOTS['QuizContinueA'], ('color', 'WiFi Wireless', None, 'Print Only')))
+        res = basic.lambda_handler(build_event('QuizContinueA', slots), None)
+        self.assertEqual(res['dialogAction']['type'], 'ElicitSlot')
+        self.assertEqual(res['dialogAction']['slotToElicit'], 'slotBan')
+
+    def test_unsupported_intent(self):
+        """Unknown intents get a failed Close instead of no response"""
+        res = basic.lambda_handler(build_event('OrderPizza', {}), None)
+        self.assertEqual(res['dialogAction']['type'], 'Close')
+        self.assertEqual(res['dialogAction']['fulfillmentState'], 'Failed')
+        self.assertEqual(res['sessionAttributes'], {})
+
+
+def reject_black_and_white(answers, slot_resolver):
+    result = basic.validate_answers(answers, slot_resolver)
+    if result['isValid'] and result['values'][0] == 'black and white':
+        result = basic.build_validation_result(False, answers.slot_names[0], 'Scanners only come in color')
+        result['values'] = (None,) * len(answers.slot_names)
+    return result
+
+
+class IntentRegistrationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.prepared = basic.PREPARED_CATALOG
+        basic.intents.intent(
+            'ScannerQuiz',
+            slots=INTENT_SLOTS['QuizContinue'],
+            reservation_keys=('color_type', 'conc_type', 'PaperSize', 'Print-type'),
+            catalog='QuizContinue',
+            validator=reject_black_and_white,
+        )(basic.get_recommendation)
+
+    def tearDown(self):
+        del basic.intents.handlers['ScannerQuiz']
+        del basic.intents.options['ScannerQuiz']
+        basic.install_catalog(self.prepared)
+
+    def dispatch(self, event):
+        # Not lambda_handler: it would reinstall the refresher's catalog, prepared
+        # before ScannerQuiz was registered.
+        return basic.dispatch(lex.LexEvent.from_dict(event)).to_dict()
+
+    def test_registered_intents_have_profiles(self):
+        """Every quiz intent registered on the dispatch table gets a profile"""
+        self.assertEqual(sorted(basic.INTENT_PROFILES), sorted(INTENT_SLOTS))
+        basic.install_catalog(basic.prepare_catalog(basic.CATALOG))
+        self.assertEqual(sorted(basic.INTENT_PROFILES), sorted(INTENT_SLOTS) + ['ScannerQuiz'])
+
+    def test_intent_catalog_and_validator(self):
+        """A new intent recommends from the catalog entry and validator it was registered with"""
+        basic.install_catalog(basic.prepare_catalog(basic.CATALOG))
+        slots = dict(zip(INTENT_SLOTS['QuizContinue'], ('color', 'WiFi Wireless', 'Letter Legal', 'Print Only')))
+        res = self.dispatch(build_event('ScannerQuiz', dict(slots)))
+        expected = self.dispatch(build_event('QuizContinue', dict(slots)))
+        self.assertEqual(res['dialogAction'], expected['dialogAction'])
+
+        slots['slotFour'] = 'black and white'
+        res = self.dispatch(build_event('ScannerQuiz', slots))
+        self.assertEqual(res['dialogAction']['type'], 'ElicitSlot')
+        self.assertEqual(res['dialogAction']['message']['content'], 'Scanners only come in color')
+
+    def test_missing_catalog_entry(self):
+        """An intent registered against a catalog entry that does not exist fails to prepare"""
+        basic.intents.options['ScannerQuiz']['catalog'] = 'Scanners'
+        self.assertRaises(ValueError, basic.prepare_catalog, basic.CATALOG)
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = basic.response_cache
+        basic.response_cache = cache.VersionedLRUCache(16)
+
+    def tearDown(self):
+        basic.response_cache = self.cache
+
+    def test_repeated_answers_hit(self):
+        """The same raw answers are validated once"""
+        slots = dict(zip(INTENT_SLOTS['QuizContinue'], ('Color', 'wifi wireless', 'Letter Legal', 'print only')))
+        first = basic.lambda_handler(build_event('QuizContinue', dict(slots)), None)
+        second = basic.lambda_handler(build_event('QuizContinue', dict(slots)), None)
+        self.assertEqual((basic.response_cache.hits, basic.response_cache.misses), (1, 1))
+        self.assertIs(first['dialogAction'], second['dialogAction'])
+        self.assertEqual(first['sessionAttributes'], second['sessionAttributes'])
+
+    def test_cached_rejection(self):
+        """A cached invalid answer still clears the violated slot of each request"""
+        for _ in range(2):
+            slots = dict(zip(INTENT_SLOTS['QuizContinueA'], ('purple', None, None, None)))
+            res = basic.lambda_handler(build_event('QuizContinueA', slots), None)
+            self.assertEqual(res['dialogAction']['slotToElicit'], 'slotSup')
+            self.assertIsNone(res['dialogAction']['slots']['slotSup'])
+        self.assertEqual(basic.response_cache.hits, 1)
+
+    def test_intents_are_cached_apart(self):
+        """Intents with different slot names do not share entries"""
+        for intent_name in sorted(INTENT_SLOTS):
+            slots = dict(zip(INTENT_SLOTS[intent_name], ('purple', None, None, None)))
+            res = basic.lambda_handler(build_event(intent_name, slots), None)
+            self.assertEqual(res['dialogAction']['slotToElicit'], INTENT_SLOTS[intent_name][0])
+
+    def test_counters_are_logged(self):
+        """Hits and misses are logged every RESPONSE_CACHE_LOG_EVERY lookups, without request sampling"""
+        handler = ListHandler()
+        basic.logger.addHandler(handler)
+        log_every, basic.RESPONSE_CACHE_LOG_EVERY = basic.RESPONSE_CACHE_LOG_EVERY, 2
+        try:
+            slots = dict(zip(INTENT_SLOTS['QuizContinue'], ('color', None, None, None)))
+            for _ in range(4):
+                basic.lambda_handler(build_event('QuizContinue', dict(slots)), None)
+        finally:
+            basic.RESPONSE_CACHE_LOG_EVERY = log_every
+            basic.logger.removeHandler(handler)
+        messages = [record.getMessage() for record in handler.records if record.getMessage().startswith('response cache counters')]
+        self.assertEqual(messages, [
+            'response cache counters: hits=1 misses=1 size=1',
+            'response cache counters: hits=3 misses=1 size=1',
+        ])
+
+    def test_catalog_version_invalidates(self):
+        """A new catalog version empties the cache"""
+        slots = dict(zip(INTENT_SLOTS['QuizContinue'], ('color', None, None, None)))
+        basic.lambda_handler(build_event('QuizContinue', dict(slots)), None)
+        basic.response_cache.version = 'older'
+        basic.lambda_handler(build_event('QuizContinue', dict(slots)), None)
+        self.assertEqual((basic.response_cache.hits, basic.response_cache.misses), (0, 2))
+        self.assertEqual(basic.response_cache.version, basic.CATALOG['version'])
+
+
+
+class IncrementalQuizTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.incremental = basic.INCREMENTAL_QUIZ
+        basic.INCREMENTAL_QUIZ = True
+
+    def tearDown(self):
+        basic.INCREMENTAL_QUIZ = self.incremental
+
+    def answer(self, *values):
+        slots = dict(zip(INTENT_SLOTS['QuizContinue'], values + (None,) * (4 - len(values))))
+        event = build_event('QuizContinue', slots)
+        event['invocationSource'] = 'DialogCodeHook'
+        return basic.lambda_handler(event, None)
+
+    def test_partial_answers_narrow_candidates(self):
+        """Each answer narrows the candidate codes and Lex asks the next question"""
+        counts = []
+        for filled in range(3):
+            res = self.answer(*('color', 'WiFi Wireless', 'Letter Legal')[:filled])
+            self.assertEqual(res['dialogAction']['type'], 'Delegate')
+            counts.append(len(res['sessionAttributes']['candidates'].split(',')))
+        self.assertEqual(counts, sorted(counts, reverse=True))
+        self.assertLess(counts[-1], counts[0])
+
+    def test_closes_when_one_candidate_is_left(self):
+        """The quiz closes early once the answers settle the recommendation"""
+        res = self.answer('black and white', 'WiFi Wireless', 'Letter Legal 11x17')
+        profile = basic.INTENT_PROFILES['QuizContinue']
+        expected = profile['responses'][('black and white', 'WiFi Wireless', 'Letter Legal 11x17', 'Print Only')]
+        self.assertEqual(res['dialogAction'], expected)
+        self.assertEqual(len(res['sessionAttributes']['candidates'].split(',')), 1)
+
+    def test_partial_fulfillment_elicits_missing_slot(self):
+        """Fulfillment with unanswered slots asks for one instead of delegating"""
+        slots = dict(zip(INTENT_SLOTS['QuizContinue'], ('color', 'WiFi Wireless', None, None)))
+        res = basic.lambda_handler(build_event('QuizContinue', slots), None)
+        self.assertEqual(res['dialogAction']['type'], 'ElicitSlot')
+        self.assertEqual(res['dialogAction']['slotToElicit'], 'slotOne')
+        self.assertIn('candidates', res['sessionAttributes'])
+
+    def test_complete_answers_are_unchanged(self):
+        """Fully answered quizzes recommend as before"""
+        key = ('color', 'WiFi Wireless', 'Letter Legal', 'Print Only')
+        res = self.answer(*key)
+        self.assertIs(res['dialogAction'], basic.INTENT_PROFILES['QuizContinue']['responses'][key])
+
+
+
+class AdaptiveQuizTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.modes = basic.INCREMENTAL_QUIZ, basic.ADAPTIVE_QUIZ
+        basic.INCREMENTAL_QUIZ = basic.ADAPTIVE_QUIZ = True
+
+    def tearDown(self):
+        basic.INCREMENTAL_QUIZ, basic.ADAPTIVE_QUIZ = self.modes
+
+    def test_follows_question_plan(self):
+        """Every turn elicits the planned slot until the recommendation is settled"""
+        key = ('color', 'Ethernet Wired', 'Letter Legal', 'Print Copy Scan')
+        slot_names = INTENT_SLOTS['QuizContinue']
+        slots = dict.fromkeys(slot_names)
+        for turn in range(5):
+            event = build_event('QuizContinue', dict(slots))
+            event['invocationSource'] = 'DialogCodeHook'
+            res = basic.lambda_handler(event, None)
+            if res['dialogAction']['type'] != 'ElicitSlot':
+                break
+            self.assertNotIn('message', res['dialogAction'])
+            elicited = res['dialogAction']['slotToElicit']
+            self.assertIsNone(slots[elicited])
+            slots[elicited] = key[slot_names.index(elicited)]
+        self.assertEqual(res['dialogAction']['type'], 'Close')
+        self.assertEqual(res['dialogAction'], basic.INTENT_PROFILES['QuizContinue']['responses'][key])
+        self.assertLess(turn, 4)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+Compact codec for the reservation the bot keeps in Lex session attributes.
+
+Lex sends every session attribute back and forth on each turn, so the current
+reservation is stored as a short positional code instead of JSON: '#' followed
+by one digit per slot, the 1-based position of its value in the catalog's
+slot_values, or 0 while the slot has no valid answer. '#1220' is black and
+white, WiFi Wireless, Letter Legal 11x17 and no print type yet. Every code is
+precomputed, so encoding a turn's answers is a dictionary lookup.
+"""
+import itertools
+
+RESERVATION_PREFIX = '#'
+
+
+class ReservationCodec(object):
+    """
+    Encodes slot value tuples, with None for unanswered slots, to reservation codes
+    and back.
+    """
+
+    def __init__(self, slot_values):
+        choices = [(None,) + tuple(values) for values in slot_values]
+        if any(len(values) > 10 for values in choices):
+            raise ValueError('Reservation codes hold at most 9 values per slot')
+        self.codes = {}
+        for key in itertools.product(*choices):
+            self.codes[key] = RESERVATION_PREFIX + ''.join(str(values.index(value)) for value, values in zip(key, choices))
+        self.keys = dict((code, key) for key, code in self.codes.items())
+
+    def encode(self, values):
+        try:
+            return self.codes[values]
+        except KeyError:
+            raise ValueError('Cannot encode reservation {!r}'.format(values))
+
+    def decode(self, code):
+        try:
+            return self.keys[code]
+        except KeyError:
+            raise ValueError('Invalid reservation code {!r}'.format(code))
+
+    def record(self, code, field_names):
+        """
+        Decode code into the full reservation record, keyed by field_names in slot order.
+        """
+        return dict(zip(field_names, self.decode(code)))
@@ -0,0 +1,44 @@
+import unittest
+
+import session
+from bench_handler import SLOT_VALUES
+
+
+class ReservationCodecTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.codec = session.ReservationCodec(SLOT_VALUES)
+
+    def test_encode(self):
+        """Each slot is the 1-based position of its value, or 0 when unanswered"""
+        self.assertEqual(self.codec.encode(('black and white', 'WiFi Wireless', 'Letter Legal 11x17', None)), '#1220')
+        self.assertEqual(self.codec.encode((None, None, None, None)), '#0000')
+
+    def test_round_trip(self):
+        """Every code decodes back to the values it encodes"""
+        self.assertEqual(len(self.codec.codes), 3 * 3 * 4 * 4)
+        for key, code in self.codec.codes.items():
+            self.assertEqual(self.codec.decode(code), key)
+
+    def test_record(self):
+        """A code decodes into the full reservation record"""
+        record = self.codec.record('#2131', ('color_type', 'conc_type', 'PaperSize', 'Print-type'))
+        self.assertEqual(record, {
+            'color_type': 'color',
+            'conc_type': 'Ethernet Wired',
+            'PaperSize': '24"-44" Wide Format',
+            'Print-type': 'Print Only',
+        })
+
+    def test_invalid(self):
+        """Unknown values and codes are rejected"""
+        with self.assertRaises(ValueError):
+            self.codec.encode(('purple', None, None, None))
+        with self.assertRaises(ValueError):
+            self.codec.decode('{"color_type": "color"}')
+        with self.assertRaises(ValueError):
+            self.codec.decode('#1240')
+
+
+if __name__ == '__main__':
+    unittest.main()
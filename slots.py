@@ -0,0 +1,148 @@
+"""
+Slot value normalization for the printer quiz.
+
+build_slot_tables() precomputes, once per container, a table per slot that maps
+every accepted spelling of a value, and of its synonyms, to the canonical
+catalog value. Looking a raw slot value up is then a dictionary probe, and only
+values that miss the exact spelling pay for normalization. SlotResolver adds
+typo tolerance on top: a value that is in no table resolves to the closest
+spelling within a small edit distance, and the outcome is cached.
+"""
+from cache import LRUCache
+
+# Cached resolutions can legitimately be None, so misses need their own marker.
+MISSING = object()
+
+
+def normalize(value):
+    """
+    Case-fold and collapse whitespace, so 'WiFi  wireless' and 'wifi wireless' match.
+    """
+    return ' '.join(value.lower().split())
+
+
+def build_slot_tables(slot_values, slot_synonyms=()):
+    """
+    Return one {spelling: canonical value} table per slot in slot_values.
+    slot_synonyms optionally holds one {synonym: canonical value} mapping per slot.
+    """
+    tables = []
+    for position, values in enumerate(slot_values):
+        table = {}
+        for value in values:
+            table[value] = value
+            table[normalize(value)] = value
+        synonyms = slot_synonyms[position] if position < len(slot_synonyms) else {}
+        for synonym, value in synonyms.items():
+            spelling = normalize(synonym)
+            if table.get(spelling, value) != value:
+                raise ValueError('Synonym {!r} is ambiguous'.format(synonym))
+            table[spelling] = value
+        tables.append(table)
+    return tuple(tables)
+
+
+def canonical_value(table, value):
+    """
+    Return the canonical value for value, or None if the slot does not accept it.
+    """
+    canonical = table.get(value)
+    if canonical is None:
+        canonical = table.get(normalize(value))
+    return canonical
+
+
+def bounded_edit_distance(a, b, limit):
+    """
+    Levenshtein distance between a and b, or limit + 1 once it is certain to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class SlotResolver(object):
+    """
+    Resolves raw slot values to canonical values: exact spellings and synonyms through
+    the slot tables, then the closest normalized spelling within max_distance edits
+    (one edit per four characters of input, so short answers must match closely).
+    Ties between different values resolve to nothing. Resolved raw inputs, including
+    failures, are kept in an LRU cache.
+    """
+
+    def __init__(self, tables, max_distance=2, cache_size=1024):
+        self.tables = tables
+        self.max_distance = max_distance
+        self.spellings = tuple(
+            tuple(sorted(spelling for spelling in table if spelling == normalize(spelling)))
+            for table in tables
+        )
+        self.cache = LRUCache(cache_size)
+
+    def resolve(self, position, value):
+        """
+        Return the canonical value for value in slot position, or None.
+        """
+        canonical = self.tables[position].get(value)
+        if canonical is not None:
+            return canonical
+        key = (position, value)
+        canonical = self.cache.get(key, MISSING)
+        if canonical is MISSING:
+            canonical = canonical_value(self.tables[position], value)
+            if canonical is None:
+                canonical = self.closest(position, normalize(value))
+            self.cache.put(key, canonical)
+        return canonical
+
+    def closest(self, position, spelling):
+        limit = min(self.max_distance, len(spelling) // 4)
+        if limit == 0:
+            return None
+        table = self.tables[position]
+        best_distance = limit + 1
+        best = set()
+        for candidate in self.spellings[position]:
+            distance = bounded_edit_distance(spelling, candidate, limit)
+            if distance < best_distance:
+                best_distance = distance
+                best = set([table[candidate]])
+            elif distance == best_distance and distance <= limit:
+                best.add(table[candidate])
+        return best.pop() if len(best) == 1 else None
+
+
+class QuizAnswers(object):
+    """
+    The four quiz answers of one request, read from its slots in a single pass and
+    shared by validation and recommendation. slot_names are the intent's color,
+    connection, paper size and print type slots; slots is the event's slot dict.
+    """
+    __slots__ = ('slot_names', 'slots', 'color_type', 'conc_type', 'paper_size', 'print_type')
+
+    def __init__(self, slot_names, slots):
+        self.slot_names = slot_names
+        self.slots = slots
+        self.color_type, self.conc_type, self.paper_size, self.print_type = [slots.get(name) for name in slot_names]
+
+    @classmethod
+    def from_event(cls, request, slot_names):
+        """
+        Read the answers from a lex.LexEvent.
+        """
+        return cls(slot_names, request.slots if request.slots is not None else {})
+
+    def values(self):
+        return (self.color_type, self.conc_type, self.paper_size, self.print_type)
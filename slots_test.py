@@ -0,0 +1,147 @@
+import unittest
+
+import basic
+import lex
+import slots
+from bench_handler import INTENT_SLOTS, SLOT_VALUES, build_event
+
+QUIZ_SLOTS = INTENT_SLOTS['QuizContinue']
+
+
+class SlotTablesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tables = slots.build_slot_tables(SLOT_VALUES)
+
+    def test_normalize(self):
+        """Case and whitespace differences normalize away"""
+        self.assertEqual(slots.normalize('  WiFi   Wireless '), 'wifi wireless')
+
+    def test_canonical_values(self):
+        """Every spelling variant maps to the catalog's value"""
+        color, conc, paper, print_type = self.tables
+        self.assertEqual(slots.canonical_value(color, 'Black And White'), 'black and white')
+        self.assertEqual(slots.canonical_value(conc, 'wifi wireless'), 'WiFi Wireless')
+        self.assertEqual(slots.canonical_value(paper, 'letter legal 11X17'), 'Letter Legal 11x17')
+        self.assertEqual(slots.canonical_value(print_type, 'PRINT ONLY'), 'Print Only')
+        self.assertIsNone(slots.canonical_value(print_type, 'Print'))
+
+    def test_synonyms(self):
+        """Synonyms map to their canonical value"""
+        tables = slots.build_slot_tables(SLOT_VALUES, ({'B&W': 'black and white'}, {}, {'Tabloid': 'Letter Legal 11x17'}, {}))
+        self.assertEqual(slots.canonical_value(tables[0], 'b&w'), 'black and white')
+        self.assertEqual(slots.canonical_value(tables[2], 'TABLOID'), 'Letter Legal 11x17')
+
+    def test_ambiguous_synonym(self):
+        """A synonym that spells another value is rejected"""
+        with self.assertRaises(ValueError):
+            slots.build_slot_tables(SLOT_VALUES, ({'Color': 'black and white'}, {}, {}, {}))
+
+
+class SlotResolverTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.resolver = slots.SlotResolver(slots.build_slot_tables(SLOT_VALUES), cache_size=2)
+
+    def test_edit_distance(self):
+        """Edit distance stops counting past the limit"""
+        self.assertEqual(slots.bounded_edit_distance('wirless', 'wireless', 2), 1)
+        self.assertEqual(slots.bounded_edit_distance('colour', 'color', 2), 1)
+        self.assertEqual(slots.bounded_edit_distance('print only', 'scan', 2), 3)
+
+    def test_typos(self):
+        """Small typos resolve to the closest value"""
+        self.assertEqual(self.resolver.resolve(0, 'colr'), 'color')
+        self.assertEqual(self.resolver.resolve(1, 'wifi wirless'), 'WiFi Wireless')
+        self.assertEqual(self.resolver.resolve(3, 'Print Copy Sacn'), 'Print Copy Scan')
+
+    def test_unresolved(self):
+        """Short answers must match closely and ties resolve to nothing"""
+        self.assertIsNone(self.resolver.resolve(1, 'usb'))
+        self.assertIsNone(self.resolver.resolve(0, 'red'))
+        self.assertIsNone(self.resolver.resolve(3, 'Print Copy Scan F'))
+
+    def test_cache(self):
+        """Resolved spellings, including misses, are cached"""
+        self.resolver.resolve(0, 'colr')
+        self.resolver.resolve(0, 'purple')
+        self.resolver.resolve(0, 'colr')
+        self.resolver.resolve(0, 'purple')
+        self.assertEqual((self.resolver.cache.hits, self.resolver.cache.misses), (2, 2))
+        self.resolver.resolve(0, 'color')
+        self.assertEqual(len(self.resolver.cache), 2)
+
+
+class QuizAnswersTestCase(unittest.TestCase):
+
+    def test_reads_slots_in_order(self):
+        """Answers are read from the profile's slots in quiz order"""
+        answers = slots.QuizAnswers(QUIZ_SLOTS, {'slotOne': 'Letter Legal', 'slotFour': 'color'})
+        self.assertEqual(answers.values(), ('color', None, 'Letter Legal', None))
+        self.assertEqual(answers.paper_size, 'Letter Legal')
+
+    def test_event_without_slots(self):
+        """An event without slots has no answers"""
+        answers = slots.QuizAnswers.from_event(lex.LexEvent('QuizContinue', None), QUIZ_SLOTS)
+        self.assertEqual(answers.values(), (None, None, None, None))
+        self.assertEqual(answers.slots, {})
+
+    def test_has_no_instance_dict(self):
+        """Answers are __slots__ objects"""
+        self.assertFalse(hasattr(slots.QuizAnswers(QUIZ_SLOTS, {}), '__dict__'))
+
+
+class ValidateMachinesTestCase(unittest.TestCase):
+
+    def validate(self, color=None, conc=None, paper=None, print_type=None):
+        return basic.validate_machines(dict(zip(QUIZ_SLOTS, (color, conc, paper, print_type))))
+
+    def test_returns_canonical_values(self):
+        """A valid result carries canonical values in slot order"""
+        result = self.validate('Color', 'wifi wireless', 'letter legal', 'print copy scan fax')
+        self.assertTrue(result['isValid'])
+        self.assertEqual(result['values'], ('color', 'WiFi Wireless', 'Letter Legal', 'Print Copy Scan Fax'))
+
+    def test_unfilled_slots_are_none(self):
+        """Slots that are not filled yet are valid and None"""
+        result = self.validate('color')
+        self.assertTrue(result['isValid'])
+        self.assertEqual(result['values'], ('color', None, None, None))
+
+    def test_rejects_each_slot(self):
+        """Every slot is validated, including paper size and print type"""
+        cases = [
+            (('purple', None, None, None), 'slotFour'),
+            (('color', 'USB', None, None), 'slotThree'),
+            (('color', 'WiFi Wireless', 'A4', None), 'slotOne'),
+            (('color', 'WiFi Wireless', 'Letter Legal', 'Scan Only'), 'slotTwo'),
+        ]
+        for values, violated_slot in cases:
+            result = self.validate(*values)
+            self.assertFalse(result['isValid'])
+            self.assertEqual(result['violatedSlot'], violated_slot)
+
+    def test_first_invalid_slot_wins(self):
+        """Color is re-prompted before connection, as before"""
+        self.assertEqual(self.validate('purple', 'USB')['violatedSlot'], 'slotFour')
+
+    def test_other_intent_slot_names(self):
+        """The intent profile's slot names are validated"""
+        result = basic.validate_machines({'slotSup': 'color', 'slotBap': 'bluetooth'}, basic.INTENT_PROFILES['QuizContinueA']['slots'])
+        self.assertEqual(result['violatedSlot'], 'slotBap')
+
+    def test_catalog_synonyms_and_typos(self):
+        """Catalog synonyms and typos validate to canonical values"""
+        result = self.validate('b&w', 'wirless', '11 x 17', 'fax')
+        self.assertEqual(result['values'], ('black and white', 'WiFi Wireless', 'Letter Legal 11x17', 'Print Copy Scan Fax'))
+
+    def test_case_variants_are_recommended(self):
+        """Differently cased answers reach the same recommendation"""
+        event = build_event('QuizContinue', dict(zip(QUIZ_SLOTS, ('Color', 'wifi wireless', 'LETTER LEGAL', 'print only'))))
+        res = basic.lambda_handler(event, None)
+        key = ('color', 'WiFi Wireless', 'Letter Legal', 'Print Only')
+        self.assertIs(res['dialogAction'], basic.INTENT_PROFILES['QuizContinue']['responses'][key])
+
+
+if __name__ == '__main__':
+    unittest.main()
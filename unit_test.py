@@ -1,14 +1,16 @@
 import unittest
-import bot
+
+import basic as bot
 
 test_input = {
       "currentIntent": {
         "slots": {
-          "buyer": "Joe",
-          "seller": "John",
-          "buyerAddress": None,
+          "slotFour": "color",
+          "slotThree": "WiFi Wireless",
+          "slotOne": "Letter Legal",
+          "slotTwo": "Print Only",
         },
-        "name": "BillOfSale",
+        "name": "QuizContinue",
         "confirmationStatus": "None"
       },
       "bot": {
@@ -30,12 +32,12 @@ class LambdaTestCase(unittest.TestCase):
 
     def test_not_none(self):
         """Response is not None"""
-        res = bot.lambda_handler(test_input)
+        res = bot.lambda_handler(test_input, None)
         self.assertIsNotNone(res)
 
     def test_fulfillment(self):
         """Response is fulfilled"""
-        res = bot.lambda_handler(test_input)
+        res = bot.lambda_handler(test_input, None)
         self.assertEqual(res['dialogAction']['fulfillmentState'], 'Fulfilled')
 
 